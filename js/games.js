@@ -44,7 +44,27 @@ function loadGames(data) {
 				? "/" + source + "/" + data[i].directory + "/" + data[i].image
 				: GAMES_BASE_URL + "/" + source + "/" + data[i].directory + "/" + data[i].image;
 		}
-		
+
+		// Prefer the generated thumbnail (scripts/make-cover-thumbnails.py) over the full-size cover
+		const thumb = data[i].thumb;
+		let $cover = $("<img>").prop({
+			src: thumb ? thumb.webp : imagePath,
+			alt: data[i].name + " logo",
+			loading: "lazy"
+		});
+		if (thumb) {
+			$cover.attr({ width: thumb.width, height: thumb.height });
+			if (thumb.placeholder) {
+				$cover.css({ "background-image": "url(" + thumb.placeholder + ")", "background-size": "cover" });
+			}
+			if (thumb.avif) {
+				$cover = $("<picture>")
+					.css("display", "block")
+					.append($("<source>").attr({ type: "image/avif", srcset: thumb.avif }))
+					.append($cover);
+			}
+		}
+
 		let $element = $("<a>")
 			.attr({
 				class: "game",
@@ -53,13 +73,7 @@ function loadGames(data) {
 				href: "loader.html#" + btoa(encodeURIComponent(JSON.stringify([data[i].directory, data[i].image, data[i].name, source, data[i]]))),
 			})
 			.data("recommended", data[i].recommended)
-			.append(
-				$("<img>").prop({
-					src: imagePath,
-					alt: data[i].name + " logo",
-					loading: "lazy"
-				})
-			)
+			.append($cover)
 			.append($("<h1>").text(data[i].name))
 			.append(
 				$("<img>").prop({
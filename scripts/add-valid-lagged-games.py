@@ -1,58 +1,16 @@
 """
 Add valid Lagged games to games.json
 Only adds games that have actual game files (not just iframes to game sites)
+Usage: python scripts/add-valid-lagged-games.py [--no-cache]
+
+Validation results are cached per game folder; --no-cache re-checks them all.
 """
 import json
+import sys
 from pathlib import Path
-import re
 
-def check_game_valid(game_dir):
-    """Check if a game is valid (has game files, not just iframe to game site)"""
-    if not game_dir.exists():
-        return False
-    
-    index_html = game_dir / 'index.html'
-    if not index_html.exists():
-        return False
-    
-    html_content = index_html.read_text(encoding='utf-8')
-    
-    # Check if it's just an iframe to a game site (bad)
-    bad_iframe_patterns = [
-        r'iframe.*lagged\.com',
-        r'iframe.*crazygames',
-        r'iframe.*kongregate',
-        r'iframe.*gamejolt',
-        r'iframe.*itch\.io'
-    ]
-    
-    for pattern in bad_iframe_patterns:
-        if re.search(pattern, html_content, re.I):
-            return False
-    
-    # Check if it has game files (good)
-    has_js = any(game_dir.rglob('*.js'))
-    has_swf = any(game_dir.rglob('*.swf'))
-    has_wasm = any(game_dir.rglob('*.wasm'))
-    has_data = any(game_dir.rglob('*.data'))
-    
-    # Has game files = valid
-    if has_js or has_swf or has_wasm or has_data:
-        return True
-    
-    # Check if it references external CDNs (also valid per user)
-    external_cdn_patterns = [
-        r'gacembed\.withgoogle\.com',
-        r'jsdelivr\.net',
-        r'unpkg\.com',
-        r'cdnjs\.cloudflare\.com'
-    ]
-    
-    for pattern in external_cdn_patterns:
-        if re.search(pattern, html_content, re.I):
-            return True
-    
-    return False
+from gamelib import validate
+from gamelib.catalog import Catalog
 
 def main():
     games_list_file = Path('lagged-games-list.json')
@@ -70,15 +28,13 @@ def main():
         games_list = json.load(f)
     
     # Load existing games
-    with open(games_json_path, 'r', encoding='utf-8') as f:
-        existing_games = json.load(f)
-    
-    existing_directories = {g.get('directory', '').lower() for g in existing_games}
+    catalog = Catalog.load(games_json_path)
     
     # Check each game
     valid_games = []
     skipped = []
     
+    candidates = []
     for game in games_list:
         if game.get('status') != 'success':
             continue
@@ -88,13 +44,22 @@ def main():
             continue
         
         # Skip if already exists
-        if slug.lower() in existing_directories:
+        if catalog.exists(directory=slug):
             skipped.append(f"{slug} (already exists)")
             continue
         
-        game_dir = non_semag_dir / slug
-        
-        if check_game_valid(game_dir):
+        candidates.append(game)
+    
+    # Validate every candidate folder concurrently, reusing cached results for unchanged ones
+    cache = None if '--no-cache' in sys.argv[1:] else validate.ValidationCache()
+    reports = validate.validate_all([non_semag_dir / g['slug'] for g in candidates], cache=cache)
+    if cache:
+        cache.save()
+        print(f"💾 Validation cache: {cache.hits + cache.rehashed} unchanged, {cache.misses} checked\n")
+    
+    for game, report in zip(candidates, reports):
+        slug = game['slug']
+        if report.valid:
             game_name = game.get('name', slug.replace('-', ' ').title())
             # Remove " Game" suffix if present
             if game_name.endswith(' Game'):
@@ -108,14 +73,14 @@ def main():
             })
             print(f"  ✓ {slug}")
         else:
-            skipped.append(f"{slug} (no game files or iframe)")
+            skipped.append(f"{slug} ({report.reason})")
     
     # Add valid games to games.json
     if valid_games:
-        existing_games.extend(valid_games)
-        
-        with open(games_json_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit(games_json_path) as catalog:
+            for game_info in valid_games:
+                if not catalog.exists(directory=game_info['directory']):
+                    catalog.insert(game_info)
         
         print(f"\n✅ Added {len(valid_games)} games to games.json")
     else:
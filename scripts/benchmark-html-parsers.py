@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on the saved game pages in non-semag/
+Usage: python scripts/benchmark-html-parsers.py [--rounds N] [--limit N]
+
+Each backend parses every page and collects the script/link/img URLs (what
+the scrapers do with a page), and the times are compared with html.parser.
+"""
+import sys
+import time
+from pathlib import Path
+
+from gamelib import htmlparse
+
+GAMES_DIR = Path(__file__).parent.parent / "non-semag"
+ASSET_SELECTOR = 'script[src], link[href], img[src]'
+
+def extract_with_soup(markup, backend):
+    soup = htmlparse.parse(markup, backend=backend)
+    return [tag.get('src') or tag.get('href') for tag in soup.select(ASSET_SELECTOR)]
+
+def extract_with_selectolax(markup):
+    tree = htmlparse.SelectolaxParser(markup)
+    return [node.attributes.get('src') or node.attributes.get('href')
+            for node in tree.css(ASSET_SELECTOR)]
+
+def run(name, extract, pages, rounds):
+    best = None
+    found = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        found = sum(len(extract(markup)) for markup in pages)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return name, best, found
+
+def main():
+    rounds = 3
+    limit = None
+    if '--rounds' in sys.argv:
+        idx = sys.argv.index('--rounds')
+        if idx + 1 < len(sys.argv):
+            rounds = int(sys.argv[idx + 1])
+    if '--limit' in sys.argv:
+        idx = sys.argv.index('--limit')
+        if idx + 1 < len(sys.argv):
+            limit = int(sys.argv[idx + 1])
+
+    print("⏱️  HTML Parser Benchmark")
+    print("=" * 60)
+
+    files = sorted(GAMES_DIR.rglob('*.html'))[:limit]
+    pages = [f.read_bytes() for f in files]
+    total_bytes = sum(len(p) for p in pages)
+    print(f"Pages: {len(pages)} ({total_bytes / 1024 / 1024:.1f} MB), best of {rounds} rounds\n", flush=True)
+
+    backends = [(f"bs4 + {b}", lambda m, b=b: extract_with_soup(m, b))
+                for b in reversed(htmlparse.available_backends())]
+    if htmlparse.SelectolaxParser is not None:
+        backends.append(("selectolax", extract_with_selectolax))
+
+    results = [run(name, extract, pages, rounds) for name, extract in backends]
+    baseline = results[0][1]
+    for name, elapsed, found in results:
+        print(f"  {name:<20} {elapsed:8.3f}s  {baseline / elapsed:5.1f}x  ({found} asset URLs)")
+
+    missing = [b for b in ('lxml', 'selectolax')
+               if b not in ' '.join(name for name, _, _ in results)]
+    if missing:
+        print(f"\nNot installed: {', '.join(missing)} (pip install {' '.join(missing)})")
+    print(f"\nDefault backend for parse(): {htmlparse.default_backend()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Maintain the optional SQLite catalog (.catalog.db) next to data/games.json
+Usage:
+  python scripts/catalog-db.py import              Load data/games.json into the database
+  python scripts/catalog-db.py export              Regenerate data/games.json from the database
+                                                   (refused if games.json changed since the import)
+  python scripts/catalog-db.py find <name|slug>    Look a game up by name, directory or slug
+  python scripts/catalog-db.py zones               Store the current gn-math zones.json
+  python scripts/catalog-db.py assets [--hash]     Record the files of every non-semag game
+  python scripts/catalog-db.py stats               Show table sizes
+  python scripts/catalog-db.py downloads [--errors] Show the latest downloads made by the scrapers
+"""
+import sys
+from pathlib import Path
+
+from gamelib import blobstore, zonecache
+from gamelib.catalogdb import CatalogDB, StaleCatalog
+
+GAMES_DIR = Path(__file__).parent.parent / "non-semag"
+
+def import_games(db):
+    count = db.import_games()
+    print(f"✓ Imported {count} games from games.json")
+
+def export_games(db):
+    try:
+        changed = db.export_games()
+    except StaleCatalog as e:
+        print(f"❌ {e}; run 'catalog-db.py import' first so its changes aren't lost")
+        sys.exit(1)
+    if changed:
+        print(f"✓ Wrote {db.count()} games to games.json")
+    else:
+        print("✓ games.json already up to date")
+
+def find_game(db, query):
+    ids = db.find_ids(name=query, directory=query, slug=query)
+    if not ids:
+        print(f"No game matches '{query}'")
+        return
+    for game_id in ids:
+        game = db.get(game_id)
+        print(f"  [{game_id}] {game.get('name')} ({game.get('directory')}) - {game.get('source')}")
+
+def store_zones(db):
+    print("Fetching zones.json...", flush=True)
+    zones = zonecache.load()
+    db.upsert_zones(zones)
+    db.record_source('gn-math', f"https://github.com/{zonecache.ASSETS_REPO}")
+    print(f"✓ Stored {len(zones)} zones")
+
+def sync_assets(db, with_hashes):
+    digest = blobstore.file_digest if with_hashes else None
+    total = 0
+    directories = {game.get('directory') for game in db.games(source='non-semag')}
+    with db.transaction():
+        for directory in sorted(d for d in directories if d):
+            game_dir = GAMES_DIR / directory
+            if game_dir.is_dir():
+                total += db.sync_assets(directory, game_dir, digest)
+    print(f"✓ Recorded {total} asset files")
+
+def show_stats(db):
+    for table in ('games', 'zones', 'assets', 'sources', 'downloads'):
+        count = db.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        print(f"  {table:<10} {count}")
+
+def show_downloads(db, errors_only):
+    for row in db.downloads(status='error' if errors_only else None):
+        detail = row['error'] if row['status'] == 'error' else f"{row['size'] or 0:,} bytes"
+        print(f"  {row['status']:<12} {row['url']} ({detail})")
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return
+
+    command = sys.argv[1]
+    with CatalogDB() as db:
+        if command == 'import':
+            import_games(db)
+        elif command == 'export':
+            export_games(db)
+        elif command == 'find' and len(sys.argv) > 2:
+            find_game(db, ' '.join(sys.argv[2:]))
+        elif command == 'zones':
+            store_zones(db)
+        elif command == 'assets':
+            sync_assets(db, '--hash' in sys.argv)
+        elif command == 'stats':
+            show_stats(db)
+        elif command == 'downloads':
+            show_downloads(db, '--errors' in sys.argv)
+        else:
+            print(__doc__.strip())
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Check iframe sources for Escape Road games"""
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+from gamelib import htmlparse
 
 games_dir = Path(__file__).parent.parent / "non-semag"
 escape_games = ['escape-road', 'escape-road-2', 'escape-road-city', 'escape-road-city-2', 'escape-road-winter', 'escape-road-halloween']
@@ -10,7 +11,7 @@ print("Iframe sources:")
 for game in escape_games:
     html_file = games_dir / game / "index.html"
     if html_file.exists():
-        soup = BeautifulSoup(html_file.read_text(encoding='utf-8'), 'html.parser')
+        soup = htmlparse.parse(html_file.read_text(encoding='utf-8'))
         iframe = soup.find('iframe')
         if iframe:
             src = iframe.get('src', '')
@@ -1,21 +1,11 @@
 #!/usr/bin/env python3
 """Check which featured zones are missing"""
-import requests
-import json
-from pathlib import Path
-
-ZONES_URL = "https://raw.githubusercontent.com/gn-math/assets/main/zones.json"
-
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    'Accept': '*/*',
-}
+from gamelib import zonecache
+from gamelib.catalog import Catalog
 
 # Load zones
-print("Fetching zones.json...")
-r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-r.raise_for_status()
-zones_data = r.json()
+print("Loading zones.json...")
+zones_data = zonecache.load()
 
 # Get all featured zones
 featured_zones = []
@@ -29,12 +19,7 @@ for z in featured_zones:
     print(f"  ID {z.get('id')}: {z.get('name')}")
 
 # Load existing games
-games_file = Path(__file__).parent.parent / "data" / "games.json"
-with open(games_file, 'r', encoding='utf-8') as f:
-    games = json.load(f)
-
-existing_names = {g.get('name', '').lower() for g in games}
-existing_dirs = {g.get('directory', '') for g in games}
+catalog = Catalog.load()
 
 print(f"\n\nChecking which featured zones are already in database...")
 missing = []
@@ -42,14 +27,13 @@ already_have = []
 
 for zone in featured_zones:
     name = zone.get('name', '')
-    name_lower = name.lower()
     
     # Skip comments/suggestions
     if name.startswith('[!]'):
         print(f"  ⏭ Skipping (special): {name}")
         continue
     
-    if name_lower in existing_names:
+    if catalog.exists(name=name):
         already_have.append(name)
     else:
         missing.append((zone.get('id'), name))
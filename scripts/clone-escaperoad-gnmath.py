@@ -2,16 +2,14 @@
 """
 Remove all Escape Road games and clone them from gn-math.dev
 """
-import requests
-import json
+from gamelib import fetch, zonecache
+from gamelib.catalog import Catalog
 import re
 from urllib.parse import urljoin
 from pathlib import Path
-import time
 import sys
 import shutil
 
-ZONES_URL = "https://cdn.jsdelivr.net/gh/gn-math/assets@main/zones.json"
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
@@ -24,38 +22,23 @@ GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=15)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            print(f"    Error downloading {url}: {e}", flush=True)
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=15, silent=silent)
 
 def remove_escape_road_games():
     """Remove all Escape Road games from games.json and their directories"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    
-    games_to_remove = []
-    for game in games:
-        name = game.get('name', '').lower()
-        if 'escape road' in name:
-            games_to_remove.append(game)
-            print(f"  Will remove: {game.get('name')} ({game.get('directory')})", flush=True)
+    with Catalog.edit() as catalog:
+        games_to_remove = []
+        for game in catalog:
+            name = game.get('name', '').lower()
+            if 'escape road' in name:
+                games_to_remove.append(game)
+                print(f"  Will remove: {game.get('name')} ({game.get('directory')})", flush=True)
+        
+        # Remove from games list
+        for game in games_to_remove:
+            catalog.delete(game)
     
-    # Remove from games list
     for game in games_to_remove:
-        games.remove(game)
-        
         # Remove directory
         old_dir = GAMES_DIR / game.get('directory', '')
         if old_dir.exists():
@@ -65,12 +48,7 @@ def remove_escape_road_games():
             except Exception as e:
                 print(f"  Error removing directory {game.get('directory')}: {e}", flush=True)
     
-    # Save updated games.json
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(games, f, indent='\t', ensure_ascii=False)
-    
     print(f"\nRemoved {len(games_to_remove)} Escape Road games", flush=True)
-    return games
 
 def find_escape_road_zones(zones_data):
     """Find all Escape Road games in zones.json"""
@@ -144,14 +122,12 @@ def main():
     
     # Step 1: Remove existing Escape Road games
     print("\nStep 1: Removing existing Escape Road games...", flush=True)
-    existing_games = remove_escape_road_games()
+    remove_escape_road_games()
     
     # Step 2: Fetch zones from gn-math.dev
-    print(f"\nStep 2: Fetching zones from {ZONES_URL}...", flush=True)
+    print(f"\nStep 2: Loading zones.json...", flush=True)
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones: {e}", flush=True)
         return
@@ -189,23 +165,19 @@ def main():
         except Exception as e:
             print(f"  Error downloading {game_name}: {e}", flush=True)
             continue
-        
-        time.sleep(0.5)  # Be polite
     
     # Step 5: Add to games.json
     if downloaded_games:
-        existing_games.extend(downloaded_games)
-        games_file = Path(__file__).parent.parent / "data" / "games.json"
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit() as catalog:
+            for game_info in downloaded_games:
+                catalog.insert(game_info)
         
         print(f"\n" + "=" * 60, flush=True)
         print(f"DOWNLOAD SUMMARY", flush=True)
         print(f"=" * 60, flush=True)
         print(f"Downloaded new games: {len(downloaded_games)}/{len(escape_road_zones)}", flush=True)
         print(f"✓ Updated games.json", flush=True)
-        print(f"✓ Total games in database: {len(existing_games)}", flush=True)
+        print(f"✓ Total games in database: {len(catalog)}", flush=True)
     else:
         print("\n⚠ No games were successfully downloaded", flush=True)
 
@@ -2,13 +2,11 @@
 """
 Remove all Escape Road games and clone them from escaperoad.org
 """
-import requests
-from bs4 import BeautifulSoup
-import json
+from gamelib import fetch, htmlparse
+from gamelib.catalog import Catalog
 import re
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
-import time
 import sys
 import shutil
 
@@ -33,38 +31,23 @@ ESCAPE_ROAD_SERIES = [
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=15)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            print(f"    Error downloading {url}: {e}", flush=True)
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=15, silent=silent)
 
 def remove_escape_road_games():
     """Remove all Escape Road games from games.json and their directories"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    
-    games_to_remove = []
-    for game in games:
-        name = game.get('name', '').lower()
-        if 'escape road' in name:
-            games_to_remove.append(game)
-            print(f"  Will remove: {game.get('name')} ({game.get('directory')})", flush=True)
+    with Catalog.edit() as catalog:
+        games_to_remove = []
+        for game in catalog:
+            name = game.get('name', '').lower()
+            if 'escape road' in name:
+                games_to_remove.append(game)
+                print(f"  Will remove: {game.get('name')} ({game.get('directory')})", flush=True)
+        
+        # Remove from games list
+        for game in games_to_remove:
+            catalog.delete(game)
     
-    # Remove from games list
     for game in games_to_remove:
-        games.remove(game)
-        
         # Remove directory
         old_dir = GAMES_DIR / game.get('directory', '')
         if old_dir.exists():
@@ -74,12 +57,7 @@ def remove_escape_road_games():
             except Exception as e:
                 print(f"  Error removing directory {game.get('directory')}: {e}", flush=True)
     
-    # Save updated games.json
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(games, f, indent='\t', ensure_ascii=False)
-    
     print(f"\nRemoved {len(games_to_remove)} Escape Road games", flush=True)
-    return games
 
 def find_game_urls(soup, base_url):
     """Find all Escape Road series game URLs from the page"""
@@ -122,12 +100,10 @@ def download_game_html(game_url, game_dir):
     try:
         game_dir.mkdir(parents=True, exist_ok=True)
         
-        # Download the game page
-        r = requests.get(game_url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        
-        html_content = r.text
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Download the game page (download_cover_image reuses the parsed page)
+        page = htmlparse.get_page(game_url, headers=HEADERS, timeout=15)
+        r = page.response
+        soup = page.soup
         
         # Look for data-iframe attribute (the actual game URL)
         iframe_url = None
@@ -139,7 +115,7 @@ def download_game_html(game_url, game_dir):
                 
                 try:
                     # Download the actual game from 1games.io
-                    game_r = requests.get(iframe_url, headers=HEADERS, timeout=15)
+                    game_r = fetch.get(iframe_url, headers=HEADERS, timeout=15)
                     game_r.raise_for_status()
                     
                     # Save the game HTML
@@ -161,7 +137,7 @@ def download_game_html(game_url, game_dir):
                 print(f"    Found iframe src: {iframe_src}", flush=True)
                 
                 try:
-                    iframe_r = requests.get(iframe_src, headers=HEADERS, timeout=15)
+                    iframe_r = fetch.get(iframe_src, headers=HEADERS, timeout=15)
                     iframe_r.raise_for_status()
                     
                     html_file = game_dir / "index.html"
@@ -187,8 +163,7 @@ def download_game_html(game_url, game_dir):
 def download_cover_image(game_name, game_dir, game_url):
     """Try to find and download cover image"""
     try:
-        r = requests.get(game_url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.content, 'html.parser')
+        soup = htmlparse.get_page(game_url, headers=HEADERS, timeout=15).soup
         
         # Look for og:image
         og_image = soup.find('meta', property='og:image')
@@ -229,14 +204,14 @@ def main():
     
     # Step 1: Remove existing Escape Road games
     print("\nStep 1: Removing existing Escape Road games...", flush=True)
-    existing_games = remove_escape_road_games()
+    remove_escape_road_games()
     
     # Step 2: Fetch the main page
     print(f"\nStep 2: Fetching {BASE_URL}...", flush=True)
     try:
-        r = requests.get(BASE_URL, headers=HEADERS, timeout=30)
+        r = fetch.get(BASE_URL, headers=HEADERS, timeout=30)
         r.raise_for_status()
-        soup = BeautifulSoup(r.content, 'html.parser')
+        soup = htmlparse.parse(r.content)
     except Exception as e:
         print(f"Error fetching page: {e}", flush=True)
         return
@@ -286,23 +261,19 @@ def main():
         except Exception as e:
             print(f"  ✗ Error: {e}", flush=True)
             continue
-        
-        time.sleep(0.5)  # Be polite
     
     # Step 5: Add new games to games.json
     if downloaded_games:
-        existing_games.extend(downloaded_games)
-        games_file = Path(__file__).parent.parent / "data" / "games.json"
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit() as catalog:
+            for game_info in downloaded_games:
+                catalog.insert(game_info)
         
         print(f"\n" + "=" * 60, flush=True)
         print(f"DOWNLOAD SUMMARY", flush=True)
         print(f"=" * 60, flush=True)
         print(f"Downloaded new games: {len(downloaded_games)}/{len(game_urls)}", flush=True)
         print(f"✓ Updated games.json", flush=True)
-        print(f"✓ Total games in database: {len(existing_games)}", flush=True)
+        print(f"✓ Total games in database: {len(catalog)}", flush=True)
     else:
         print("\n⚠ No games were successfully downloaded", flush=True)
 
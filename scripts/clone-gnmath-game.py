@@ -2,14 +2,14 @@
 """
 Clone a specific game from gn-math.dev by zone ID
 """
-import requests
-import json
+from gamelib import fetch, zonecache
 import re
 from urllib.parse import urljoin
 from pathlib import Path
 import sys
 
-ZONES_URL = "https://cdn.jsdelivr.net/gh/gn-math/assets@main/zones.json"
+from gamelib.catalog import Catalog
+
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
@@ -22,19 +22,7 @@ GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=15)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            print(f"    Error downloading {url}: {e}", flush=True)
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=15, silent=silent)
 
 def normalize_directory_name(name):
     """Convert game name to directory name"""
@@ -48,11 +36,9 @@ def main():
     print("=" * 60, flush=True)
     
     # Fetch zones
-    print(f"Fetching zones from {ZONES_URL}...", flush=True)
+    print(f"Loading zones.json...", flush=True)
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones: {e}", flush=True)
         return
@@ -72,29 +58,18 @@ def main():
     print(f"\nFound game: {game_name}", flush=True)
     
     # Check if game already exists
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    with open(games_file, 'r', encoding='utf-8') as f:
-        existing_games = json.load(f)
+    catalog = Catalog.load()
     
     dir_name = normalize_directory_name(game_name)
-    existing_dirs = {g.get('directory', '') for g in existing_games}
-    existing_names = {g.get('name', '').lower() for g in existing_games}
     
     # Check if we should replace existing game
-    existing_game = None
-    for game in existing_games:
-        if game.get('directory') == dir_name or game.get('name', '').lower() == game_name.lower():
-            existing_game = game
-            break
+    existing_game = catalog.find(directory=dir_name, name=game_name)
     
     if existing_game:
         print(f"⚠ Game already exists, will replace it", flush=True)
         print(f"  Name: {game_name}", flush=True)
         print(f"  Directory: {dir_name}", flush=True)
         
-        # Remove old entry
-        existing_games.remove(existing_game)
-        
         # Remove old directory if it exists
         old_dir = GAMES_DIR / dir_name
         if old_dir.exists():
@@ -160,10 +135,12 @@ def main():
         'imagePath': f"{COVERS_BASE}{zone_id}.png"
     }
     
-    existing_games.append(game_info)
-    
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+    # Replace the old entry in one locked batch
+    with Catalog.edit() as catalog:
+        existing_game = catalog.find(directory=dir_name, name=game_name)
+        if existing_game:
+            catalog.delete(existing_game)
+        catalog.insert(game_info)
     
     print(f"\n" + "=" * 60, flush=True)
     print(f"SUCCESS", flush=True)
@@ -171,7 +148,7 @@ def main():
     print(f"✓ Downloaded: {game_name}", flush=True)
     print(f"✓ Directory: {dir_name}", flush=True)
     print(f"✓ Added to games.json", flush=True)
-    print(f"✓ Total games in database: {len(existing_games)}", flush=True)
+    print(f"✓ Total games in database: {len(catalog)}", flush=True)
 
 if __name__ == "__main__":
     main()
@@ -1,66 +1,108 @@
 #!/usr/bin/env python3
 """
-Decompress brotli-compressed Unity WebGL files
+Decompress brotli/gzip-compressed Unity WebGL files across non-semag/
+Usage: python scripts/decompress-brotli.py [game-dir ...] [--in-place] [--workers N] [--dry-run]
+
+Every .br and .gz file is decompressed next to itself (x.wasm.br -> x.wasm),
+in 1 MB chunks, on a process pool. Compressed .unityweb files are only
+reported unless --in-place is given, since the loader config names them. A
+.unityweb file without gzip magic or Unity's brotli marker is only treated
+as brotli if the whole file decodes.
 """
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 try:
-    import brotli
+    import brotli  # noqa: F401
 except ImportError:
     print("Installing brotli library...")
     os.system(f"{sys.executable} -m pip install brotli")
-    import brotli
 
-def decompress_file(input_path, output_path):
-    """Decompress a brotli-compressed file"""
+from gamelib import compress
+
+SITE_ROOT = Path(__file__).resolve().parent.parent
+GAMES_DIR = SITE_ROOT / "non-semag"
+
+BUILD_SUFFIXES = ('.br', '.gz', '.unityweb')
+
+def find_builds(roots):
+    """Compressed build files under roots, found with one walk per root"""
+    found = []
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                if name.lower().endswith(BUILD_SUFFIXES) and not name.startswith('.'):
+                    found.append(Path(dirpath) / name)
+    return sorted(found)
+
+def process_build(path, in_place):
+    """Decompress one build file (runs in a worker process); returns (path, action, detail)"""
     try:
-        with open(input_path, 'rb') as f:
-            compressed_data = f.read()
-        
-        decompressed_data = brotli.decompress(compressed_data)
-        
-        with open(output_path, 'wb') as f:
-            f.write(decompressed_data)
-        
-        print(f"✓ Decompressed: {input_path.name} -> {output_path.name} ({len(decompressed_data):,} bytes)")
-        return True
+        encoding = compress.detect(path)
+        if encoding is None:
+            return path, 'raw', 0
+        if path.suffix.lower() == '.unityweb':
+            if not in_place:
+                return path, 'skipped', encoding
+            output = path
+        else:
+            output = compress.decompressed_name(path)
+
+        written = 0
+        action = 'fresh'
+        if output == path or compress.is_stale(path, output):
+            written = compress.decompress_file(path, output, encoding)
+            action = 'decompressed'
+        return path, action, written
     except Exception as e:
-        print(f"✗ Failed to decompress {input_path.name}: {e}")
-        return False
+        return path, 'failed', str(e)
 
 def main():
-    game_dir = Path("non-semag/stickman-destruction-3-heroes")
-    
-    if not game_dir.exists():
-        print(f"Error: {game_dir} does not exist")
+    args = sys.argv[1:]
+    in_place = '--in-place' in args
+    dry_run = '--dry-run' in args
+    workers = os.cpu_count() or 1
+    if '--workers' in args:
+        idx = args.index('--workers')
+        if idx + 1 < len(args):
+            workers = int(args[idx + 1])
+            del args[idx:idx + 2]
+    roots = [Path(a) for a in args if not a.startswith('--')] or [GAMES_DIR]
+
+    missing = [r for r in roots if not r.exists()]
+    if missing:
+        print(f"Error: {', '.join(map(str, missing))} does not exist")
         return
-    
+
     print("🔧 Decompressing Unity WebGL files...")
     print("=" * 60)
-    
-    files_to_decompress = [
-        ("bl3.framework.js.br", "bl3.framework.js"),
-        ("bl3.wasm.br", "bl3.wasm"),
-        ("bl3.data.br", "bl3.data")
-    ]
-    
-    decompressed_count = 0
-    for br_file, output_file in files_to_decompress:
-        br_path = game_dir / br_file
-        output_path = game_dir / output_file
-        
-        if br_path.exists():
-            if decompress_file(br_path, output_path):
-                decompressed_count += 1
-        else:
-            print(f"⚠️  File not found: {br_file}")
-    
-    print(f"\n✅ Decompressed {decompressed_count}/{len(files_to_decompress)} files")
-    print(f"📁 Files are in: {game_dir.absolute()}")
 
-if __name__ == "__main__":
-    main()
+    builds = find_builds(roots)
+    print(f"📦 Found {len(builds)} compressed build files in {len(roots)} folder(s)\n", flush=True)
+
+    if dry_run:
+        for path in builds:
+            print(f"  {path}: {compress.detect(path) or 'not compressed'}")
+        return
+
+    counts = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_build, path, in_place) for path in builds]
+        for future in as_completed(futures):
+            path, action, detail = future.result()
+            counts[action] = counts.get(action, 0) + 1
+            if action == 'decompressed':
+                print(f"✓ Decompressed: {path.name} ({detail:,} bytes)", flush=True)
+            elif action == 'failed':
+                print(f"✗ Failed to decompress {path.name}: {detail}", flush=True)
+            elif action == 'skipped':
+                print(f"⚠️  {path.name} is {detail}-compressed; use --in-place to decompress it", flush=True)
 
+    summary = ', '.join(f"{n} {action}" for action, n in sorted(counts.items()))
+    print(f"\n✅ Done: {summary or 'nothing to do'}")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Deduplicate non-semag/ by moving game assets into the content-addressed blob
+store and replacing identical files with hardlinks
+Usage: python scripts/dedupe-assets.py [--dry-run] [--gc] [--workers N]
+"""
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from gamelib import blobstore
+
+GAMES_DIR = Path(__file__).parent.parent / "non-semag"
+
+def find_candidates(root):
+    """All files under root that belong in the blob store"""
+    candidates = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if not path.is_symlink() and blobstore.should_store(path):
+                candidates.append(path)
+    return candidates
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    workers = 8
+    if '--workers' in sys.argv:
+        idx = sys.argv.index('--workers')
+        if idx + 1 < len(sys.argv):
+            workers = int(sys.argv[idx + 1])
+
+    print("🗃️  Asset Deduplicator")
+    print("=" * 60, flush=True)
+
+    if '--gc' in sys.argv:
+        removed, freed = blobstore.collect_garbage()
+        print(f"Removed {removed} unreferenced blobs ({freed:,} bytes)")
+        return
+
+    candidates = find_candidates(GAMES_DIR)
+    print(f"Hashing {len(candidates)} files in {GAMES_DIR}...", flush=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        digests = list(executor.map(blobstore.file_digest, candidates))
+
+    groups = defaultdict(list)
+    for path, digest in zip(candidates, digests):
+        groups[digest].append(path)
+
+    # Bytes that become free: every copy beyond the first that isn't already a link
+    duplicate_files = 0
+    saved = 0
+    for digest, paths in groups.items():
+        inodes = {}
+        for path in paths:
+            stat = path.stat()
+            inodes[(stat.st_dev, stat.st_ino)] = stat.st_size
+        if len(inodes) > 1:
+            duplicate_files += len(inodes) - 1
+            saved += sum(inodes.values()) - next(iter(inodes.values()))
+
+    print(f"Unique blobs: {len(groups)}")
+    print(f"Duplicate copies: {duplicate_files} ({saved:,} bytes)")
+
+    if dry_run:
+        print("\nDry run, nothing changed")
+        return
+
+    stored = 0
+    for path, digest in zip(candidates, digests):
+        try:
+            if blobstore.store(path, digest):
+                stored += 1
+        except OSError as e:
+            print(f"  ✗ {path}: {e}")
+
+    print(f"\n✅ Linked {stored} files into {blobstore.STORE_DIR}")
+    print(f"📉 Freed {saved:,} bytes")
+
+if __name__ == "__main__":
+    main()
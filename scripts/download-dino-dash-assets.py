@@ -2,10 +2,8 @@
 """
 Download missing assets for Dino Dash game
 """
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
+from gamelib import assets, crawl, engine, fetch, htmlparse
+import asyncio
 import os
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
@@ -21,32 +19,13 @@ HEADERS = {
     'Referer': 'https://lagged.com/'
 }
 
-def download_file(url, dest_path):
-    """Download a file from URL to destination path"""
-    try:
-        print(f"Downloading: {url}")
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=30)
-        r.raise_for_status()
-        
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        
-        with open(dest_path, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        print(f"  ✓ Saved to {dest_path}")
-        return True
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        return False
-
 def find_play_url():
     """Find the actual game play URL"""
     print(f"Fetching game page: {GAME_URL}")
-    r = requests.get(GAME_URL, headers=HEADERS)
+    r = fetch.get(GAME_URL, headers=HEADERS)
     r.raise_for_status()
     
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = htmlparse.parse(r.text)
     
     # Look for iframe
     iframe = soup.find('iframe')
@@ -68,76 +47,39 @@ def find_play_url():
     
     return None
 
+def local_path(asset):
+    """Scripts go to js/ (where the page loads them from), everything else to assets/"""
+    filename = os.path.basename(urlparse(asset.url).path)
+    if not filename:
+        return None
+    if asset.kind == 'script':
+        return BASE_DIR / "js" / filename
+    return ASSETS_DIR / filename
+
+def log_download(result):
+    if result.ok:
+        print(f"  ✓ {result.path.relative_to(BASE_DIR)}")
+    else:
+        print(f"  ✗ {result.url}: {result.detail}")
+
+async def crawl_assets(play_url, seeds):
+    with engine.DownloadEngine(headers=HEADERS) as downloader:
+        return await crawl.crawl(downloader, play_url, seeds, local_path,
+                                 headers=HEADERS, log=log_download)
+
 def download_game_assets(play_url):
-    """Download all assets from the game page"""
+    """Download the game's files and everything they reference (assetData.json, textures, ...)"""
     print(f"\nFetching game page: {play_url}")
-    r = requests.get(play_url, headers=HEADERS)
+    r = fetch.get(play_url, headers=HEADERS)
     r.raise_for_status()
     
-    soup = BeautifulSoup(r.text, 'html.parser')
-    base_url = '/'.join(play_url.split('/')[:-1]) + '/'
-    
-    # Find all asset references
-    assets = set()
-    
-    # Look for assetData.json references
-    text = r.text
-    asset_data_matches = re.findall(r'["\']([^"\']*assetData\.json[^"\']*)["\']', text, re.IGNORECASE)
-    for match in asset_data_matches:
-        if not match.startswith('http'):
-            match = urljoin(base_url, match)
-        assets.add(match)
-    
-    # Look for script tags
-    scripts = soup.find_all('script')
-    for script in scripts:
-        src = script.get('src', '')
-        if src:
-            if not src.startswith('http'):
-                src = urljoin(base_url, src)
-            assets.add(src)
-    
-    # Look for link tags (CSS, etc.)
-    links = soup.find_all('link')
-    for link in links:
-        href = link.get('href', '')
-        if href:
-            if not href.startswith('http'):
-                href = urljoin(base_url, href)
-            assets.add(href)
+    seeds = assets.extract_page(r.text, play_url, headers=HEADERS)
+    print(f"\nFound {len(seeds)} asset references on the page")
     
-    # Find asset references in JavaScript
-    js_assets = re.findall(r'["\']([^"\']*\.(json|wasm|data|br|png|jpg|jpeg|gif|webp|ttf|woff|woff2)[^"\']*)["\']', text, re.IGNORECASE)
-    for match in js_assets:
-        asset_url = match[0]
-        if not asset_url.startswith('http') and not asset_url.startswith('data:'):
-            asset_url = urljoin(base_url, asset_url)
-            assets.add(asset_url)
-    
-    print(f"\nFound {len(assets)} asset references")
-    
-    # Download assets
-    downloaded = 0
-    for asset_url in assets:
-        if 'assetData.json' in asset_url.lower():
-            # Download to assets directory
-            dest = ASSETS_DIR / "assetData.json"
-            if download_file(asset_url, dest):
-                downloaded += 1
-        elif asset_url.endswith('.json'):
-            # Download JSON files to assets directory
-            filename = os.path.basename(urlparse(asset_url).path)
-            dest = ASSETS_DIR / filename
-            if download_file(asset_url, dest):
-                downloaded += 1
-        elif asset_url.endswith(('.wasm', '.data', '.br')):
-            # Download binary files to assets directory
-            filename = os.path.basename(urlparse(asset_url).path)
-            dest = ASSETS_DIR / filename
-            if download_file(asset_url, dest):
-                downloaded += 1
+    results = asyncio.run(crawl_assets(play_url, seeds))
+    downloaded = sum(1 for result in results if result.ok)
     
-    print(f"\n✓ Downloaded {downloaded} assets")
+    print(f"\n✓ Downloaded {downloaded}/{len(results)} assets")
     return downloaded
 
 def main():
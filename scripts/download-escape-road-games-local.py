@@ -2,13 +2,11 @@
 """
 Download actual game files from Escape Road iframe sources
 """
-import requests
-from bs4 import BeautifulSoup
+from gamelib import fetch, htmlparse, rewrite
 import json
 import re
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
-import time
 import os
 import sys
 
@@ -21,19 +19,7 @@ GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=15)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            print(f"    Error downloading {url}: {e}", flush=True)
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=15, silent=silent)
 
 def download_game_from_url(game_name, game_dir, iframe_url):
     """Download game files from iframe URL"""
@@ -41,10 +27,10 @@ def download_game_from_url(game_name, game_dir, iframe_url):
     
     try:
         # Fetch the game page
-        r = requests.get(iframe_url, headers=HEADERS, timeout=15)
+        r = fetch.get(iframe_url, headers=HEADERS, timeout=15)
         r.raise_for_status()
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        soup = htmlparse.parse(r.content)
         
         # Get the base URL for relative links
         parsed_url = urlparse(iframe_url)
@@ -106,30 +92,14 @@ def download_game_from_url(game_name, game_dir, iframe_url):
             local_path.parent.mkdir(parents=True, exist_ok=True)
             
             if download_file(full_url, local_path, silent=True):
-                # Update the HTML to point to local asset
-                relative_local = f"assets/{local_path.name}"
-                downloaded_assets[relative_path] = relative_local
-        
-        # Update HTML to use local assets
-        for script in soup.find_all('script', src=True):
-            src = script.get('src', '')
-            if src in downloaded_assets:
-                script['src'] = downloaded_assets[src]
-        
-        for link in soup.find_all('link', rel='stylesheet', href=True):
-            href = link.get('href', '')
-            if href in downloaded_assets:
-                link['href'] = downloaded_assets[href]
+                downloaded_assets[full_url] = local_path
         
-        for img in soup.find_all('img', src=True):
-            src = img.get('src', '')
-            if src in downloaded_assets:
-                img['src'] = downloaded_assets[src]
-        
-        # Save the updated HTML
+        # Save the HTML with every reference to a downloaded asset pointing at
+        # the local copy (the rest of the markup is left exactly as served)
         html_file = game_dir / "index.html"
+        html_content, _ = rewrite.Rewriter(downloaded_assets).rewrite(r.text, iframe_url, html_file)
         with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+            f.write(html_content)
         
         print(f"    ✓ Downloaded {len(downloaded_assets)} assets", flush=True)
         return True
@@ -167,7 +137,7 @@ def main():
             # Try without .embed
             test_url = url.replace('.embed', '/')
             try:
-                r = requests.head(test_url, headers=HEADERS, timeout=5, allow_redirects=True)
+                r = fetch.head(test_url, headers=HEADERS, timeout=5, allow_redirects=True)
                 if r.status_code == 200:
                     iframe_urls[key] = test_url
             except:
@@ -192,8 +162,6 @@ def main():
         else:
             failed_count += 1
             print(f"  ✗ Failed: {game_dir_name}", flush=True)
-        
-        time.sleep(1)  # Be polite
     
     print(f"\n" + "=" * 60, flush=True)
     print(f"DOWNLOAD SUMMARY", flush=True)
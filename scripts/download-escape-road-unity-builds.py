@@ -2,12 +2,10 @@
 """
 Download Unity build files for Escape Road games
 """
-import requests
-from bs4 import BeautifulSoup
-import re
+from gamelib import assets, fetch, htmlparse, layout, rewrite
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
-import time
+import posixpath
 import sys
 
 HEADERS = {
@@ -17,22 +15,27 @@ HEADERS = {
 
 GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 
+# .data/.wasm files at least this big are fetched as parallel byte ranges
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+
 def download_file(url, filepath, silent=False):
-    """Download a file from URL"""
+    """Download a file from URL, resuming interrupted transfers of large build files"""
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=30)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
+        fetch.fetch_resumable(url, filepath, headers=HEADERS, parallel_threshold=PARALLEL_THRESHOLD)
         return True
     except Exception as e:
         if not silent:
             print(f"    Error downloading {url}: {e}", flush=True)
         return False
 
+def find_unity_config(soup):
+    """Unity loader config of the first inline script that has one"""
+    for script in soup.find_all('script'):
+        config = assets.unity_config(script.string or '')
+        if config:
+            return config
+    return None
+
 def download_unity_build(game_dir, game_name, base_url):
     """Download Unity build files for a game"""
     html_file = game_dir / "index.html"
@@ -40,181 +43,49 @@ def download_unity_build(game_dir, game_name, base_url):
         print(f"    ⚠ HTML file not found", flush=True)
         return False
     
-    html_content = html_file.read_text(encoding='utf-8')
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = htmlparse.parse(html_file.read_text(encoding='utf-8'))
+    config = find_unity_config(soup)
+    if not config:
+        print(f"    ⚠ Could not find Unity build configuration", flush=True)
+        return False
+    
+    # Paths the page computes for the files (versionFolder, buildUrl, ...) are
+    # resolved against the page and mirrored like any other asset: files below
+    # the page keep their relative path, root-relative and other-host files go
+    # under _external/. streamingAssetsUrl is a folder the game reads from at
+    # runtime, not a file.
+    files_to_download = [path for key, path in config.files.items()
+                         if key != 'streamingAssetsUrl' and not urlparse(path).scheme]
     
-    # Extract build URL and version folder from script tags
-    build_url = None
-    version_folder = None
-    loader_url = None
+    downloaded = {}
+    root = game_dir.resolve()
+    for file_path in files_to_download:
+        full_url = urljoin(base_url, file_path)
+        local_path = layout.mirror_path(full_url, base_url, game_dir)
+        if not local_path.resolve().is_relative_to(root):
+            print(f"    ⚠ Skipping {file_path}: outside the game directory", flush=True)
+            continue
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        print(f"    Downloading: {file_path.split('/')[-1]}...", flush=True)
+        if download_file(full_url, local_path, silent=True):
+            downloaded[full_url] = local_path
     
-    # Find the script that defines buildUrl and versionFolder
-    # Try pattern 1: with versionFolder
-    for script in soup.find_all('script'):
-        script_text = script.string or ''
-        if 'buildUrl' in script_text:
-            # Pattern 1: with versionFolder
-            if 'versionFolder' in script_text:
-                # Extract versionFolder
-                version_match = re.search(r"var versionFolder = ['\"]([^'\"]+)['\"]", script_text)
-                if version_match:
-                    version_folder = version_match.group(1)
-                
-                # Extract buildUrl
-                build_match = re.search(r"var buildUrl = ['\"]([^'\"]+)['\"]", script_text)
-                if build_match:
-                    build_url = build_match.group(1)
-                
-                # Extract loaderUrl
-                loader_match = re.search(r"var loaderUrl = buildUrl \+ ['\"]([^'\"]+)['\"]", script_text)
-                if loader_match:
-                    loader_url = loader_match.group(1)
-                
-                # Extract dataUrl, frameworkUrl, codeUrl
-                data_match = re.search(r"dataUrl: buildUrl \+ ['\"]([^'\"]+)['\"]", script_text)
-                framework_match = re.search(r"frameworkUrl: buildUrl \+ ['\"]([^'\"]+)['\"]", script_text)
-                code_match = re.search(r"codeUrl: buildUrl \+ ['\"]([^'\"]+)['\"]", script_text)
-                streaming_match = re.search(r"streamingAssetsUrl: versionFolder\+['\"]([^'\"]+)['\"]", script_text)
-                
-                if version_folder and build_url:
-                    # Construct full paths
-                    build_base = f"{version_folder}{build_url}"
-                    
-                    files_to_download = []
-                    
-                    if loader_url:
-                        files_to_download.append(f"{build_base}{loader_url}")
-                    
-                    if data_match:
-                        files_to_download.append(f"{build_base}{data_match.group(1)}")
-                    
-                    if framework_match:
-                        files_to_download.append(f"{build_base}{framework_match.group(1)}")
-                    
-                    if code_match:
-                        files_to_download.append(f"{build_base}{code_match.group(1)}")
-                    
-                    if streaming_match:
-                        streaming_path = f"{version_folder}{streaming_match.group(1)}"
-                        files_to_download.append(streaming_path)
-                    
-                    # Download all files
-                    downloaded = 0
-                    for file_path in files_to_download:
-                        full_url = urljoin(base_url, file_path)
-                        # Create local path preserving directory structure
-                        local_path = game_dir / file_path.replace('/', '_').replace('\\', '_')
-                        
-                        # But try to preserve some structure for Build files
-                        if 'Build' in file_path:
-                            # Extract just the filename
-                            filename = file_path.split('/')[-1]
-                            build_dir = game_dir / version_folder.replace('/', '_') / "Build"
-                            build_dir.mkdir(parents=True, exist_ok=True)
-                            local_path = build_dir / filename
-                        elif version_folder in file_path:
-                            # Other version folder files
-                            filename = file_path.replace(version_folder, '').lstrip('/')
-                            version_dir = game_dir / version_folder.replace('/', '_')
-                            version_dir.mkdir(parents=True, exist_ok=True)
-                            local_path = version_dir / filename.replace('/', '_')
-                        
-                        print(f"    Downloading: {file_path.split('/')[-1]}...", flush=True)
-                        if download_file(full_url, local_path, silent=True):
-                            downloaded += 1
-                            # Update HTML to use local path
-                            relative_path = str(local_path.relative_to(game_dir)).replace('\\', '/')
-                            html_content = html_content.replace(file_path, relative_path)
-                    
-                    # Update loaderUrl in script
-                    if loader_url:
-                        old_loader = f"var loaderUrl = buildUrl + \"{loader_url}\";"
-                        new_loader_path = str((game_dir / version_folder.replace('/', '_') / "Build" / loader_url.split('/')[-1]).relative_to(game_dir)).replace('\\', '/')
-                        new_loader = f"var loaderUrl = \"{new_loader_path}\";"
-                        html_content = html_content.replace(old_loader, new_loader)
-                    
-                    # Update buildUrl to use local path
-                    if build_url:
-                        old_build = f"var buildUrl = \"{build_url}\";"
-                        new_build_path = f"{version_folder.replace('/', '_')}/Build"
-                        new_build = f"var buildUrl = \"{new_build_path}\";"
-                        html_content = html_content.replace(old_build, new_build)
-                    
-                    # Save updated HTML
-                    html_file.write_text(html_content, encoding='utf-8')
-                    
-                    print(f"    ✓ Downloaded {downloaded}/{len(files_to_download)} Unity build files", flush=True)
-                    return downloaded > 0
-            
-            # Pattern 2: simple buildUrl without versionFolder (like escape-road-winter)
-            elif 'const buildUrl' in script_text or 'var buildUrl' in script_text:
-                build_match = re.search(r"(?:const|var)\s+buildUrl\s*=\s*['\"]([^'\"]+)['\"]", script_text)
-                if build_match:
-                    build_url = build_match.group(1)
-                
-                loader_match = re.search(r"const loaderUrl\s*=\s*buildUrl\s*\+\s*['\"]([^'\"]+)['\"]", script_text)
-                if loader_match:
-                    loader_url = loader_match.group(1)
-                
-                data_match = re.search(r"dataUrl:\s*buildUrl\s*\+\s*['\"]([^'\"]+)['\"]", script_text)
-                framework_match = re.search(r"frameworkUrl:\s*buildUrl\s*\+\s*['\"]([^'\"]+)['\"]", script_text)
-                code_match = re.search(r"codeUrl:\s*buildUrl\s*\+\s*['\"]([^'\"]+)['\"]", script_text)
-                streaming_match = re.search(r"streamingAssetsUrl:\s*['\"]([^'\"]+)['\"]", script_text)
-                
-                if build_url:
-                    files_to_download = []
-                    
-                    if loader_url:
-                        files_to_download.append(f"{build_url}{loader_url}")
-                    
-                    if data_match:
-                        files_to_download.append(f"{build_url}{data_match.group(1)}")
-                    
-                    if framework_match:
-                        files_to_download.append(f"{build_url}{framework_match.group(1)}")
-                    
-                    if code_match:
-                        files_to_download.append(f"{build_url}{code_match.group(1)}")
-                    
-                    if streaming_match:
-                        files_to_download.append(streaming_match.group(1))
-                    
-                    # Download all files
-                    downloaded = 0
-                    for file_path in files_to_download:
-                        full_url = urljoin(base_url, file_path)
-                        # Create local path
-                        if 'Build' in file_path:
-                            filename = file_path.split('/')[-1]
-                            build_dir = game_dir / "Build"
-                            build_dir.mkdir(parents=True, exist_ok=True)
-                            local_path = build_dir / filename
-                        else:
-                            filename = file_path.split('/')[-1]
-                            local_path = game_dir / filename
-                        
-                        print(f"    Downloading: {filename}...", flush=True)
-                        if download_file(full_url, local_path, silent=True):
-                            downloaded += 1
-                            # Update HTML to use local path
-                            relative_path = str(local_path.relative_to(game_dir)).replace('\\', '/')
-                            html_content = html_content.replace(file_path, relative_path)
-                    
-                    # Update loaderUrl
-                    if loader_url:
-                        old_loader = f"const loaderUrl = buildUrl + \"{loader_url}\";"
-                        new_loader_path = f"Build/{loader_url.split('/')[-1]}"
-                        new_loader = f"const loaderUrl = \"{new_loader_path}\";"
-                        html_content = html_content.replace(old_loader, new_loader)
-                    
-                    # Save updated HTML
-                    html_file.write_text(html_content, encoding='utf-8')
-                    
-                    print(f"    ✓ Downloaded {downloaded}/{len(files_to_download)} Unity build files", flush=True)
-                    return downloaded > 0
+    # Point the page at the files that were saved somewhere other than where
+    # it asks for them (a root-relative /Build/x.wasm is now _external/...)
+    moved = {path: layout.relative_path(urljoin(base_url, path), base_url) for path in files_to_download
+             if urljoin(base_url, path) in downloaded}
+    moved = {path: local for path, local in moved.items() if local != posixpath.normpath(path)}
+    if moved:
+        rewrite.Rewriter(downloaded).rewrite_file(html_file, base_url)
+        html = html_file.read_text(encoding='utf-8')
+        missed = [path for path, local in moved.items() if local not in html]
+        if missed:
+            # e.g. buildUrl + "/x.wasm": the full path never appears in the page
+            print(f"    ⚠ Could not point the page at: {', '.join(missed)}", flush=True)
     
-    print(f"    ⚠ Could not find Unity build configuration", flush=True)
-    return False
+    print(f"    ✓ Downloaded {len(downloaded)}/{len(files_to_download)} Unity build files", flush=True)
+    return len(downloaded) > 0
 
 def main():
     print("Escape Road Unity Build Downloader")
@@ -246,8 +117,6 @@ def main():
             print(f"  ✓ Success: {game_dir_name}", flush=True)
         else:
             print(f"  ✗ Failed: {game_dir_name}", flush=True)
-        
-        time.sleep(1)  # Be polite
     
     print(f"\n" + "=" * 60, flush=True)
     print(f"DOWNLOAD SUMMARY", flush=True)
@@ -2,14 +2,13 @@
 """
 Download all featured zones from gn-math.dev
 """
-import requests
-import json
+from gamelib import fetch, zonecache
 import re
 from pathlib import Path
-import time
 import sys
 
-ZONES_URL = "https://raw.githubusercontent.com/gn-math/assets/main/zones.json"
+from gamelib.catalog import Catalog
+
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
@@ -26,32 +25,9 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-')
 
-def load_existing_games():
-    """Load existing games to avoid duplicates"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    if games_file.exists():
-        with open(games_file, 'r', encoding='utf-8') as f:
-            games = json.load(f)
-            existing_dirs = {g.get('directory', '') for g in games}
-            existing_names = {g.get('name', '').lower() for g in games}
-            return existing_dirs, existing_names
-    return set(), set()
-
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=10)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            pass
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=10, silent=True)
 
 def download_game(zone_id, zone_data, game_dir):
     """Download a single featured game locally"""
@@ -97,11 +73,9 @@ def main():
     print("=" * 60)
     
     # Load zones
-    print(f"Fetching zones from {ZONES_URL}...")
+    print(f"Loading zones.json...")
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones: {e}")
         return
@@ -114,7 +88,7 @@ def main():
     
     print(f"Found {len(featured_zones)} featured zones\n")
     
-    existing_dirs, existing_names = load_existing_games()
+    catalog = Catalog.load()
     
     # Filter out games that already exist
     available_zones = []
@@ -124,7 +98,7 @@ def main():
         if not dir_name or len(dir_name) < 2:
             dir_name = f"zone-{zone.get('id')}"
         
-        if name.lower() not in existing_names and dir_name not in existing_dirs:
+        if not catalog.exists(name=name, directory=dir_name):
             available_zones.append((zone.get('id'), zone, name, dir_name))
         else:
             print(f"  ⏭ Skipping (already exists): {name}")
@@ -161,8 +135,6 @@ def main():
             failed_games.append(name)
             print(f"  Error: {name} - {e}", flush=True)
             continue
-        
-        time.sleep(0.5)  # Be polite
     
     # Add to games.json
     print("\n" + "=" * 60)
@@ -172,17 +144,13 @@ def main():
     print(f"Failed: {len(failed_games)}/{total_to_download}")
     
     if downloaded_games:
-        games_file = Path(__file__).parent.parent / "data" / "games.json"
-        with open(games_file, 'r', encoding='utf-8') as f:
-            existing_games = json.load(f)
-        
-        existing_games.extend(downloaded_games)
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit() as catalog:
+            for game_info in downloaded_games:
+                if not catalog.exists(name=game_info['name'], directory=game_info['directory']):
+                    catalog.insert(game_info)
         
         print(f"\n✓ Added {len(downloaded_games)} featured zones to games.json")
-        print(f"✓ Total games in database: {len(existing_games)}")
+        print(f"✓ Total games in database: {len(catalog)}")
     else:
         print("\n⚠ No featured zones were successfully downloaded")
     
@@ -2,18 +2,17 @@
 """
 Download games from gn-math.dev locally (no iframes)
 """
-import requests
+from gamelib import fetch, zonecache
 from bs4 import BeautifulSoup
-import json
 import re
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
-import time
 import os
 import sys
 
+from gamelib.catalog import Catalog
+
 BASE_URL = "https://gn-math.dev/"
-ZONES_URL = "https://cdn.jsdelivr.net/gh/gn-math/assets@main/zones.json"
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
@@ -25,33 +24,9 @@ HEADERS = {
 GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 MAX_GAMES = 50
 
-def load_existing_games():
-    """Load existing games to avoid duplicates"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    if games_file.exists():
-        with open(games_file, 'r', encoding='utf-8') as f:
-            games = json.load(f)
-            existing_dirs = {g.get('directory', '') for g in games}
-            existing_names = {g.get('name', '').lower() for g in games}
-            return existing_dirs, existing_names
-    return set(), set()
-
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=10)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            # Only print first few errors to avoid spam
-            pass
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=10, silent=True)
 
 def download_game(zone_id, zone_data, game_dir):
     """Download a single game locally"""
@@ -107,11 +82,9 @@ def main():
     print("=" * 50)
     
     # Load zones
-    print(f"Fetching zones from {ZONES_URL}...")
+    print(f"Loading zones.json...")
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones: {e}")
         return
@@ -126,7 +99,7 @@ def main():
     
     print(f"Found {len(zones)} zones")
     
-    existing_dirs, existing_names = load_existing_games()
+    catalog = Catalog.load()
     
     # Filter out games that already exist and skip special entries
     available_zones = []
@@ -144,7 +117,7 @@ def main():
         if not dir_name or len(dir_name) < 2:
             dir_name = f"zone-{zone_id}"
         
-        if name.lower() not in existing_names and dir_name not in existing_dirs:
+        if not catalog.exists(name=name, directory=dir_name):
             available_zones.append((zone_id, zone_data, name, dir_name))
     
     print(f"\nFound {len(available_zones)} available games")
@@ -179,8 +152,6 @@ def main():
             failed_games.append(name)
             print(f"  Error: {name} - {e}", flush=True)
             continue
-        
-        time.sleep(0.5)  # Be polite
     
     # Add to games.json
     print("\n" + "=" * 50)
@@ -190,17 +161,16 @@ def main():
     print(f"Failed: {len(failed_games)}/{total_to_download}")
     
     if downloaded_games:
-        games_file = Path(__file__).parent.parent / "data" / "games.json"
-        with open(games_file, 'r', encoding='utf-8') as f:
-            existing_games = json.load(f)
-        
-        existing_games.extend(downloaded_games)
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        # Re-read under the lock so games added by other runs meanwhile are kept
+        added = 0
+        with Catalog.edit() as catalog:
+            for game_info in downloaded_games:
+                if not catalog.exists(name=game_info['name'], directory=game_info['directory']):
+                    catalog.insert(game_info)
+                    added += 1
         
-        print(f"\n✓ Added {len(downloaded_games)} games to games.json")
-        print(f"✓ Total games in database: {len(existing_games)}")
+        print(f"\n✓ Added {added} games to games.json")
+        print(f"✓ Total games in database: {len(catalog)}")
     else:
         print("\n⚠ No games were successfully downloaded")
     
@@ -2,57 +2,29 @@
 """
 Fix all gn-math games to match zones.json exactly by zone ID
 """
-import json
-import requests
+from gamelib import zonecache
+from gamelib.catalog import Catalog, GAMES_JSON, cover_source, set_cover_source
+from gamelib.zonematch import AUTO_APPLY, ZoneIndex, describe, name_key
 import re
-from pathlib import Path
 
-ZONES_URL = "https://raw.githubusercontent.com/gn-math/assets/main/zones.json"
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
-def normalize_name(name):
-    """Normalize game name for matching"""
-    # Remove version numbers, extra info
-    name = re.sub(r'\s+v?\d+\.?\d*.*$', '', name, flags=re.IGNORECASE)
-    name = re.sub(r'\s+\(.*?\)', '', name)
-    name = re.sub(r'\s+\[.*?\]', '', name)
-    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
-
 def load_zones():
     """Load zones.json"""
-    print(f"Fetching zones.json...")
-    r = requests.get(ZONES_URL, timeout=30)
-    r.raise_for_status()
-    zones = r.json()
+    print(f"Loading zones.json...")
+    zones = zonecache.load()
     print(f"Loaded {len(zones)} zones")
     return zones
 
-def load_games():
-    """Load current games.json"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    return games
-
 def match_by_directory_and_zone_id(games, zones):
-    """Match games by directory name and zone ID from imagePath"""
-    # Create zone lookup by ID
-    zone_by_id = {}
-    for zone in zones:
-        if 'id' in zone and zone['id'] != -1:
-            zone_by_id[zone['id']] = zone
-    
-    # Create zone lookup by normalized name
-    zone_by_name = {}
-    for zone in zones:
-        if 'name' in zone and 'id' in zone and zone['id'] != -1:
-            norm_name = normalize_name(zone['name'])
-            if norm_name not in zone_by_name:
-                zone_by_name[norm_name] = zone
+    """Match games by zone ID from imagePath, falling back to fuzzy name matching"""
+    index = ZoneIndex(zones)
     
     fixed_games = []
     fixed_count = 0
+    ambiguous = []
+    fuzzy = []
     
     for game in games:
         if game.get('source') != 'non-semag':
@@ -60,69 +32,42 @@ def match_by_directory_and_zone_id(games, zones):
             continue
         
         game_name = game.get('name', '')
-        game_dir = game.get('directory', '')
-        image_path = game.get('imagePath', '')
-        
-        # Extract zone ID from imagePath if present
-        zone_id = None
-        if image_path:
-            match = re.search(r'/(\d+)\.png', image_path)
-            if match:
-                zone_id = int(match.group(1))
-        
-        # Try to find matching zone
-        matched_zone = None
+        match = index.match_game(game)
+        matched_zone = match.zone
         
-        # First try by zone ID from imagePath
-        if zone_id is not None and zone_id in zone_by_id:
-            matched_zone = zone_by_id[zone_id]
-            # Verify the name matches (or is close)
-            norm_game = normalize_name(game_name)
-            norm_zone = normalize_name(matched_zone['name'])
-            if norm_game != norm_zone:
-                print(f"  ⚠ Zone ID {zone_id} mismatch: '{game_name}' -> '{matched_zone['name']}'")
-                # Update to correct name
+        if matched_zone and match.status not in AUTO_APPLY:
+            # Probably right, but not certain enough to rename an entry unseen
+            fuzzy.append(describe(game, match))
+            matched_zone = None
+        elif match.status == 'id':
+            # Zone ID from imagePath; make the name agree with the zone exactly
+            if name_key(game_name) != name_key(matched_zone['name']):
+                print(f"  ⚠ Zone ID {matched_zone['id']} mismatch: '{game_name}' -> '{matched_zone['name']}'")
                 game['name'] = matched_zone['name']
                 game['directory'] = re.sub(r'[^a-z0-9]+', '-', matched_zone['name'].lower()).strip('-')
-                game['imagePath'] = f"{COVERS_BASE}{zone_id}.png"
                 fixed_count += 1
-        else:
-            # Try to match by name
-            norm_game = normalize_name(game_name)
-            if norm_game in zone_by_name:
-                matched_zone = zone_by_name[norm_game]
-                zone_id = matched_zone['id']
-                # Update imagePath if missing or wrong
-                if not image_path or f"/{zone_id}.png" not in image_path:
-                    game['imagePath'] = f"{COVERS_BASE}{zone_id}.png"
-                    fixed_count += 1
-        
-        # Special case: Check for "Ragdoll Hit" that should be "Driven Wild"
-        if 'ragdoll' in game_name.lower() and 'hit' in game_name.lower():
-            # Check if imagePath points to zone 43 (Driven Wild)
-            if image_path and '/43.png' in image_path:
-                print(f"  Fixing: '{game_name}' is actually 'Driven Wild' (zone 43)")
-                if 43 in zone_by_id:
-                    game['name'] = zone_by_id[43]['name']
-                    game['directory'] = re.sub(r'[^a-z0-9]+', '-', zone_by_id[43]['name'].lower()).strip('-')
-                    game['imagePath'] = f"{COVERS_BASE}43.png"
-                    fixed_count += 1
-            # Or if it should be Ragdoll Hit (zone 44)
-            elif 44 in zone_by_id:
-                print(f"  Fixing: '{game_name}' should be 'Ragdoll Hit' (zone 44)")
-                game['name'] = zone_by_id[44]['name']
-                game['directory'] = re.sub(r'[^a-z0-9]+', '-', zone_by_id[44]['name'].lower()).strip('-')
-                game['imagePath'] = f"{COVERS_BASE}44.png"
+        elif matched_zone:
+            # Matched by name; update imagePath if missing or wrong
+            if f"/{matched_zone['id']}.png" not in (cover_source(game) or ''):
                 fixed_count += 1
+        elif match.status == 'ambiguous':
+            ambiguous.append(describe(game, match))
         
         # Ensure imagePath is set correctly based on zone ID
-        if matched_zone and 'id' in matched_zone:
-            correct_path = f"{COVERS_BASE}{matched_zone['id']}.png"
-            if game.get('imagePath') != correct_path:
-                game['imagePath'] = correct_path
+        if matched_zone:
+            set_cover_source(game, f"{COVERS_BASE}{matched_zone['id']}.png")
         
         fixed_games.append(game)
     
+    if fuzzy:
+        print(f"\n  Fuzzy matches, not applied ({len(fuzzy)}):")
+        for line in fuzzy:
+            print(f"    [~] {line}")
+    if ambiguous:
+        print(f"\n  Ambiguous, left unchanged ({len(ambiguous)}):")
+        for line in ambiguous:
+            print(f"    [?] {line}")
+    
     return fixed_games, fixed_count
 
 def main():
@@ -130,22 +75,18 @@ def main():
     print("=" * 50)
     
     zones = load_zones()
-    games = load_games()
-    
-    print(f"\nCurrent games: {len(games)}")
-    non_semag = [g for g in games if g.get('source') == 'non-semag']
-    print(f"Non-semag games: {len(non_semag)}")
     
-    print("\nFixing matches...")
-    fixed_games, fixed_count = match_by_directory_and_zone_id(games, zones)
-    
-    # Save
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(fixed_games, f, indent='\t', ensure_ascii=False)
+    with Catalog.edit() as catalog:
+        print(f"\nCurrent games: {len(catalog)}")
+        non_semag = [g for g in catalog if g.get('source') == 'non-semag']
+        print(f"Non-semag games: {len(non_semag)}")
+        
+        print("\nFixing matches...")
+        fixed_games, fixed_count = match_by_directory_and_zone_id(catalog.games, zones)
+        catalog.replace(fixed_games)
     
     print(f"\n✓ Fixed {fixed_count} games")
-    print(f"✓ Saved to {games_file}")
+    print(f"✓ Saved to {GAMES_JSON}")
 
 if __name__ == "__main__":
     main()
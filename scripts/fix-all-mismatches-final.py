@@ -2,31 +2,17 @@
 """
 Fix all mismatches based on actual directory contents and zones.json
 """
-import json
-import requests
-from pathlib import Path
+from gamelib import zonecache
+from gamelib.catalog import Catalog, cover_source, set_cover_source
 import re
 
-ZONES_URL = "https://raw.githubusercontent.com/gn-math/assets/main/zones.json"
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 
 def load_zones():
-    r = requests.get(ZONES_URL, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return zonecache.load()
 
-def main():
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    zones = load_zones()
-    
-    # Create zone lookup
-    zone_by_id = {z['id']: z for z in zones if 'id' in z and z['id'] != -1}
-    
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    
-    print("Fixing all mismatches based on zones.json...")
-    
+def fix_games(games, zone_by_id):
+    """Apply the known corrections and zone names; returns (games, fixed count)"""
     # Known directory corrections based on actual file contents
     directory_corrections = {
         'ragdoll-hit': {'name': 'Driven Wild', 'zone_id': 43},
@@ -51,7 +37,7 @@ def main():
             if game_name != correction['name']:
                 print(f"  Fixing {game_dir}: '{game_name}' -> '{correction['name']}' (zone {correction['zone_id']})")
                 game['name'] = correction['name']
-                game['imagePath'] = f"{COVERS_BASE}{correction['zone_id']}.png"
+                set_cover_source(game, f"{COVERS_BASE}{correction['zone_id']}.png")
                 fixed_count += 1
         
         # Remove duplicates - keep first occurrence of each directory
@@ -62,7 +48,7 @@ def main():
         seen_dirs.add(game_dir)
         
         # Ensure imagePath matches zone ID from zones.json
-        image_path = game.get('imagePath', '')
+        image_path = cover_source(game)
         if image_path:
             match = re.search(r'/(\d+)\.png', image_path)
             if match:
@@ -77,12 +63,22 @@ def main():
         
         fixed_games.append(game)
     
-    # Save
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(fixed_games, f, indent='\t', ensure_ascii=False)
+    return fixed_games, fixed_count
+
+def main():
+    zones = load_zones()
+    
+    # Create zone lookup
+    zone_by_id = {z['id']: z for z in zones if 'id' in z and z['id'] != -1}
+    
+    print("Fixing all mismatches based on zones.json...")
+    
+    with Catalog.edit() as catalog:
+        fixed_games, fixed_count = fix_games(catalog.games, zone_by_id)
+        catalog.replace(fixed_games)
     
     print(f"\n✓ Fixed {fixed_count} games")
-    print(f"✓ Total games: {len(fixed_games)}")
+    print(f"✓ Total games: {len(catalog)}")
 
 if __name__ == "__main__":
     main()
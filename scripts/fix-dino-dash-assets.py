@@ -2,7 +2,7 @@
 """
 Fix Dino Dash assets by finding and downloading assetData.json
 """
-import requests
+from gamelib import fetch
 from bs4 import BeautifulSoup
 import json
 import re
@@ -53,7 +53,7 @@ def try_download_asset(url, filename="assetData.json"):
         # Try the direct URL
         test_url = urljoin(url, filename)
         print(f"Trying: {test_url}")
-        r = requests.get(test_url, headers=HEADERS, timeout=10)
+        r = fetch.get(test_url, headers=HEADERS, timeout=10)
         if r.status_code == 200:
             dest = ASSETS_DIR / filename
             ASSETS_DIR.mkdir(parents=True, exist_ok=True)
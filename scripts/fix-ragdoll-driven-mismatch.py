@@ -2,17 +2,10 @@
 """
 Fix the Ragdoll Hit / Driven Wild mismatch
 """
-import json
-from pathlib import Path
+from gamelib.catalog import Catalog, set_cover_source
 
-def main():
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    
-    print("Fixing Ragdoll Hit / Driven Wild mismatch...")
-    
+def fix_mismatch(games):
+    """Return games with the Ragdoll Hit / Driven Wild entries corrected"""
     # Find and fix entries
     for game in games:
         if game.get('source') != 'non-semag':
@@ -22,8 +15,7 @@ def main():
         if game.get('directory') == 'ragdoll-hit':
             print(f"  Fixing: ragdoll-hit directory -> Driven Wild (zone 43)")
             game['name'] = 'Driven Wild'
-            game['imagePath'] = 'https://cdn.jsdelivr.net/gh/gn-math/covers@main/43.png'
-            game['imagePath'] = 'https://cdn.jsdelivr.net/gh/gn-math/covers@main/43.png'
+            set_cover_source(game, 'https://cdn.jsdelivr.net/gh/gn-math/covers@main/43.png')
         
         # Remove duplicate Driven Wild if it exists (keep the one in ragdoll-hit)
         if game.get('directory') == 'driven-wild' and game.get('name') == 'Driven Wild':
@@ -44,14 +36,16 @@ def main():
             else:
                 seen_road.add(key)
     
-    games = [g for g in games if not g.get('_remove')]
+    return [g for g in games if not g.get('_remove')]
+
+def main():
+    print("Fixing Ragdoll Hit / Driven Wild mismatch...")
     
-    # Save
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(games, f, indent='\t', ensure_ascii=False)
+    with Catalog.edit() as catalog:
+        catalog.replace(fix_mismatch(catalog.games))
     
     print(f"\n✓ Fixed mismatches")
-    print(f"✓ Total games: {len(games)}")
+    print(f"✓ Total games: {len(catalog)}")
 
 if __name__ == "__main__":
     main()
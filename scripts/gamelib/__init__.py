@@ -0,0 +1,12 @@
+"""
+Shared helpers for the game scraper and maintenance scripts
+
+The scripts in this folder are run directly (python scripts/<name>.py), which
+puts scripts/ on sys.path, so they can simply `from gamelib import fetch`.
+"""
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Local state kept between runs (HTTP validators, snapshots, ...); not committed
+CACHE_DIR = REPO_ROOT / '.scraper-cache'
@@ -0,0 +1,459 @@
+"""
+Asset discovery for mirrored game pages
+
+extract() finds every file a game page refers to in one pass over the HTML:
+
+- src/href/data/poster attributes of script, link, img, source, video, audio,
+  embed, object and iframe tags
+- srcset candidates and <link rel="preload|modulepreload|prefetch|icon">
+- url() and @import in <style> blocks and style="" attributes
+- quoted file names in inline scripts, including the Unity loader config
+  (buildUrl/loaderUrl/dataUrl/...) and the PlayCanvas settings
+  (ASSET_PREFIX, SCENE_PATH, CONFIG_FILENAME, PRELOAD_MODULES)
+
+extract_page() additionally downloads the linked stylesheets and follows their
+url() and @import references recursively. extract_css(), extract_js() and
+extract_json() do the same for files that were downloaded separately (see
+gamelib.crawl).
+
+Everything lands in an AssetSet: absolute URLs, de-duplicated, in discovery
+order, each tagged with a kind ('script', 'stylesheet', 'image', 'font',
+'media', 'data', 'document' or 'other') and the place it was found.
+"""
+import json
+import re
+from collections import deque, namedtuple
+from pathlib import PurePosixPath
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from gamelib import fetch, htmlparse
+
+Asset = namedtuple('Asset', 'url kind source')
+UnityConfig = namedtuple('UnityConfig', 'variables files')
+
+KINDS = ('script', 'stylesheet', 'image', 'font', 'media', 'data', 'document', 'other')
+
+EXTENSION_KINDS = {
+    '.js': 'script', '.mjs': 'script', '.cjs': 'script',
+    '.css': 'stylesheet',
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image', '.webp': 'image',
+    '.avif': 'image', '.svg': 'image', '.ico': 'image', '.bmp': 'image', '.cur': 'image',
+    '.woff': 'font', '.woff2': 'font', '.ttf': 'font', '.otf': 'font', '.eot': 'font', '.fnt': 'font',
+    '.mp3': 'media', '.ogg': 'media', '.wav': 'media', '.m4a': 'media', '.aac': 'media',
+    '.mp4': 'media', '.webm': 'media',
+    '.wasm': 'data', '.data': 'data', '.json': 'data', '.bin': 'data', '.swf': 'data',
+    '.mem': 'data', '.pck': 'data', '.atlas': 'data', '.xml': 'data', '.txt': 'data',
+    '.glb': 'data', '.gltf': 'data', '.basis': 'data', '.ktx2': 'data', '.zip': 'data',
+    '.html': 'document', '.htm': 'document',
+}
+# Transport wrappers; the kind comes from the extension underneath
+COMPRESSED_SUFFIXES = ('.br', '.gz', '.unityweb')
+
+# rel values of <link> tags that point at something the page loads
+LINK_RELS = {
+    'stylesheet': 'stylesheet',
+    'icon': 'image',
+    'shortcut': 'image',
+    'apple-touch-icon': 'image',
+    'apple-touch-icon-precomposed': 'image',
+    'mask-icon': 'image',
+    'manifest': 'data',
+    'preload': None,
+    'prefetch': None,
+    'modulepreload': 'script',
+}
+# <link rel="preload" as="...">
+PRELOAD_AS = {
+    'script': 'script', 'worker': 'script', 'style': 'stylesheet', 'image': 'image',
+    'font': 'font', 'audio': 'media', 'video': 'media', 'fetch': 'data', 'document': 'document',
+}
+# (tag, attribute) -> kind, None meaning "from the extension"
+TAG_ATTRS = {
+    'script': (('src', 'script'),),
+    'img': (('src', 'image'), ('data-src', 'image')),
+    'input': (('src', 'image'),),
+    'source': (('src', None), ('data-src', None)),
+    'video': (('src', 'media'), ('poster', 'image')),
+    'audio': (('src', 'media'),),
+    'track': (('src', 'data'),),
+    'embed': (('src', None),),
+    'object': (('data', None),),
+    'iframe': (('src', 'document'),),
+}
+SRCSET_TAGS = ('img', 'source')
+ELEMENT_SELECTOR = ', '.join(
+    list(TAG_ATTRS) + ['base[href]', 'link[href]', 'param', 'style', '[style]', '[background]'])
+# <param name="movie" value="game.swf"> inside a Flash <object>
+PARAM_NAMES = ('movie', 'src', 'url')
+
+SKIP_SCHEMES = ('data:', 'blob:', 'javascript:', 'about:', 'mailto:', 'tel:', 'chrome-extension:')
+
+CSS_URL_RE = re.compile(r'''url\(\s*(?:"([^"]*)"|'([^']*)'|([^)'"\s]+))\s*\)''', re.IGNORECASE)
+CSS_IMPORT_RE = re.compile(
+    r'''@import\s+(?:url\(\s*)?(?:"([^"]+)"|'([^']+)'|([^)'"\s;]+))''', re.IGNORECASE)
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+SRCSET_SPLIT_RE = re.compile(r',\s+|,(?=[^\s,]*\s)')
+
+_ASSET_EXTENSIONS = sorted(
+    {ext[1:] for ext in EXTENSION_KINDS if ext not in ('.html', '.htm', '.txt', '.xml')}
+    | {s[1:] for s in COMPRESSED_SUFFIXES}, key=len, reverse=True)
+JS_FILE_RE = re.compile(
+    r'''["'`]([^"'`\s<>\\(){}]+?\.(?:%s))(?:[?#][^"'`\s<>]*)?["'`]''' % '|'.join(_ASSET_EXTENSIONS),
+    re.IGNORECASE)
+# A whole JSON string value that is a file path
+JSON_FILE_RE = re.compile(
+    r'''[^"'`\s<>\\(){}]+\.(?:%s)(?:[?#][^"'`\s<>]*)?$''' % '|'.join(_ASSET_EXTENSIONS),
+    re.IGNORECASE)
+
+JS_STRING =r'''(?:"[^"\n]*"|'[^'\n]*')'''
+JS_OPERAND = r'(?:%s|[A-Za-z_$][\w$.]*)' % JS_STRING
+JS_EXPR = r'%s(?:\s*\+\s*%s)*' % (JS_OPERAND, JS_OPERAND)
+JS_ASSIGN_RE = re.compile(
+    r'(?:\b(?:var|let|const)\s+|(?<![\w$.]))([A-Za-z_$][\w$]*)\s*=(?!=)\s*(%s)' % JS_EXPR)
+JS_TERM_RE = re.compile(r'"([^"\n]*)"|\'([^\'\n]*)\'|([A-Za-z_$][\w$.]*)')
+
+UNITY_KEYS = ('loaderUrl', 'dataUrl', 'frameworkUrl', 'codeUrl', 'memoryUrl',
+              'symbolsUrl', 'workerUrl', 'streamingAssetsUrl')
+UNITY_KEY_RE = re.compile(r'\b(%s)\s*[:=](?!=)\s*(%s)' % ('|'.join(UNITY_KEYS), JS_EXPR))
+
+PLAYCANVAS_VARS = ('ASSET_PREFIX', 'SCRIPT_PREFIX', 'SCENE_PATH', 'CONFIG_FILENAME')
+PLAYCANVAS_VAR_RE = re.compile(
+    r'\b(?:window\.)?(%s)\s*=\s*(%s)' % ('|'.join(PLAYCANVAS_VARS), JS_STRING))
+PLAYCANVAS_MODULE_RE = re.compile(r'''['"]?(glueUrl|wasmUrl|fallbackUrl)['"]?\s*:\s*(%s)''' % JS_STRING)
+
+def kind_of(url, default='other'):
+    """Guess an asset kind from the file extension, looking through .br/.gz/.unityweb"""
+    name = PurePosixPath(urlparse(url).path).name.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix) and name != suffix:
+            name = name[:-len(suffix)]
+    dot = name.rfind('.')
+    if dot == -1:
+        return default
+    return EXTENSION_KINDS.get(name[dot:], default)
+
+def _usable(ref):
+    ref = ref.strip()
+    if not ref or ref.startswith('#') or '${' in ref or '{{' in ref:
+        return None
+    if ref.lower().startswith(SKIP_SCHEMES):
+        return None
+    return ref
+
+class AssetSet:
+    """Ordered, de-duplicated collection of Assets keyed by absolute URL"""
+
+    def __init__(self, assets=()):
+        self._assets = {}
+        for asset in assets:
+            self.add(asset.url, asset.kind, asset.source)
+
+    def add(self, ref, kind=None, source='html', base_url=None):
+        """Add ref (resolved against base_url) and return its Asset, or None if it is not a file"""
+        ref = _usable(ref or '')
+        if ref is None:
+            return None
+        url = urldefrag(urljoin(base_url, ref) if base_url else ref)[0]
+        if urlparse(url).scheme not in ('http', 'https', 'file', ''):
+            return None
+        kind = kind or kind_of(url)
+        existing = self._assets.get(url)
+        if existing is not None:
+            # A later, more specific sighting wins over a guess
+            if existing.kind == 'other' and kind != 'other':
+                existing = self._assets[url] = existing._replace(kind=kind)
+            return existing
+        asset = self._assets[url] = Asset(url, kind, source)
+        return asset
+
+    def update(self, other):
+        for asset in other:
+            self.add(asset.url, asset.kind, asset.source)
+        return self
+
+    def __iter__(self):
+        return iter(self._assets.values())
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, url):
+        return url in self._assets
+
+    def get(self, url):
+        return self._assets.get(url)
+
+    def urls(self, *kinds):
+        """URLs in discovery order, optionally only the given kinds"""
+        return [a.url for a in self if not kinds or a.kind in kinds]
+
+    def by_kind(self):
+        """{kind: [url, ...]} with every kind present, in KINDS order"""
+        grouped = {kind: [] for kind in KINDS}
+        for asset in self:
+            grouped.setdefault(asset.kind, []).append(asset.url)
+        return grouped
+
+    def filter(self, predicate):
+        """New AssetSet with the assets for which predicate(asset) is true"""
+        return AssetSet(a for a in self if predicate(a))
+
+    def same_origin(self, base_url):
+        """Only the assets served from base_url's host"""
+        host = urlparse(base_url).netloc.lower()
+        return self.filter(lambda a: urlparse(a.url).netloc.lower() == host)
+
+    def __repr__(self):
+        counts = ', '.join(f"{k}={len(v)}" for k, v in self.by_kind().items() if v)
+        return f"AssetSet({counts})"
+
+def parse_srcset(value):
+    """URLs of a srcset attribute ("a.png 1x, b.png 2x" -> ['a.png', 'b.png'])"""
+    urls = []
+    for candidate in SRCSET_SPLIT_RE.split(value.strip()):
+        parts = candidate.split()
+        if parts:
+            urls.append(parts[0])
+    return urls
+
+def extract_css(css, base_url, assets=None, source='css'):
+    """Add the url() and @import references of a stylesheet; returns the AssetSet"""
+    assets = AssetSet() if assets is None else assets
+    css = CSS_COMMENT_RE.sub('', css)
+    for m in CSS_IMPORT_RE.finditer(css):
+        assets.add(m.group(1) or m.group(2) or m.group(3), 'stylesheet', source, base_url)
+    for m in CSS_URL_RE.finditer(css):
+        ref = m.group(1) or m.group(2) or m.group(3)
+        assets.add(ref, None, source, base_url)
+    return assets
+
+def _eval_js(expr, variables):
+    """Value of a `"a" + name + 'b'` expression, or None if a name is unknown"""
+    parts = []
+    for m in JS_TERM_RE.finditer(expr):
+        literal = m.group(1) if m.group(1) is not None else m.group(2)
+        if literal is None:
+            literal = variables.get(m.group(3).rsplit('.', 1)[-1])
+            if literal is None:
+                return None
+        parts.append(literal)
+    return ''.join(parts)
+
+def unity_config(js):
+    """Resolve a Unity WebGL loader config from script text
+
+    Follows string assignments in source order (so `buildUrl = versionFolder +
+    buildUrl` works) and returns UnityConfig(variables, files), files mapping
+    loaderUrl/dataUrl/frameworkUrl/codeUrl/... to page-relative paths, or None
+    if the script has no Unity config.
+    """
+    if not any(key in js for key in ('dataUrl', 'codeUrl', 'frameworkUrl')):
+        return None
+    variables = {}
+    events = [(m.start(), 'var', m) for m in JS_ASSIGN_RE.finditer(js)]
+    events += [(m.start(), 'key', m) for m in UNITY_KEY_RE.finditer(js)]
+    files = {}
+    for _, event, m in sorted(events, key=lambda e: e[0]):
+        value = _eval_js(m.group(2), variables)
+        if value is None:
+            continue
+        if event == 'var':
+            variables[m.group(1)] = value
+        if m.group(1) in UNITY_KEYS and value:
+            files[m.group(1)] = value
+    if not any(k in files for k in ('dataUrl', 'codeUrl', 'frameworkUrl')):
+        return None
+    return UnityConfig(variables, {k: files[k] for k in UNITY_KEYS if k in files})
+
+def playcanvas_config(js):
+    """PlayCanvas launcher settings (ASSET_PREFIX, SCENE_PATH, ...) and preload module URLs"""
+    if 'CONFIG_FILENAME' not in js and 'glueUrl' not in js:
+        return None
+    settings = {m.group(1): m.group(2)[1:-1] for m in PLAYCANVAS_VAR_RE.finditer(js)}
+    modules = [m.group(2)[1:-1] for m in PLAYCANVAS_MODULE_RE.finditer(js)]
+    if not settings and not modules:
+        return None
+    return settings, modules
+
+def playcanvas_assets(config, base_url, assets=None, prefix=''):
+    """Add the files listed in a PlayCanvas config.json (dict or JSON text)"""
+    assets = AssetSet() if assets is None else assets
+    if isinstance(config, (str, bytes)):
+        config = json.loads(config)
+    for entry in (config.get('assets') or {}).values():
+        file = entry.get('file') if isinstance(entry, dict) else None
+        if file and file.get('url'):
+            assets.add(prefix + file['url'], None, 'playcanvas', base_url)
+    for scene in config.get('scenes') or []:
+        if scene.get('url'):
+            assets.add(prefix + scene['url'], 'data', 'playcanvas', base_url)
+    return assets
+
+def _json_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_strings(item)
+
+def extract_json(text, base_url, assets=None, source='json'):
+    """Add the files a JSON document lists (PlayCanvas configs, asset manifests, ...)"""
+    assets = AssetSet() if assets is None else assets
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return assets
+    if isinstance(data, dict) and isinstance(data.get('assets'), dict):
+        playcanvas_assets(data, base_url, assets)
+    for value in _json_strings(data):
+        if len(value) < 512 and JSON_FILE_RE.match(value):
+            assets.add(value, None, source, base_url)
+    return assets
+
+def extract_js(js, base_url, assets=None, source='js', script_url=None):
+    """Add the files an inline or external script refers to; returns the AssetSet
+
+    Paths are resolved against the page (base_url), except "./" and "../"
+    paths in an external script, which are relative to the script (script_url).
+    """
+    assets = AssetSet() if assets is None else assets
+    unity = unity_config(js)
+    if unity:
+        for path in unity.files.values():
+            kind = 'data' if path == unity.files.get('streamingAssetsUrl') else None
+            assets.add(path, kind, 'unity', base_url)
+    playcanvas = playcanvas_config(js)
+    if playcanvas:
+        settings, modules = playcanvas
+        prefix = settings.get('ASSET_PREFIX', '')
+        for key in ('CONFIG_FILENAME', 'SCENE_PATH'):
+            if settings.get(key):
+                assets.add(prefix + settings[key], 'data', 'playcanvas', base_url)
+        for path in modules:
+            assets.add(prefix + path, None, 'playcanvas', base_url)
+    for m in JS_FILE_RE.finditer(js):
+        ref = m.group(1)
+        # Pieces of a concatenation ("/x.data" in `buildUrl + "/x.data"`) only
+        # make sense resolved together, which unity_config() does
+        if js[max(0, m.start() - 16):m.start()].rstrip().endswith('+'):
+            continue
+        # Object keys ({"zlib/inflate.js": function ...} in bundled loaders)
+        if js[m.end():m.end() + 16].lstrip().startswith(':'):
+            continue
+        # Bare "x.js" in minified code is usually a property, not a path, unless
+        # it has a directory or the source is a small inline loader script
+        if '/' not in ref and len(js) > 20000:
+            continue
+        relative_to = script_url if script_url and ref.startswith(('./', '../')) else base_url
+        assets.add(ref, None, source, relative_to)
+    return assets
+
+def _attrs_selectolax(node):
+    return node.tag, node.attributes, node
+
+def _attrs_soup(tag):
+    attrs = {k: ' '.join(v) if isinstance(v, list) else v for k, v in tag.attrs.items()}
+    return tag.name, attrs, tag
+
+def _elements(markup):
+    """(tag name, attrs, node) for every element that can reference a file"""
+    if not isinstance(markup, (str, bytes)):
+        return (_attrs_soup(tag) for tag in markup.select(ELEMENT_SELECTOR)), False
+    if htmlparse.SelectolaxParser is not None:
+        tree = htmlparse.SelectolaxParser(markup)
+        return (_attrs_selectolax(node) for node in tree.css(ELEMENT_SELECTOR)), True
+    soup = htmlparse.parse(markup)
+    return (_attrs_soup(tag) for tag in soup.select(ELEMENT_SELECTOR)), False
+
+def _text(node, selectolax):
+    if selectolax:
+        return node.text(deep=True) or ''
+    return node.string or node.get_text() or ''
+
+def extract(markup, base_url, assets=None):
+    """Every asset referenced by an HTML page (str, bytes or BeautifulSoup tree)
+
+    base_url is the page's own URL; a <base href> in the page is honoured.
+    Linked stylesheets are listed but not fetched (see extract_page).
+    """
+    assets = AssetSet() if assets is None else assets
+    elements, selectolax = _elements(markup)
+    elements = list(elements)
+    for name, attrs, _ in elements:
+        if name == 'base' and attrs.get('href'):
+            base_url = urljoin(base_url, attrs['href'])
+
+    for name, attrs, node in elements:
+        if attrs.get('style'):
+            extract_css(attrs['style'], base_url, assets, 'html')
+        if attrs.get('background'):
+            assets.add(attrs['background'], 'image', 'html', base_url)
+
+        if name == 'link':
+            rels = (attrs.get('rel') or '').lower().split()
+            kinds = [LINK_RELS[rel] for rel in rels if rel in LINK_RELS]
+            if not kinds:
+                continue
+            kind = next((k for k in kinds if k), None)
+            if kind is None or 'preload' in rels or 'prefetch' in rels:
+                kind = PRELOAD_AS.get((attrs.get('as') or '').lower(), kind)
+            assets.add(attrs.get('href'), kind, 'html', base_url)
+            if attrs.get('imagesrcset'):
+                for ref in parse_srcset(attrs['imagesrcset']):
+                    assets.add(ref, 'image', 'html', base_url)
+        elif name == 'param':
+            if (attrs.get('name') or '').lower() in PARAM_NAMES and attrs.get('value'):
+                assets.add(attrs['value'], None, 'html', base_url)
+        elif name == 'style':
+            extract_css(_text(node, selectolax), base_url, assets, 'html')
+        elif name in TAG_ATTRS:
+            for attr, kind in TAG_ATTRS[name]:
+                if attrs.get(attr):
+                    assets.add(attrs[attr], kind, 'html', base_url)
+            if name in SRCSET_TAGS:
+                for attr in ('srcset', 'data-srcset'):
+                    if attrs.get(attr):
+                        kind = 'image' if name == 'img' else None
+                        for ref in parse_srcset(attrs[attr]):
+                            assets.add(ref, kind, 'html', base_url)
+            if name == 'script' and not attrs.get('src'):
+                script_type = (attrs.get('type') or '').lower()
+                if script_type in ('', 'text/javascript', 'module', 'application/javascript'):
+                    extract_js(_text(node, selectolax), base_url, assets, 'html')
+    return assets
+
+def load_text(url, headers=None, timeout=15):
+    """Default loader for extract_page: the body of url, or None if it can't be fetched"""
+    try:
+        r = fetch.get(url, headers=headers, timeout=timeout)
+        if r.status_code != 200:
+            return None
+        return r.text
+    except Exception:
+        return None
+
+def extract_page(markup, base_url, headers=None, loader=None, max_depth=5):
+    """extract() plus the url()/@import references of every linked stylesheet, recursively
+
+    Stylesheets are fetched with loader(url) (default: load_text with headers),
+    each at most once, and at most max_depth @imports deep.
+    """
+    loader = loader or (lambda url: load_text(url, headers=headers))
+    assets = extract(markup, base_url)
+    seen = set()
+    frontier = deque((url, 0) for url in assets.urls('stylesheet'))
+    while frontier:
+        url, depth = frontier.popleft()
+        if url in seen or depth > max_depth:
+            continue
+        seen.add(url)
+        css = loader(url)
+        if css is None:
+            continue
+        before = set(assets.urls('stylesheet'))
+        extract_css(css, url, assets)
+        frontier.extend((u, depth + 1) for u in assets.urls('stylesheet') if u not in before)
+    return assets
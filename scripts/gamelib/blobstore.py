@@ -0,0 +1,109 @@
+"""
+Content-addressed blob store for downloaded game assets
+
+Files are keyed by SHA-256 under .blobstore/ab/<digest> and game directories
+hold hardlinks to them, so the many games shipping the same Ruffle build,
+Unity loader or jQuery copy share one file on disk.
+
+Hardlinked files share their contents: anything that rewrites a stored file
+must write a new file and rename it over the old one (as gamelib.fetch does)
+rather than opening it for writing in place. Files the scripts do edit in
+place (HTML pages, JSON configs) and tiny files are never stored.
+"""
+import hashlib
+import os
+import shutil
+
+from gamelib import REPO_ROOT
+
+STORE_DIR = REPO_ROOT / '.blobstore'
+
+# Edited in place by the fixer scripts, so they must stay independent copies
+EDITABLE_SUFFIXES = {'.html', '.htm', '.json'}
+MIN_SIZE = 4096
+
+enabled = True
+
+def file_digest(path):
+    """SHA-256 hex digest of a file"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def blob_path(digest):
+    return STORE_DIR / digest[:2] / digest
+
+def has_blob(digest):
+    return blob_path(digest).exists()
+
+def should_store(path):
+    """Whether path is a candidate for the store"""
+    if path.suffix.lower() in EDITABLE_SUFFIXES:
+        return False
+    try:
+        return path.stat().st_size >= MIN_SIZE
+    except OSError:
+        return False
+
+def _link_into_place(source, path):
+    """Atomically replace path with a hardlink to source (a copy if linking fails)"""
+    tmp = path.with_name(path.name + '.link')
+    try:
+        os.link(source, tmp)
+    except OSError:
+        # Different filesystem or no hardlink support
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, path)
+
+def store(path, digest=None):
+    """Move path's contents into the store and leave a hardlink behind
+
+    Returns the digest, or None if the file isn't stored. If an identical blob
+    already exists the file is replaced by a link to it. Pass digest when it
+    is already known to skip hashing the file again.
+    """
+    if not enabled or not should_store(path):
+        return None
+
+    digest = digest or file_digest(path)
+    blob = blob_path(digest)
+    if blob.exists():
+        if not os.path.samefile(blob, path):
+            _link_into_place(blob, path)
+        return digest
+
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(path, blob)
+    except FileExistsError:
+        # Stored concurrently by another worker
+        _link_into_place(blob, path)
+    except OSError:
+        # Store is on another filesystem; keep the file as it is
+        return None
+    return digest
+
+def materialize(digest, path):
+    """Create path from a stored blob; returns False if the blob is unknown"""
+    blob = blob_path(digest)
+    if not blob.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _link_into_place(blob, path)
+    return True
+
+def collect_garbage():
+    """Delete blobs no game directory links to any more; returns (count, bytes)"""
+    removed = 0
+    freed = 0
+    if not STORE_DIR.exists():
+        return removed, freed
+    for blob in STORE_DIR.glob('*/*'):
+        stat = blob.stat()
+        if stat.st_nlink == 1:
+            blob.unlink()
+            removed += 1
+            freed += stat.st_size
+    return removed, freed
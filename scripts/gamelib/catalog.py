@@ -0,0 +1,269 @@
+"""
+Indexed view of data/games.json
+
+Loads the catalog once and keeps name / directory / slug / zone id / imagePath
+indexes up to date as entries are inserted, updated or deleted, so every
+scraper checks for duplicates the same way and in constant time instead of
+rebuilding its own sets from the whole file.
+
+Writes take an advisory lock on games.json.lock, go to a temp file that is
+renamed over games.json, and are skipped when the serialized catalog hasn't
+changed. Scripts that may run alongside others should apply their changes
+inside Catalog.edit(), which reloads the file under the lock first so
+concurrent updates are merged instead of overwritten.
+"""
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from gamelib import REPO_ROOT
+
+GAMES_JSON = REPO_ROOT / 'data' / 'games.json'
+
+COVER_ZONE_RE = re.compile(r'/(\d+)\.png$')
+
+def normalize_name(name):
+    """Key used for name comparisons"""
+    return (name or '').lower().strip()
+
+def slugify(name):
+    """Directory-style slug for a game name ("Escape Road 2" -> "escape-road-2")"""
+    return re.sub(r'[^a-z0-9]+', '-', (name or '').lower()).strip('-')
+
+def url_slug(url):
+    """Last path segment of a game URL, lowercased"""
+    if not url:
+        return ''
+    return urlparse(url).path.strip('/').split('/')[-1].lower()
+
+def zone_id_from_image_path(image_path):
+    """gn-math zone id of a covers URL like .../covers@main/42.png, or None"""
+    match = COVER_ZONE_RE.search(image_path or '')
+    return int(match.group(1)) if match else None
+
+def cover_source(game):
+    """Upstream URL of an entry's cover: imageSource once the cover is mirrored locally, else imagePath"""
+    return game.get('imageSource') or game.get('imagePath')
+
+def set_cover_source(game, url):
+    """Point an entry's cover at url, dropping the local mirror and thumbnail of an older cover
+
+    Returns whether anything changed.
+    """
+    if cover_source(game) == url:
+        return False
+    game['imagePath'] = url
+    game.pop('imageSource', None)
+    game.pop('thumb', None)
+    return True
+
+def serialize(games):
+    """games.json text for a list of entries"""
+    return json.dumps(games, indent='\t', ensure_ascii=False)
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on <path>.lock"""
+    path = Path(path)
+    lock_path = path.with_name(path.name + '.lock')
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def write_atomic(path, text):
+    """Replace path with text via a temp file and rename
+
+    Returns False without touching the file if it already holds text.
+    """
+    path = Path(path)
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return True
+
+def _index_keys(game):
+    """(index, key) pairs a game entry is filed under"""
+    keys = []
+    name = normalize_name(game.get('name'))
+    if name:
+        keys.append(('name', name))
+    directory = (game.get('directory') or '').lower().strip()
+    if directory:
+        keys.append(('directory', directory))
+    slugs = {directory, slugify(game.get('name')), url_slug(game.get('gameUrl'))}
+    keys.extend(('slug', slug) for slug in slugs if slug)
+    zone_id = zone_id_from_image_path(cover_source(game))
+    if zone_id is not None:
+        keys.append(('zone_id', zone_id))
+    # Local path first, original URL last (catalogdb's image_path column keeps the last)
+    for image_path in dict.fromkeys((game.get('imagePath'), game.get('imageSource'))):
+        if image_path:
+            keys.append(('image_path', image_path))
+    return keys
+
+class Catalog:
+    """games.json entries plus lookup indexes"""
+
+    INDEXES = ('name', 'directory', 'slug', 'zone_id', 'image_path')
+
+    def __init__(self, games, path=GAMES_JSON):
+        self.path = Path(path)
+        self._locked = False
+        self.replace(games)
+
+    @classmethod
+    def load(cls, path=GAMES_JSON):
+        """Load games.json (an empty catalog if it doesn't exist yet)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                games = json.load(f)
+        except FileNotFoundError:
+            games = []
+        return cls(games, path)
+
+    @classmethod
+    @contextmanager
+    def edit(cls, path=GAMES_JSON):
+        """Load games.json under the write lock and save it when the block exits
+
+        The whole block is one batch: other writers wait for it, and the file
+        is only rewritten if the block changed something. Nothing is saved if
+        the block raises.
+        """
+        with file_lock(path):
+            catalog = cls.load(path)
+            catalog._locked = True
+            try:
+                yield catalog
+                catalog.save()
+            finally:
+                catalog._locked = False
+
+    def __len__(self):
+        return len(self.games)
+
+    def __iter__(self):
+        return iter(self.games)
+
+    def _add_to_indexes(self, game):
+        for index, key in _index_keys(game):
+            self._indexes[index].setdefault(key, []).append(game)
+
+    def _remove_from_indexes(self, game):
+        for index, key in _index_keys(game):
+            entries = self._indexes[index].get(key, [])
+            for i, entry in enumerate(entries):
+                if entry is game:
+                    del entries[i]
+                    break
+            if not entries:
+                self._indexes[index].pop(key, None)
+
+    def _normalize(self, index, key):
+        if index == 'name':
+            return normalize_name(key)
+        if index in ('directory', 'slug'):
+            return (key or '').lower().strip()
+        return key
+
+    def replace(self, games):
+        """Swap in a new list of entries and rebuild the indexes"""
+        self.games = list(games)
+        self._indexes = {index: {} for index in self.INDEXES}
+        for game in self.games:
+            self._add_to_indexes(game)
+
+    def find_all(self, **criteria):
+        """All entries matching any of name=, directory=, slug=, zone_id=, image_path="""
+        found = []
+        for index, key in criteria.items():
+            if key is None or key == '':
+                continue
+            for game in self._indexes[index].get(self._normalize(index, key), []):
+                if not any(game is other for other in found):
+                    found.append(game)
+        return found
+
+    def find(self, **criteria):
+        """First entry matching any of the given keys, or None"""
+        for index, key in criteria.items():
+            if key is None or key == '':
+                continue
+            entries = self._indexes[index].get(self._normalize(index, key))
+            if entries:
+                return entries[0]
+        return None
+
+    def exists(self, **criteria):
+        """Whether any entry matches any of the given keys"""
+        return self.find(**criteria) is not None
+
+    def insert(self, game):
+        """Append a new entry"""
+        self.games.append(game)
+        self._add_to_indexes(game)
+        return game
+
+    def update(self, game, **fields):
+        """Change fields of an entry (a value of None removes the field)"""
+        self._remove_from_indexes(game)
+        for key, value in fields.items():
+            if value is None:
+                game.pop(key, None)
+            else:
+                game[key] = value
+        self._add_to_indexes(game)
+        return game
+
+    def delete(self, game):
+        """Remove an entry"""
+        self._remove_from_indexes(game)
+        for i, entry in enumerate(self.games):
+            if entry is game:
+                del self.games[i]
+                break
+
+    def save(self, path=None):
+        """Write the catalog back in the repo's games.json format
+
+        Returns whether the file changed. This writes this catalog's entries
+        as they are; use Catalog.edit() to merge with concurrent writers.
+        """
+        path = Path(path or self.path)
+        text = serialize(self.games)
+        if self._locked and path == self.path:
+            return write_atomic(path, text)
+        with file_lock(path):
+            return write_atomic(path, text)
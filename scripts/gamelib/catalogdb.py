@@ -0,0 +1,397 @@
+"""
+Optional SQLite store for the game catalog
+
+data/games.json stays what the site reads, but maintenance jobs can import it
+into .catalog.db once and then run indexed queries and transactional updates
+against games, gn-math zones, per-game asset files, scrape sources and the
+download history. export_games() regenerates games.json from the database in
+the original entry order and format, so import followed by export is a no-op.
+
+The scrapers still write games.json directly, so the database records the
+SHA-256 of the games.json it last imported or exported, and export_games()
+refuses to overwrite a games.json that has changed since: import it again
+first.
+
+Each game row keeps its complete JSON entry alongside the indexed columns,
+which preserves key order and any fields the schema doesn't know about.
+
+Every download made through gamelib.fetch is logged with record_download();
+the log is buffered and appended to the downloads table at exit, if the
+database exists.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from gamelib import REPO_ROOT
+from gamelib.catalog import (GAMES_JSON, _index_keys, file_lock, normalize_name,
+                             serialize, write_atomic)
+
+DB_PATH = REPO_ROOT / '.catalog.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    name_key TEXT,
+    directory TEXT,
+    source TEXT,
+    zone_id INTEGER,
+    image_path TEXT,
+    game_url TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_position ON games(position);
+CREATE INDEX IF NOT EXISTS games_name_key ON games(name_key);
+CREATE INDEX IF NOT EXISTS games_directory ON games(directory);
+CREATE INDEX IF NOT EXISTS games_zone_id ON games(zone_id);
+CREATE INDEX IF NOT EXISTS games_image_path ON games(image_path);
+CREATE INDEX IF NOT EXISTS games_source ON games(source);
+
+CREATE TABLE IF NOT EXISTS game_slugs (
+    slug TEXT NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    PRIMARY KEY (slug, game_id)
+);
+
+CREATE TABLE IF NOT EXISTS zones (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    url TEXT,
+    entry TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS zones_name ON zones(name);
+
+CREATE TABLE IF NOT EXISTS assets (
+    directory TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT,
+    PRIMARY KEY (directory, path)
+);
+CREATE INDEX IF NOT EXISTS assets_sha256 ON assets(sha256);
+
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    url TEXT,
+    last_scraped REAL
+);
+
+CREATE TABLE IF NOT EXISTS downloads (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    path TEXT,
+    status TEXT NOT NULL,
+    size INTEGER,
+    sha256 TEXT,
+    error TEXT,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS downloads_url ON downloads(url);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Catalog index name -> games column (slugs live in their own table)
+COLUMNS = {
+    'name': 'name_key',
+    'directory': 'directory',
+    'zone_id': 'zone_id',
+    'image_path': 'image_path',
+}
+
+def _row_values(game):
+    keys = dict((index, key) for index, key in _index_keys(game) if index != 'slug')
+    return (
+        game.get('name'),
+        keys.get('name'),
+        keys.get('directory'),
+        game.get('source'),
+        keys.get('zone_id'),
+        keys.get('image_path'),
+        game.get('gameUrl'),
+        json.dumps(game, ensure_ascii=False),
+    )
+
+def _file_sha256(path):
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+class StaleCatalog(Exception):
+    """games.json changed after the database was last synced with it"""
+
+_downloads = []
+_downloads_lock = threading.Lock()
+
+def record_download(url, path=None, status='ok', size=None, sha256=None, error=None):
+    """Queue an entry for the download history (written by flush_downloads)"""
+    with _downloads_lock:
+        _downloads.append((url, str(path) if path else None, status, size, sha256, error, time.time()))
+
+def flush_downloads(path=DB_PATH):
+    """Append queued download history to the database, if there is one"""
+    with _downloads_lock:
+        rows = _downloads[:]
+        del _downloads[:]
+    if not rows or not Path(path).exists():
+        return 0
+    try:
+        with CatalogDB(path) as db, db.transaction():
+            db.conn.executemany(
+                'INSERT INTO downloads (url, path, status, size, sha256, error, finished_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not record {len(rows)} downloads in {Path(path).name}: {e}")
+        return 0
+    return len(rows)
+
+class CatalogDB:
+    """Connection to the SQLite catalog; use as a context manager"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self._depth = 0
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Group several changes into one commit (rolled back if the block raises)
+
+        Nested calls join the outermost transaction.
+        """
+        if self._depth:
+            yield self
+            return
+        self._depth += 1
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._depth -= 1
+
+    # Games
+
+    def _meta(self, key):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def import_games(self, path=GAMES_JSON):
+        """Replace the games table with the contents of games.json; returns the count"""
+        with file_lock(path):
+            data = Path(path).read_bytes()
+        games = json.loads(data.decode('utf-8'))
+        with self.transaction():
+            self.conn.execute('DELETE FROM game_slugs')
+            self.conn.execute('DELETE FROM games')
+            for position, game in enumerate(games):
+                self._insert(game, position)
+            self._set_meta('games_sha256', hashlib.sha256(data).hexdigest())
+        return len(games)
+
+    def export_games(self, path=GAMES_JSON):
+        """Regenerate games.json from the database; returns whether it changed
+
+        Raises StaleCatalog if games.json was changed by something else since
+        the last import or export, rather than dropping those changes.
+        """
+        text = serialize(self.games())
+        with file_lock(path):
+            synced = self._meta('games_sha256')
+            current = _file_sha256(path)
+            if current is not None and current != synced:
+                raise StaleCatalog(f"{Path(path).name} changed since it was last imported")
+            changed = write_atomic(path, text)
+            with self.transaction():
+                self._set_meta('games_sha256', _file_sha256(path))
+        return changed
+
+    def games(self, source=None):
+        """All entries in catalog order, optionally only those from one source"""
+        if source is None:
+            rows = self.conn.execute('SELECT entry FROM games ORDER BY position, id')
+        else:
+            rows = self.conn.execute(
+                'SELECT entry FROM games WHERE source = ? ORDER BY position, id', (source,))
+        return [json.loads(row['entry']) for row in rows]
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def _insert(self, game, position):
+        cur = self.conn.execute(
+            'INSERT INTO games (position, name, name_key, directory, source, zone_id,'
+            ' image_path, game_url, entry) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (position,) + _row_values(game))
+        game_id = cur.lastrowid
+        self._index_slugs(game_id, game)
+        return game_id
+
+    def _index_slugs(self, game_id, game):
+        self.conn.execute('DELETE FROM game_slugs WHERE game_id = ?', (game_id,))
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO game_slugs (slug, game_id) VALUES (?, ?)',
+            [(key, game_id) for index, key in _index_keys(game) if index == 'slug'])
+
+    def find_ids(self, **criteria):
+        """Ids of entries matching any of name=, directory=, slug=, zone_id=, image_path="""
+        ids = []
+        for index, key in criteria.items():
+            if key is None or key == '':
+                continue
+            if index == 'slug':
+                rows = self.conn.execute(
+                    'SELECT game_id FROM game_slugs WHERE slug = ?', (key.lower().strip(),))
+            else:
+                if index == 'name':
+                    key = normalize_name(key)
+                elif index == 'directory':
+                    key = key.lower().strip()
+                rows = self.conn.execute(
+                    f'SELECT id FROM games WHERE {COLUMNS[index]} = ? ORDER BY position, id',
+                    (key,))
+            for row in rows:
+                if row[0] not in ids:
+                    ids.append(row[0])
+        return ids
+
+    def get(self, game_id):
+        """The entry stored under game_id, or None"""
+        row = self.conn.execute('SELECT entry FROM games WHERE id = ?', (game_id,)).fetchone()
+        return json.loads(row['entry']) if row else None
+
+    def find(self, **criteria):
+        """First entry matching any of the given keys, or None"""
+        ids = self.find_ids(**criteria)
+        return self.get(ids[0]) if ids else None
+
+    def exists(self, **criteria):
+        return bool(self.find_ids(**criteria))
+
+    def insert(self, game):
+        """Append an entry at the end of the catalog; returns its id"""
+        with self.transaction():
+            position = self.conn.execute(
+                'SELECT COALESCE(MAX(position) + 1, 0) FROM games').fetchone()[0]
+            return self._insert(game, position)
+
+    def update(self, game_id, **fields):
+        """Change fields of an entry (a value of None removes the field)"""
+        game = self.get(game_id)
+        if game is None:
+            raise KeyError(game_id)
+        for key, value in fields.items():
+            if value is None:
+                game.pop(key, None)
+            else:
+                game[key] = value
+        with self.transaction():
+            self.conn.execute(
+                'UPDATE games SET name = ?, name_key = ?, directory = ?, source = ?,'
+                ' zone_id = ?, image_path = ?, game_url = ?, entry = ? WHERE id = ?',
+                _row_values(game) + (game_id,))
+            self._index_slugs(game_id, game)
+        return game
+
+    def delete(self, game_id):
+        with self.transaction():
+            self.conn.execute('DELETE FROM games WHERE id = ?', (game_id,))
+
+    # Zones, assets, sources and downloads
+
+    def upsert_zones(self, zones):
+        """Store a zones.json listing (entries without an id are skipped)"""
+        now = time.time()
+        with self.transaction():
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO zones (id, name, url, entry, updated_at)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                [(zone['id'], zone.get('name'), zone.get('url'),
+                  json.dumps(zone, ensure_ascii=False), now)
+                 for zone in zones if isinstance(zone, dict) and 'id' in zone])
+
+    def zone(self, zone_id):
+        row = self.conn.execute('SELECT entry FROM zones WHERE id = ?', (zone_id,)).fetchone()
+        return json.loads(row['entry']) if row else None
+
+    def sync_assets(self, directory, game_dir, digest=None):
+        """Record the files under game_dir for a game; returns the number of files
+
+        Files whose size and mtime are unchanged keep their stored digest, so
+        digest (a path -> sha256 function) only runs on new or modified files.
+        """
+        known = {row['path']: row for row in self.conn.execute(
+            'SELECT path, size, mtime, sha256 FROM assets WHERE directory = ?', (directory,))}
+        rows = []
+        for dirpath, dirnames, filenames in os.walk(game_dir):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                stat = path.stat()
+                rel = path.relative_to(game_dir).as_posix()
+                old = known.get(rel)
+                if old and old['size'] == stat.st_size and old['mtime'] == stat.st_mtime:
+                    sha256 = old['sha256']
+                else:
+                    sha256 = digest(path) if digest else None
+                rows.append((directory, rel, stat.st_size, stat.st_mtime, sha256))
+        with self.transaction():
+            self.conn.execute('DELETE FROM assets WHERE directory = ?', (directory,))
+            self.conn.executemany(
+                'INSERT INTO assets (directory, path, size, mtime, sha256) VALUES (?, ?, ?, ?, ?)',
+                rows)
+        return len(rows)
+
+    def record_source(self, name, url=None):
+        """Note that a scrape source was just crawled"""
+        with self.transaction():
+            self.conn.execute(
+                'INSERT INTO sources (name, url, last_scraped) VALUES (?, ?, ?)'
+                ' ON CONFLICT(name) DO UPDATE SET url = COALESCE(excluded.url, url),'
+                ' last_scraped = excluded.last_scraped',
+                (name, url, time.time()))
+
+    def downloads(self, status=None, limit=20):
+        """Most recent history rows, optionally only those with one status"""
+        if status is None:
+            return self.conn.execute(
+                'SELECT * FROM downloads ORDER BY finished_at DESC, id DESC LIMIT ?', (limit,)).fetchall()
+        return self.conn.execute(
+            'SELECT * FROM downloads WHERE status = ? ORDER BY finished_at DESC, id DESC LIMIT ?',
+            (status, limit)).fetchall()
+
+    def last_download(self, url):
+        """The most recent history row for url, or None"""
+        return self.conn.execute(
+            'SELECT * FROM downloads WHERE url = ? ORDER BY finished_at DESC, id DESC LIMIT 1',
+            (url,)).fetchone()
+
+atexit.register(flush_downloads)
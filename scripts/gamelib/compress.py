@@ -0,0 +1,143 @@
+"""
+Streaming brotli/gzip decompression for game builds
+
+Unity WebGL builds ship as .br, .gz or .unityweb files (the latter may be
+brotli, gzip or not compressed at all). Everything here works on fixed-size
+chunks, so a 200 MB .data file never has to fit in memory, and writes through
+a temporary file that is renamed into place when complete.
+
+brotli is optional: without it gzip still works and brotli files raise
+CompressionError.
+"""
+import gzip
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CHUNK_SIZE = 1024 * 1024
+
+GZIP_MAGIC = b'\x1f\x8b'
+# Unity writes this into the metadata of every brotli build file
+UNITY_BROTLI_MARKER = b'UnityWeb Compressed Content (brotli)'
+
+SUFFIX_ENCODINGS = {'.br': 'br', '.gz': 'gzip'}
+
+class CompressionError(Exception):
+    pass
+
+def _require_brotli():
+    if brotli is None:
+        raise CompressionError("brotli is not installed (pip install brotli)")
+
+def detect(path):
+    """'br', 'gzip' or None (not compressed) for a build file"""
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(256)
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if UNITY_BROTLI_MARKER in head:
+        return 'br'
+    suffix = path.suffix.lower()
+    if suffix == '.br':
+        return 'br'
+    if suffix == '.unityweb' and brotli is not None and _is_brotli_stream(path):
+        return 'br'
+    return None
+
+def _is_brotli_stream(path):
+    """True if the whole file decodes as exactly one brotli stream
+
+    Brotli has no magic number and the first few hundred bytes of a raw
+    build often decode without error, so only a complete decode counts.
+    """
+    decompressor = brotli.Decompressor()
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if decompressor.is_finished():
+                    return False  # data after the end of the stream
+                decompressor.process(chunk)
+    except brotli.error:
+        return False
+    return decompressor.is_finished()
+
+def decompressed_name(path):
+    """Where decompress_file writes by default: x.wasm.br -> x.wasm (.unityweb stays put)"""
+    path = Path(path)
+    if path.suffix.lower() in SUFFIX_ENCODINGS:
+        return path.with_suffix('')
+    return path
+
+def _tmp_path(path):
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+def _write_atomic(output, write, source):
+    """Write output through a temp file; it gets source's mtime, so is_stale can compare them"""
+    tmp = _tmp_path(output)
+    stat = os.stat(source)
+    try:
+        with open(tmp, 'wb') as out:
+            written = write(out)
+        os.utime(tmp, (stat.st_atime, stat.st_mtime))
+        os.replace(tmp, output)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return written
+
+def decompress_stream(src, out, encoding):
+    """Copy the decompressed content of file object src into out; returns bytes written"""
+    written = 0
+    if encoding == 'gzip':
+        with gzip.GzipFile(fileobj=src, mode='rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                written += len(chunk)
+        return written
+    if encoding == 'br':
+        _require_brotli()
+        decompressor = brotli.Decompressor()
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if decompressor.is_finished():
+                raise CompressionError("data after the end of the brotli stream")
+            data = decompressor.process(chunk)
+            out.write(data)
+            written += len(data)
+        if not decompressor.is_finished():
+            raise CompressionError("truncated brotli stream")
+        return written
+    raise CompressionError(f"unknown encoding: {encoding}")
+
+
+def decompress_file(path, output=None, encoding=None):
+    """Decompress path into output (default: decompressed_name); returns bytes written
+
+    output may be path itself to decompress in place.
+    """
+    path = Path(path)
+    output = Path(output) if output else decompressed_name(path)
+    encoding = encoding or detect(path)
+    if encoding is None:
+        raise CompressionError(f"{path.name} is not compressed")
+    with open(path, 'rb') as src:
+        return _write_atomic(output, lambda out: decompress_stream(src, out, encoding), path)
+
+
+def is_stale(source, target):
+    """True if target is missing or older than source"""
+    target = Path(target)
+    return not target.exists() or target.stat().st_mtime < Path(source).stat().st_mtime
@@ -0,0 +1,93 @@
+"""
+Which gn-math zones have a cover image
+
+Covers live in the gn-math/covers repository as <zone id>.png and are served
+by jsDelivr. Instead of a HEAD request per zone, available() asks jsDelivr's
+data API for the repository's file listing once (one request for every
+zone) and keeps it in .scraper-cache/ for MAX_AGE. If the listing can't be
+fetched, the covers are probed with concurrent HEAD requests, and each
+answer is cached per zone id: a cover that exists is remembered for good,
+a missing one is asked about again after MAX_AGE.
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gamelib import CACHE_DIR, fetch, zonecache
+from gamelib.catalog import write_atomic
+
+COVERS_REPO = 'gn-math/covers'
+COVERS_BASE = f'https://cdn.jsdelivr.net/gh/{COVERS_REPO}@main/'
+LISTING_URL = f'https://data.jsdelivr.com/v1/packages/gh/{COVERS_REPO}@main?structure=flat'
+
+CACHE_FILE = CACHE_DIR / 'covers.json'
+# Trust the cached listing and negative probes for this long (seconds)
+MAX_AGE = 6 * 60 * 60
+DEFAULT_WORKERS = 16
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': '*/*',
+}
+
+def cover_url(zone_id):
+    return f"{COVERS_BASE}{zone_id}.png"
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(CACHE_FILE, json.dumps(cache, ensure_ascii=False))
+
+def fetch_listing(timeout=15):
+    """Names of every file in the covers repository, or None if jsDelivr can't list it"""
+    try:
+        r = fetch.get(LISTING_URL, headers=HEADERS, timeout=timeout)
+        if r.status_code != 200:
+            return None
+        return sorted(f['name'].lstrip('/') for f in r.json().get('files', []))
+    except Exception:
+        return None
+
+def _probe(zone_id, timeout):
+    try:
+        r = fetch.head(cover_url(zone_id), headers=HEADERS, timeout=timeout)
+        return r.status_code == 200
+    except Exception:
+        return None
+
+def available(zone_ids, workers=DEFAULT_WORKERS, timeout=5, offline=None):
+    """Set of the zone ids (as strings) that have a cover"""
+    zone_ids = [str(z) for z in zone_ids]
+    if offline is None:
+        offline = zonecache.is_offline()
+    cache = _load_cache()
+    now = time.time()
+
+    files = cache.get('files')
+    if not offline and (files is None or now - cache.get('listed_at', 0) >= MAX_AGE):
+        listed = fetch_listing()
+        if listed is not None:
+            files = cache['files'] = listed
+            cache['listed_at'] = now
+            _save_cache(cache)
+    if files is not None:
+        names = set(files)
+        return {z for z in zone_ids if f"{z}.png" in names}
+
+    probes = cache.setdefault('probes', {})
+    stale = [z for z in zone_ids
+             if z not in probes or (not probes[z][0] and now - probes[z][1] >= MAX_AGE)]
+    if stale and not offline:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for zone_id, found in zip(stale, pool.map(lambda z: _probe(z, timeout), stale)):
+                # Leave network errors uncached so the next run asks again
+                if found is not None:
+                    probes[zone_id] = [found, now]
+        _save_cache(cache)
+    return {z for z in zone_ids if probes.get(z, [False])[0]}
@@ -0,0 +1,91 @@
+"""
+Local store for game covers that are hosted on other sites
+
+Most catalog entries point imagePath at cdn.jsdelivr.net, so every visit to
+the games grid makes hundreds of third-party requests. mirror() downloads
+those covers concurrently (through a DownloadEngine, with conditional GETs
+for files fetched before) and files each one under img/covers/ by the hash
+of its content, so covers that are byte-for-byte identical are stored once
+whatever URL they came from.
+
+The entry keeps the upstream URL in imageSource (see catalog.cover_source),
+so zone ids and cover fixes keep working after imagePath becomes local.
+"""
+import asyncio
+import hashlib
+import os
+import posixpath
+import shutil
+from collections import namedtuple
+from urllib.parse import unquote, urlparse
+
+from gamelib import CACHE_DIR, REPO_ROOT, blobstore, fetch
+from gamelib.engine import DownloadEngine
+
+STORE_DIR = REPO_ROOT / 'img' / 'covers'
+# Downloads land here first (and keep their HTTP validators for the next run)
+STAGING_DIR = CACHE_DIR / 'cover-downloads'
+DEFAULT_PER_HOST = 16
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'image/avif,image/webp,image/*,*/*;q=0.8',
+}
+
+Stored = namedtuple('Stored', 'url path size new')
+
+def is_remote(image_path):
+    return bool(image_path) and image_path.startswith(('http://', 'https://', '//'))
+
+def _extension(url):
+    ext = posixpath.splitext(unquote(urlparse(url).path))[1].lower()
+    return ext if ext and len(ext) <= 5 else '.img'
+
+def staging_path(url):
+    return STAGING_DIR / (hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + _extension(url))
+
+def site_path(path):
+    return '/' + path.resolve().relative_to(REPO_ROOT).as_posix()
+
+def store(url, path):
+    """Copy a downloaded cover into STORE_DIR under its content hash; returns Stored"""
+    digest = blobstore.file_digest(path)
+    target = STORE_DIR / (digest[:16] + _extension(url))
+    new = not target.exists()
+    if new:
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+    return Stored(url, site_path(target), target.stat().st_size, new)
+
+async def _mirror(urls, per_host):
+    with DownloadEngine(per_host=per_host, headers=HEADERS) as engine:
+        jobs = [(url, staging_path(url)) for url in urls]
+        results = await engine.download_all(jobs)
+    stored, failed = [], []
+    for (url, path), (ok, detail) in zip(jobs, results):
+        if ok and path.is_file():
+            stored.append(store(url, path))
+        else:
+            failed.append((url, detail))
+    return stored, failed
+
+def mirror(urls, per_host=DEFAULT_PER_HOST):
+    """Download and store every url; returns ([Stored], [(url, error)])"""
+    return asyncio.run(_mirror(list(dict.fromkeys(urls)), per_host))
+
+async def _sizes(urls, per_host):
+    def size_of(url):
+        try:
+            r = fetch.head(url, headers=HEADERS, timeout=10, allow_redirects=True)
+            return int(r.headers.get('Content-Length', 0)) if r.status_code == 200 else None
+        except Exception:
+            return None
+    with DownloadEngine(per_host=per_host) as engine:
+        return await asyncio.gather(*(engine.run(url, size_of, url) for url in urls))
+
+def remote_sizes(urls, per_host=DEFAULT_PER_HOST):
+    """{url: Content-Length or None} from concurrent HEAD requests"""
+    urls = list(dict.fromkeys(urls))
+    return dict(zip(urls, asyncio.run(_sizes(urls, per_host))))
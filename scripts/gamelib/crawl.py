@@ -0,0 +1,124 @@
+"""
+Breadth-first dependency crawler for mirroring a game
+
+A game page only names its first layer of files; the rest are referenced from
+inside them (a framework.js that loads the .data file, a stylesheet that pulls
+in fonts, a PlayCanvas config.json or assetData.json that lists every texture).
+crawl() downloads a set of seed assets, scans every downloaded stylesheet,
+script, JSON and HTML file with gamelib.assets for further references, and
+keeps going until no new in-scope file turns up.
+
+Downloads run on a DownloadEngine, so the per-host limits apply across the
+whole crawl; parsing runs in worker threads so it never stalls the downloads.
+"""
+import asyncio
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from gamelib import assets
+
+DEFAULT_WORKERS = 16
+# Safety net against crawler traps (generated URLs, query-string loops)
+MAX_FILES = 5000
+# Larger files are downloaded but not scanned for references
+MAX_PARSE_BYTES = 32 * 1024 * 1024
+
+Fetched = namedtuple('Fetched', 'url path ok detail')
+
+PARSE_SUFFIXES = {
+    '.css': 'stylesheet',
+    '.js': 'script', '.mjs': 'script',
+    '.json': 'json',
+    '.html': 'document', '.htm': 'document',
+}
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+def _parser_for(asset, path):
+    if path.suffix.lower() in PARSE_SUFFIXES:
+        return PARSE_SUFFIXES[path.suffix.lower()]
+    if asset.kind in ('stylesheet', 'script', 'document'):
+        # Skip compressed builds (.js.br, .framework.js.unityweb): not text
+        if not path.name.lower().endswith(assets.COMPRESSED_SUFFIXES):
+            return asset.kind
+    return None
+
+def references(asset, path, page_url):
+    """AssetSet of the files referenced by a downloaded asset (empty if it isn't text)"""
+    found = assets.AssetSet()
+    parser = _parser_for(asset, path)
+    if parser is None or path.stat().st_size > MAX_PARSE_BYTES:
+        return found
+    text = path.read_text(encoding='utf-8', errors='replace')
+    if parser == 'stylesheet':
+        assets.extract_css(text, asset.url, found)
+    elif parser == 'script':
+        assets.extract_js(text, page_url, found, script_url=asset.url)
+    elif parser == 'json':
+        assets.extract_json(text, page_url, found)
+    elif parser == 'document':
+        assets.extract(text, asset.url, found)
+    return found
+
+async def crawl(downloader, page_url, seeds, local_path, scope=None, headers=None,
+                workers=DEFAULT_WORKERS, max_files=MAX_FILES, log=None):
+    """Download seeds and everything they reference, until closure
+
+    downloader  a gamelib.engine.DownloadEngine
+    page_url    URL of the game page (scripts and JSON resolve paths against it)
+    seeds       Assets (or an AssetSet) to start from; always downloaded
+    local_path  local_path(asset) -> Path to save to, or None to skip the asset
+    scope       hosts whose files are followed (default: page_url's host)
+
+    Returns a list of Fetched(url, path, ok, detail) in download order, where
+    detail is the byte count or the error.
+    """
+    scope = {h.lower() for h in scope} if scope else {host_of(page_url)}
+    queue = asyncio.Queue()
+    seen = set()
+    claimed = set()
+    results = []
+
+    def enqueue(asset, seed=False):
+        if asset.url in seen or len(seen) >= max_files:
+            return
+        if not seed and host_of(asset.url) not in scope:
+            return
+        path = local_path(asset)
+        seen.add(asset.url)
+        # Two URLs mapped to one file: the first one wins
+        if path is None or path in claimed:
+            return
+        claimed.add(path)
+        queue.put_nowait((asset, path))
+
+    for asset in seeds:
+        enqueue(asset, seed=True)
+
+    async def worker():
+        while True:
+            asset, path = await queue.get()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                ok, detail = await downloader.download(asset.url, path, headers=headers)
+                results.append(Fetched(asset.url, path, ok, detail))
+                if log:
+                    log(results[-1])
+                if ok:
+                    found = await asyncio.to_thread(references, asset, path, page_url)
+                    for child in found:
+                        enqueue(child)
+            except Exception as e:
+                results.append(Fetched(asset.url, path, False, str(e)))
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return results
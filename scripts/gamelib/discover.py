@@ -0,0 +1,258 @@
+"""
+Concurrent discovery of game pages across paginated category listings
+
+A category page only shows its first screenful of games. Discovery walks
+every page of every category it is given: each fetched page is scanned for
+game links and for links to further pages of the same category (rel="next",
+?page=N, /page/N or /N after the category path), which are fetched in turn.
+Pages are fetched concurrently through a DownloadEngine, so the per-host
+limit keeps the crawl polite.
+
+Results are streamed: iterating a Discovery yields each new game as soon as
+its page has been parsed, so downloading can start while later pages are
+still being fetched. Links are deduplicated across pages and categories,
+and against the catalog, as they are found; within a page they keep
+document order, and Discovery.found lists everything in category / page /
+position order once the walk is done.
+"""
+import asyncio
+import queue
+import re
+import threading
+from collections import namedtuple
+from urllib.parse import parse_qs, urldefrag, urljoin, urlparse
+
+from gamelib import htmlparse
+from gamelib.catalog import url_slug
+from gamelib.engine import DownloadEngine
+
+DEFAULT_PER_HOST = 4
+DEFAULT_WORKERS = 8
+# Safety net for listings whose pagination never ends
+MAX_PAGES = 100
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+PAGE_QUERY_KEYS = ('page', 'p', 'pg')
+PAGE_PATH_RE = re.compile(r'^/(?:page/)?(\d+)/?$')
+
+Discovered = namedtuple('Discovered', 'url slug category page position')
+
+def lagged_game(url):
+    """Lagged game pages live under /en/g/"""
+    return '/en/g/' in urlparse(url).path
+
+def any_game(url):
+    """Game pages on most portals: /g/, /games/ or /en/g/, but not category listings"""
+    path = urlparse(url).path
+    return ('/g/' in path or '/games/' in path) and 'category' not in path.lower()
+
+def game_links(markup, page_url, is_game=lagged_game):
+    """Game page URLs linked from a listing, unique, in document order"""
+    links = {}
+    for href in htmlparse.select_attrs(markup, 'a[href]', 'href'):
+        url = urldefrag(urljoin(page_url, href.strip()))[0]
+        if url.startswith(('http://', 'https://')) and is_game(url):
+            links.setdefault(url, None)
+    return list(links)
+
+def page_number(url, category_url):
+    """Which page of category_url a URL is (1 for the category itself), or None if it isn't one"""
+    parsed = urlparse(url)
+    category = urlparse(category_url)
+    if parsed.netloc.lower() != category.netloc.lower():
+        return None
+    base = category.path.rstrip('/')
+    path = parsed.path.rstrip('/')
+    query = parse_qs(parsed.query)
+    for key in PAGE_QUERY_KEYS:
+        if key in query and query[key][0].isdigit() and path == base:
+            return int(query[key][0])
+    if path == base:
+        return 1
+    if path.startswith(base + '/'):
+        m = PAGE_PATH_RE.match(path[len(base):])
+        if m:
+            return int(m.group(1))
+    return None
+
+def page_links(markup, page_url, category_url):
+    """{page number: URL} of the other pages of a category linked from one of its pages"""
+    pages = {}
+    hrefs = htmlparse.select_attrs(markup, 'a[rel~=next], link[rel~=next]', 'href')
+    hrefs += htmlparse.select_attrs(markup, 'a[href]', 'href')
+    for href in hrefs:
+        url = urldefrag(urljoin(page_url, href.strip()))[0]
+        number = page_number(url, category_url)
+        if number is not None:
+            pages.setdefault(number, url)
+    return pages
+
+class Discovery:
+    """Walk the pages of one or more categories and yield the new games on them
+
+    catalog     a gamelib.catalog.Catalog; games whose slug it knows are skipped
+    is_game     predicate for game page URLs (default: Lagged's /en/g/ pages)
+    max_games   stop once this many new games have been found
+    max_pages   pages fetched per category at most
+    engine      a running DownloadEngine to fetch through, so its per-host
+                limit also covers whatever else the caller downloads with it
+                (default: a private engine with per_host slots per host)
+    """
+
+    def __init__(self, category_urls, catalog=None, is_game=lagged_game, max_games=None,
+                 max_pages=MAX_PAGES, per_host=DEFAULT_PER_HOST, workers=DEFAULT_WORKERS,
+                 headers=HEADERS, log=print, engine=None):
+        self.category_urls = list(dict.fromkeys(category_urls))
+        self.catalog = catalog
+        self.is_game = is_game
+        self.max_games = max_games
+        self.max_pages = max_pages
+        self.per_host = per_host
+        self.workers = workers
+        self.headers = headers
+        self.engine = engine
+        self.log = log or (lambda *a, **k: None)
+        self.found = []
+        self.pages = 0
+        self.skipped = 0
+        self.errors = []
+
+    def _claim(self, url):
+        slug = url_slug(url)
+        if url in self._seen or slug in self._seen:
+            return None
+        self._seen.update((url, slug))
+        if self.catalog is not None and self.catalog.exists(slug=slug):
+            self.skipped += 1
+            return None
+        return slug
+
+    def _parse(self, markup, page_url, category_url):
+        return game_links(markup, page_url, self.is_game), page_links(markup, page_url, category_url)
+
+    async def run(self):
+        """Async generator of Discovered games, in the order their pages come in"""
+        self._seen = set()
+        self.found = []
+        out = asyncio.Queue()
+        work = asyncio.Queue()
+        visited = {}
+        done = asyncio.Event()
+
+        def enqueue(category, url, number):
+            pages = visited.setdefault(category, set())
+            if number in pages or len(pages) >= self.max_pages:
+                return
+            pages.add(number)
+            work.put_nowait((category, url, number))
+
+        for index in range(len(self.category_urls)):
+            enqueue(index, self.category_urls[index], 1)
+
+        async def worker(engine):
+            while True:
+                category, url, number = await work.get()
+                try:
+                    if done.is_set():
+                        continue
+                    r = await engine.get(url, headers=self.headers, timeout=30)
+                    if r.status_code != 200:
+                        self.errors.append((url, f"HTTP {r.status_code}"))
+                        continue
+                    self.pages += 1
+                    games, pages = await asyncio.to_thread(
+                        self._parse, r.text, url, self.category_urls[category])
+                    for position, game_url in enumerate(games):
+                        slug = self._claim(game_url)
+                        if slug is None:
+                            continue
+                        found = Discovered(game_url, slug, self.category_urls[category], number, position)
+                        self.found.append(found)
+                        out.put_nowait(found)
+                        if self.max_games and len(self.found) >= self.max_games:
+                            done.set()
+                            break
+                    for page, page_url in sorted(pages.items()):
+                        enqueue(category, page_url, page)
+                except Exception as e:
+                    self.errors.append((url, str(e)))
+                finally:
+                    work.task_done()
+
+        async def crawl(engine):
+            tasks = [asyncio.create_task(worker(engine)) for _ in range(self.workers)]
+            try:
+                await work.join()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        async def walk():
+            try:
+                if self.engine is not None:
+                    await crawl(self.engine)
+                else:
+                    with DownloadEngine(per_host=self.per_host, headers=self.headers) as engine:
+                        await crawl(engine)
+            finally:
+                out.put_nowait(None)
+
+        walker = asyncio.create_task(walk())
+        try:
+            while True:
+                found = await out.get()
+                if found is None:
+                    break
+                yield found
+        finally:
+            done.set()
+            await walker
+            self.found.sort(key=lambda d: (self.category_urls.index(d.category), d.page, d.position))
+            self.log(f"✓ {len(self.found)} new games on {self.pages} page(s) of "
+                     f"{len(self.category_urls)} categor{'y' if len(self.category_urls) == 1 else 'ies'}"
+                     + (f", {self.skipped} already in the catalog" if self.skipped else ""))
+
+    def __iter__(self):
+        """Blocking iteration over run(), for scripts that hand games to a thread pool"""
+        results = queue.Queue(maxsize=64)
+        stop = threading.Event()
+
+        async def pump():
+            games = self.run()
+            try:
+                async for found in games:
+                    if stop.is_set():
+                        break
+                    await asyncio.to_thread(results.put, found)
+            finally:
+                await games.aclose()
+
+        def target():
+            try:
+                asyncio.run(pump())
+            except Exception as e:
+                self.errors.append((None, str(e)))
+            finally:
+                results.put(None)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        try:
+            while True:
+                found = results.get()
+                if found is None:
+                    break
+                yield found
+        finally:
+            stop.set()
+            while thread.is_alive():
+                try:
+                    results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
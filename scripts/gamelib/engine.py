@@ -0,0 +1,69 @@
+"""
+asyncio download engine with per-host concurrency limits
+
+Requests are still made by the pooled client in gamelib.fetch (so every script
+shares one connection pool and one set of politeness rules); the engine runs
+them on a thread pool and bounds how many are in flight per host with an
+asyncio.Semaphore. This lets a caller schedule every asset of every game at
+once and let the per-host limits decide the pace.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from gamelib import fetch
+
+DEFAULT_PER_HOST = 6
+DEFAULT_MAX_WORKERS = fetch.POOL_MAXSIZE
+
+class DownloadEngine:
+    """Schedules blocking fetches on a thread pool, at most per_host at a time per host"""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, max_workers=DEFAULT_MAX_WORKERS, headers=None):
+        self.per_host = per_host
+        self.headers = headers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._host_limits = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    def _limit_for(self, url):
+        host = urlparse(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_host)
+            self._host_limits[host] = limit
+        return limit
+
+    async def run(self, url, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in the pool while holding url's host slot"""
+        loop = asyncio.get_running_loop()
+        async with self._limit_for(url):
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get(self, url, **kwargs):
+        """Fetch a page and return the response with its body already read"""
+        kwargs.setdefault('headers', self.headers)
+        return await self.run(url, fetch.get, url, **kwargs)
+
+    async def download(self, url, filepath, headers=None, timeout=fetch.DEFAULT_TIMEOUT):
+        """Download url to filepath, returning (True, bytes written) or (False, error)"""
+        try:
+            size = await self.run(url, fetch.fetch_to_file, url, filepath,
+                                  headers=headers or self.headers, timeout=timeout)
+            return True, size
+        except Exception as e:
+            return False, str(e)
+
+    async def download_all(self, jobs, headers=None):
+        """Download every (url, filepath) pair concurrently; results are in job order"""
+        return await asyncio.gather(*(self.download(url, filepath, headers=headers) for url, filepath in jobs))
@@ -0,0 +1,331 @@
+"""
+Pooled HTTP client shared by every scraper
+
+All requests go through one requests.Session with keep-alive connection pools
+per host, so downloading hundreds of assets from the same CDN reuses a handful
+of TCP/TLS connections instead of opening a new one per file. Each request
+first waits for its host's token bucket (see gamelib.ratelimit), so scripts
+no longer need fixed sleeps to stay polite.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from gamelib import blobstore, catalogdb, httpcache, ratelimit
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+}
+
+DEFAULT_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+
+# Resumable downloads: how often to retry after a dropped connection, and the
+# size from which fetch_resumable() may split a file into parallel ranges
+RESUME_RETRIES = 5
+RETRY_BACKOFF = 2
+PARALLEL_PARTS = 4
+
+# Errors worth resuming after; anything else (404, 403, ...) is raised at once
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    # raised directly when reading r.raw
+    ProtocolError,
+    ReadTimeoutError,
+)
+
+# Number of hosts to keep pools for, and open connections kept per host.
+# POOL_MAXSIZE should be at least the largest worker count used by a script.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 32
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+def close_session():
+    """Close all pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def request(method, url, **kwargs):
+    """Send a request through the shared session (same arguments as requests.request)"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    ratelimit.acquire(url)
+    return get_session().request(method, url, **kwargs)
+
+def get(url, **kwargs):
+    """Drop-in replacement for requests.get using the pooled session"""
+    return request('GET', url, **kwargs)
+
+def head(url, **kwargs):
+    """Drop-in replacement for requests.head using the pooled session"""
+    kwargs.setdefault('allow_redirects', False)
+    return request('HEAD', url, **kwargs)
+
+def fetch_to_file(url, filepath, headers=None, timeout=DEFAULT_TIMEOUT, conditional=True):
+    """Stream URL into filepath and return the number of bytes written (raises on failure)
+
+    With conditional=True a file downloaded before is revalidated with its
+    cached ETag / Last-Modified; on 304 Not Modified it is kept as is (or
+    restored from the blob store if it was deleted) and 0 is returned. A file
+    edited since the download no longer matches the cache and is fetched
+    again in full, never overwritten with the stored blob.
+    Every call ends up in the catalog database's download history.
+    """
+    try:
+        status, written, digest = _fetch_to_file(url, filepath, headers, timeout, conditional)
+    except Exception as e:
+        catalogdb.record_download(url, filepath, 'error', error=str(e))
+        raise
+    catalogdb.record_download(url, filepath, status, written, digest)
+    return written
+
+def _fetch_to_file(url, filepath, headers, timeout, conditional):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    validators = {}
+    known_digest = None
+    if conditional:
+        validators = httpcache.conditional_headers(url, filepath)
+        if not validators and not filepath.exists():
+            # Only a missing file may be restored from the blob store
+            validators, known_digest = httpcache.stored_digest(url)
+            if known_digest and not blobstore.has_blob(known_digest):
+                validators, known_digest = {}, None
+    if validators:
+        headers = dict(headers or {}, **validators)
+
+    written = 0
+    with get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if validators and r.status_code == 304:
+            if known_digest:
+                blobstore.materialize(known_digest, filepath)
+            return 'not modified', 0, None
+        r.raise_for_status()
+        httpcache.forget(url)
+        # Write next to the target and rename, so a hardlinked blob is never
+        # modified in place
+        part = _part_path(filepath)
+        with open(part, 'wb') as f:
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(part, filepath)
+        digest = blobstore.store(filepath)
+        httpcache.remember(url, filepath, r.headers, written, digest)
+    return 'ok', written, digest
+
+def download_file(url, filepath, headers=None, timeout=DEFAULT_TIMEOUT, silent=False):
+    """Download a file from URL, returning True on success"""
+    try:
+        fetch_to_file(url, filepath, headers=headers, timeout=timeout)
+        return True
+    except Exception as e:
+        if not silent:
+            print(f"    Error downloading {url}: {e}", flush=True)
+        return False
+
+def _part_path(filepath):
+    return filepath.with_name(filepath.name + '.part')
+
+def _validator_path(filepath):
+    # ETag / Last-Modified of the response a .part file holds the start of
+    return filepath.with_name(filepath.name + '.part.validator')
+
+def _resume_validator(response_headers):
+    """Strong ETag or Last-Modified to send as If-Range, or None (weak ETags can't be used)"""
+    etag = response_headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response_headers.get('Last-Modified')
+
+def _save_validator(filepath, validator):
+    path = _validator_path(filepath)
+    if validator:
+        path.write_text(validator, encoding='utf-8')
+    elif path.exists():
+        path.unlink()
+
+def _load_validator(filepath):
+    try:
+        return _validator_path(filepath).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+def _identity_headers(headers):
+    # Byte offsets must refer to the stored body, so never ask for on-the-fly
+    # compression (precompressed .br/.gz builds are still stored as served)
+    return dict(headers or {}, **{'Accept-Encoding': 'identity'})
+
+def _range_headers(headers, start, end=None, if_range=None):
+    range_headers = _identity_headers(headers)
+    range_headers['Range'] = f"bytes={start}-{'' if end is None else end}"
+    if if_range:
+        range_headers['If-Range'] = if_range
+    return range_headers
+
+def fetch_resumable(url, filepath, headers=None, timeout=DEFAULT_TIMEOUT,
+                    retries=RESUME_RETRIES, parallel_threshold=None, parts=PARALLEL_PARTS):
+    """Download a large file, resuming with HTTP Range requests after failures
+
+    Data is written to <name>.part and renamed into place once complete, so an
+    interrupted run picks up where it stopped instead of starting from zero.
+    The response's ETag or Last-Modified is kept in <name>.part.validator and
+    sent as If-Range, so a file that changed upstream is fetched again rather
+    than spliced; a .part file without one is discarded.
+    If parallel_threshold is set and the server supports ranges, files of at
+    least that many bytes are fetched as `parts` concurrent ranges.
+    Returns the number of bytes written (0 if the cached copy was still valid).
+    """
+    try:
+        size = _fetch_resumable(url, filepath, headers, timeout, retries, parallel_threshold, parts)
+    except Exception as e:
+        catalogdb.record_download(url, filepath, 'error', error=str(e))
+        raise
+    catalogdb.record_download(url, filepath, 'ok' if size else 'not modified', size,
+                              httpcache.stored_digest(url)[1])
+    return size
+
+def _fetch_resumable(url, filepath, headers, timeout, retries, parallel_threshold, parts):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    part = _part_path(filepath)
+
+    if parallel_threshold is not None and not part.exists():
+        probe = head(url, headers=_identity_headers(headers),
+                     timeout=timeout, allow_redirects=True)
+        size = int(probe.headers.get('Content-Length') or 0)
+        if (probe.ok and size >= parallel_threshold
+                and probe.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                and not httpcache.conditional_headers(url, filepath)):
+            return _fetch_ranges(url, filepath, size, probe.headers, headers, timeout, retries, parts)
+
+    if_range = _load_validator(filepath)
+    for attempt in range(retries + 1):
+        offset = part.stat().st_size if part.exists() else 0
+        if offset and not if_range:
+            # Can't tell whether the bytes we have belong to the current file
+            part.unlink()
+            offset = 0
+        if offset:
+            request_headers = _range_headers(headers, offset, if_range=if_range)
+            validators = {}
+        else:
+            validators = httpcache.conditional_headers(url, filepath)
+            request_headers = dict(_identity_headers(headers), **validators)
+        try:
+            with get(url, headers=request_headers, stream=True, timeout=timeout) as r:
+                if validators and r.status_code == 304:
+                    return 0
+                if offset and r.status_code == 416:
+                    # Nothing left to fetch: the part file is already complete
+                    response_headers = r.headers
+                    break
+                r.raise_for_status()
+                if r.status_code != 206:
+                    # Server ignored the range (or the file changed): start over
+                    offset = 0
+                if not offset:
+                    if_range = _resume_validator(r.headers)
+                    _save_validator(filepath, if_range)
+                response_headers = r.headers
+                expected = _expected_size(r, offset)
+                with open(part, 'ab' if offset else 'wb') as f:
+                    for chunk in r.raw.stream(CHUNK_SIZE, decode_content=False):
+                        f.write(chunk)
+            if expected is None or part.stat().st_size >= expected:
+                break
+            if attempt == retries:
+                raise requests.exceptions.ChunkedEncodingError(f"Incomplete download of {url}")
+        except TRANSIENT_ERRORS:
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF * (attempt + 1))
+
+    size = part.stat().st_size
+    os.replace(part, filepath)
+    _save_validator(filepath, None)
+    httpcache.remember(url, filepath, response_headers, size, blobstore.store(filepath))
+    return size
+
+def _expected_size(response, offset):
+    """Total size of the file being fetched, if the server told us"""
+    content_range = response.headers.get('Content-Range', '')
+    if response.status_code == 206 and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit():
+        return offset + int(length)
+    return None
+
+def _fetch_ranges(url, filepath, size, response_headers, headers, timeout, retries, parts):
+    """Fetch url as `parts` concurrent byte ranges into a preallocated .part file"""
+    part = _part_path(filepath)
+    with open(part, 'wb') as f:
+        f.truncate(size)
+    # A preallocated part file is not a prefix that can be resumed
+    _save_validator(filepath, None)
+
+    if_range = _resume_validator(response_headers)
+    step = -(-size // parts)
+
+    def fetch_range(start, end):
+        position = start
+        for attempt in range(retries + 1):
+            try:
+                range_headers = _range_headers(headers, position, end, if_range)
+                with get(url, headers=range_headers, stream=True, timeout=timeout) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206:
+                        raise requests.exceptions.HTTPError(f"Range request not honoured for {url}", response=r)
+                    with open(part, 'r+b') as f:
+                        f.seek(position)
+                        for chunk in r.raw.stream(CHUNK_SIZE, decode_content=False):
+                            f.write(chunk)
+                            position += len(chunk)
+                if position > end:
+                    return
+            except TRANSIENT_ERRORS:
+                if attempt == retries:
+                    raise
+                time.sleep(RETRY_BACKOFF * (attempt + 1))
+        raise requests.exceptions.ChunkedEncodingError(f"Incomplete range {start}-{end} for {url}")
+
+    with ThreadPoolExecutor(max_workers=parts) as executor:
+        futures = [executor.submit(fetch_range, start, min(start + step, size) - 1)
+                   for start in range(0, size, step)]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            # Ranges can't be resumed individually across runs; start clean next time
+            part.unlink()
+            raise
+
+    os.replace(part, filepath)
+    httpcache.remember(url, filepath, response_headers, size, blobstore.store(filepath))
+    return size
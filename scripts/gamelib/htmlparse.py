@@ -0,0 +1,88 @@
+"""
+Shared HTML parsing for the scrapers
+
+parse() builds a BeautifulSoup tree with the fastest tree builder installed:
+lxml when it is available, otherwise the stdlib html.parser the scripts used
+before. Set GAMELIB_HTML_PARSER to force a backend.
+
+get_page() fetches a URL and parses it once, keeping the result for the rest
+of the run, so helpers that look at the same page (the game iframe, the
+og:image cover, the asset list) share one request and one tree. Trees from
+get_page() are shared: copy before modifying.
+
+For read-only attribute scans, select_attrs() uses selectolax when it is
+installed, which skips building a BeautifulSoup tree altogether.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from bs4 import BeautifulSoup
+
+from gamelib import fetch
+
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        # selectolax < 0.3.13 only ships the Modest backend
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+# Fastest first
+BACKENDS = ('lxml', 'html.parser')
+
+PAGE_CACHE_SIZE = 32
+
+Page = namedtuple('Page', 'url response soup')
+
+def available_backends():
+    """Tree builders usable in this environment, fastest first"""
+    return [b for b in BACKENDS if b != 'lxml' or HAVE_LXML]
+
+def default_backend():
+    forced = os.environ.get('GAMELIB_HTML_PARSER')
+    if forced:
+        return forced
+    return available_backends()[0]
+
+def parse(markup, backend=None):
+    """Parse HTML (str or bytes) into a BeautifulSoup tree"""
+    return BeautifulSoup(markup, backend or default_backend())
+
+_pages = OrderedDict()
+_pages_lock = threading.Lock()
+
+def get_page(url, headers=None, timeout=15):
+    """Fetch and parse url once per run; raises for HTTP errors like fetch.get + raise_for_status"""
+    with _pages_lock:
+        page = _pages.get(url)
+        if page is not None:
+            _pages.move_to_end(url)
+            return page
+
+    r = fetch.get(url, headers=headers, timeout=timeout)
+    r.raise_for_status()
+    page = Page(r.url, r, parse(r.content))
+
+    with _pages_lock:
+        _pages[url] = page
+        while len(_pages) > PAGE_CACHE_SIZE:
+            _pages.popitem(last=False)
+    return page
+
+def select_attrs(markup, selector, attr):
+    """Values of attr on every element matching a CSS selector"""
+    if SelectolaxParser is not None:
+        tree = SelectolaxParser(markup)
+        values = (node.attributes.get(attr) for node in tree.css(selector))
+    else:
+        values = (tag.get(attr) for tag in parse(markup).select(selector))
+    return [v for v in values if v]
@@ -0,0 +1,109 @@
+"""
+On-disk HTTP validator cache for conditional GETs
+
+Remembers the ETag / Last-Modified of every file downloaded through
+gamelib.fetch, keyed by URL. On the next run the request carries
+If-None-Match / If-Modified-Since and a 304 response leaves the local file
+untouched, so refreshing hundreds of zones only costs the response headers.
+
+Validators are only sent while the local file still exists with the size that
+was recorded, so deleted or hand-edited files are always fetched again.
+"""
+import atexit
+import json
+import os
+import threading
+
+from gamelib import CACHE_DIR
+
+CACHE_FILE = CACHE_DIR / 'http-validators.json'
+
+_entries = None
+_dirty = False
+_lock = threading.Lock()
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+def save():
+    """Write the cache to disk if anything changed"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(_entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_file, CACHE_FILE)
+        _dirty = False
+
+atexit.register(save)
+
+def conditional_headers(url, filepath):
+    """Return If-None-Match / If-Modified-Since headers for url, or {} if it must be fetched"""
+    with _lock:
+        entry = _load().get(url)
+    if not entry or entry.get('path') != str(filepath.resolve()):
+        return {}
+    try:
+        if filepath.stat().st_size != entry.get('size'):
+            return {}
+    except OSError:
+        return {}
+
+    return _validator_headers(entry)
+
+def stored_digest(url):
+    """Return (headers, sha256) for url's last download, or ({}, None)
+
+    Lets a deleted file be revalidated and restored from the blob store
+    instead of downloaded again.
+    """
+    with _lock:
+        entry = _load().get(url)
+    if not entry or not entry.get('sha256'):
+        return {}, None
+    return _validator_headers(entry), entry['sha256']
+
+def _validator_headers(entry):
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def remember(url, filepath, response_headers, size, digest=None):
+    """Record the validators of a completed download"""
+    global _dirty
+    etag = response_headers.get('ETag')
+    last_modified = response_headers.get('Last-Modified')
+    with _lock:
+        entries = _load()
+        if not etag and not last_modified:
+            if entries.pop(url, None) is not None:
+                _dirty = True
+            return
+        entries[url] = {
+            'path': str(filepath.resolve()),
+            'size': size,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': digest,
+        }
+        _dirty = True
+
+def forget(url):
+    """Drop the cached validators for url"""
+    global _dirty
+    with _lock:
+        if _load().pop(url, None) is not None:
+            _dirty = True
@@ -0,0 +1,118 @@
+"""
+Lagged.com game pages: finding the playable page and mirroring it
+
+A Lagged game page (/en/g/<slug>) wraps the game itself, which lives on a
+play page found through the page's iframe, a /games/ or /play/ link, or a
+games/ path in an inline script. mirror() saves a play page with every file
+it pulls in (see gamelib.crawl) and points the copies at each other.
+
+Shared by download-lagged-game-full.py, scrape-lagged-category.py and the
+lagged-pipeline.py stages.
+"""
+import asyncio
+import re
+from urllib.parse import urljoin
+
+from gamelib import assets, crawl, layout, rewrite
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+}
+
+# Downloaded files that can refer to other downloaded files
+TEXT_SUFFIXES = ('.css', '.js', '.mjs', '.json', '.html', '.htm')
+PAGE_RELATIVE_SUFFIXES = ('.js', '.mjs', '.json')
+
+SCRIPT_GAME_RE = re.compile(r'["\']([^"\']*games/[^"\']*)["\']')
+# " - Play on Lagged.com" and similar title suffixes
+TITLE_SUFFIX_RE = re.compile(r'\s*[-–—]\s*.*$')
+
+def game_name(soup):
+    """Game name from the page title, or None"""
+    title_tag = soup.find('title')
+    if not title_tag:
+        return None
+    return TITLE_SUFFIX_RE.sub('', title_tag.get_text()).strip() or None
+
+def find_play_url(soup, page_url):
+    """URL of the page that actually runs the game, or None"""
+    # Look for iframe with game
+    iframe = soup.find('iframe', src=True)
+    if iframe:
+        return urljoin(page_url, iframe.get('src'))
+
+    # Look for game links
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if '/games/' in href or '/play/' in href:
+            return urljoin(page_url, href)
+
+    # Look in scripts
+    for script in soup.find_all('script'):
+        if script.string:
+            m = SCRIPT_GAME_RE.search(script.string)
+            if m:
+                return urljoin(page_url, m.group(1))
+    return None
+
+def cover_url(soup, page_url):
+    """og:image of a game page, or None"""
+    og_image = soup.find('meta', property='og:image')
+    if og_image and og_image.get('content'):
+        return urljoin(page_url, og_image['content'])
+    return None
+
+def update_paths(html_path, base_url, results):
+    """Rewrite references to downloaded files (in the page and in text assets) to local paths"""
+    try:
+        rewriter = rewrite.Rewriter({r.url: r.path for r in results if r.ok})
+        rewriter.rewrite_file(html_path, base_url)
+        for r in results:
+            suffix = r.path.suffix.lower()
+            if not r.ok or suffix not in TEXT_SUFFIXES:
+                continue
+            if suffix in PAGE_RELATIVE_SUFFIXES:
+                # Paths in scripts and JSON are resolved against the page
+                rewriter.rewrite_file(r.path, base_url, page_path=html_path)
+            else:
+                rewriter.rewrite_file(r.path, r.url)
+    except Exception as e:
+        print(f"    ⚠️  Could not update HTML paths: {e}")
+
+async def mirror(downloader, play_url, game_dir, markup=None, flat=False, headers=HEADERS, log=print):
+    """Save play_url as game_dir/index.html with all its assets; returns (downloaded, failed)
+
+    markup is the play page when the caller already has it. Assets keep their
+    upstream paths (layout.mirror_path), or the js/css/images folders with flat.
+    """
+    log = log or (lambda *a, **k: None)
+    if markup is None:
+        log(f"    🔍 Fetching game page: {play_url}")
+        response = await downloader.get(play_url, headers=headers)
+        response.raise_for_status()
+        markup = response.text
+
+    game_dir.mkdir(parents=True, exist_ok=True)
+    (game_dir / 'index.html').write_text(markup, encoding='utf-8')
+
+    # Extract all assets (linked stylesheets are fetched and followed too)
+    log(f"    🔍 Extracting assets...")
+    found = await downloader.run(play_url, assets.extract_page, markup, play_url, headers=headers)
+    log(f"    📦 Found {len(found)} assets to download")
+
+    # Download them and everything they reference (framework.js -> .data,
+    # CSS -> fonts, config.json -> textures) from the game's host
+    def local_path(asset):
+        if flat:
+            return layout.flat_path(asset.url, asset.kind, game_dir)
+        path = layout.mirror_path(asset.url, play_url, game_dir)
+        # Never let an asset overwrite the page itself
+        return None if path == game_dir / 'index.html' else path
+
+    results = await crawl.crawl(downloader, play_url, found, local_path, headers=headers)
+    downloaded = sum(1 for r in results if r.ok)
+
+    # Point the page and the downloaded CSS/JS at the local copies
+    await asyncio.to_thread(update_paths, game_dir / 'index.html', play_url, results)
+    return downloaded, len(results) - downloaded
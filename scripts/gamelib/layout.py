@@ -0,0 +1,79 @@
+"""
+Where mirrored files go on disk
+
+mirror_path() keeps each file at its upstream path relative to the game's
+root URL (the directory of its index.html), so relative references inside
+the game keep working without any rewriting and two files that share a
+basename never overwrite each other:
+
+    https://host/games/foo/index.html       root
+    https://host/games/foo/js/app.js     -> <game>/js/app.js
+    https://host/games/foo/Build/a.data  -> <game>/Build/a.data
+
+Files from other hosts (or from outside the root on the same host) go under
+_external/<host>/<path>, which can't clash with the game's own files.
+
+flat_path() is the older layout (js/, css/, images/ by kind, basename only),
+kept for scripts that ask for it.
+"""
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+EXTERNAL_DIR = '_external'
+# Characters Windows does not allow in file names
+UNSAFE_CHARS_RE = re.compile(r'[<>:"|?*\x00-\x1f]')
+
+FLAT_DIRS = {
+    'script': 'js',
+    'stylesheet': 'css',
+    'image': 'images',
+    'font': 'fonts',
+    'media': 'media',
+    'data': 'data',
+}
+
+def root_of(page_url):
+    """Directory URL path of a page (/games/foo/index.html -> /games/foo/)"""
+    path = urlparse(page_url).path or '/'
+    return path if path.endswith('/') else posixpath.dirname(path) + '/'
+
+def _safe_parts(path):
+    parts = []
+    for part in path.split('/'):
+        if part in ('', '.'):
+            continue
+        if part == '..':
+            if parts:
+                parts.pop()
+            continue
+        parts.append(UNSAFE_CHARS_RE.sub('_', part))
+    return parts
+
+def relative_path(url, page_url):
+    """Posix path of url inside the mirror of the game at page_url"""
+    parsed = urlparse(url)
+    path = unquote(parsed.path) or '/'
+    root = root_of(page_url)
+    if parsed.netloc.lower() == urlparse(page_url).netloc.lower() and path.startswith(root):
+        prefix = []
+        parts = _safe_parts(path[len(root):])
+    else:
+        prefix = [EXTERNAL_DIR, UNSAFE_CHARS_RE.sub('_', parsed.netloc.lower())]
+        parts = _safe_parts(path)
+    if path.endswith('/') or not parts:
+        parts.append('index.html')
+    return '/'.join(prefix + parts)
+
+def mirror_path(url, page_url, game_dir):
+    """Local file for url when mirroring the game at page_url into game_dir"""
+    return Path(game_dir) / relative_path(url, page_url)
+
+def flat_path(url, kind, game_dir, dirs=FLAT_DIRS):
+    """Local file for url in the flat js/css/images layout, or None for kinds it doesn't keep"""
+    subdir = dirs.get(kind)
+    filename = posixpath.basename(unquote(urlparse(url).path))
+    if not subdir or not filename:
+        return None
+    return Path(game_dir) / subdir / UNSAFE_CHARS_RE.sub('_', filename)
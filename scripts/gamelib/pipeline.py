@@ -0,0 +1,95 @@
+"""
+Streaming pipeline of asyncio stages joined by bounded queues
+
+Each Stage has its own pool of workers and reads from the queue the stage
+before it writes to, so every stage works on different items at the same
+time and the run takes about as long as its slowest stage rather than the
+sum of all of them. The queues are bounded: a stage that falls behind makes
+the stages before it wait instead of piling items up in memory.
+
+A stage function takes an item and returns the item for the next stage, or
+None to drop it. Exceptions are counted and logged, and drop the item too.
+Blocking work belongs in asyncio.to_thread() (or a DownloadEngine) inside
+the stage function, so it doesn't stall the other stages.
+"""
+import asyncio
+import time
+
+DEFAULT_QUEUE_SIZE = 16
+
+_DONE = object()
+
+class Stage:
+    """One step of a pipeline: func(item) -> item or None, run by `workers` tasks"""
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.passed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy = 0.0
+
+    def summary(self):
+        return (f"{self.name}: {self.passed} passed, {self.dropped} dropped, {self.failed} failed, "
+                f"{self.busy:.1f}s busy over {self.workers} worker(s)")
+
+async def run(source, stages, maxsize=DEFAULT_QUEUE_SIZE, log=print):
+    """Feed every item of source (an iterable or async iterable) through stages
+
+    Returns what the last stage passed on, in completion order.
+    """
+    queues = [asyncio.Queue(maxsize) for _ in stages]
+    results = []
+
+    async def feed():
+        if hasattr(source, '__aiter__'):
+            async for item in source:
+                await queues[0].put(item)
+        else:
+            for item in source:
+                await queues[0].put(item)
+
+    async def worker(index, stage):
+        inbox = queues[index]
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                item = await stage.func(item)
+            except Exception as e:
+                stage.failed += 1
+                if log:
+                    log(f"  ✗ {stage.name}: {e}")
+                continue
+            finally:
+                stage.busy += time.perf_counter() - start
+            if item is None:
+                stage.dropped += 1
+                continue
+            stage.passed += 1
+            if index + 1 < len(stages):
+                await queues[index + 1].put(item)
+            else:
+                results.append(item)
+
+    async def run_stage(index, stage):
+        await asyncio.gather(*(worker(index, stage) for _ in range(stage.workers)))
+        # Everything upstream is finished: let the next stage's workers stop too
+        if index + 1 < len(stages):
+            for _ in range(stages[index + 1].workers):
+                await queues[index + 1].put(_DONE)
+
+    tasks = [asyncio.create_task(run_stage(i, stage)) for i, stage in enumerate(stages)]
+    try:
+        await feed()
+        for _ in range(stages[0].workers):
+            await queues[0].put(_DONE)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
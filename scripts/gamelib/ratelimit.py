@@ -0,0 +1,87 @@
+"""
+Per-host token-bucket rate limiting for the fetch layer
+
+Every request made through gamelib.fetch takes a token from its host's bucket
+first. Each origin gets a steady request rate plus a burst allowance, while
+requests to unrelated hosts never wait on each other (unlike the old fixed
+time.sleep() between games).
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+# (requests per second, burst) per domain; subdomains inherit their parent's
+# entry unless they have their own
+HOST_LIMITS = {
+    'cdn.jsdelivr.net': (20, 40),
+    'raw.githubusercontent.com': (10, 10),
+    'lagged.com': (4, 8),
+    'crazygames.com': (4, 8),
+    'escaperoad.org': (2, 4),
+    'escaperoad.io': (2, 4),
+    'azgames.io': (2, 4),
+    'azgame.io': (2, 4),
+}
+DEFAULT_LIMIT = (5, 10)
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping if the bucket is empty; returns the time waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (possibly going into debt) so waiting
+            # threads are served in order without holding the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def limit_for(host):
+    """Return the (rate, burst) configured for host or its closest parent domain"""
+    parts = host.lower().split('.')
+    for i in range(len(parts) - 1):
+        limit = HOST_LIMITS.get('.'.join(parts[i:]))
+        if limit:
+            return limit
+    return DEFAULT_LIMIT
+
+def set_limit(host, rate, burst=None):
+    """Configure the rate for a domain (burst defaults to the rate)"""
+    host = host.lower()
+    HOST_LIMITS[host] = (rate, burst or rate)
+    # Drop existing buckets so the new limit takes effect immediately
+    with _buckets_lock:
+        for name in [h for h in _buckets if h == host or h.endswith('.' + host)]:
+            del _buckets[name]
+
+def bucket_for(host):
+    """Return the shared bucket for a host, creating it on first use"""
+    host = host.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(*limit_for(host))
+            _buckets[host] = bucket
+    return bucket
+
+def acquire(url):
+    """Wait for permission to send one request to url's host"""
+    host = urlparse(url).hostname
+    if not host:
+        return 0.0
+    return bucket_for(host).acquire()
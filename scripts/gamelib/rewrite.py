@@ -0,0 +1,137 @@
+"""
+Single-pass URL rewriting for mirrored games
+
+Once a game's files are downloaded, every reference to them (in the HTML, and
+in the CSS and JS that were downloaded too) has to point at the local copy.
+Rewriter takes the whole {original URL: local file} map and compiles, per
+referencing directory, one regex that matches every way a file can be
+written there:
+
+    https://host/game/js/app.js     absolute
+    //host/game/js/app.js           protocol-relative
+    /game/js/app.js                 root-relative (same host)
+    js/app.js, ./js/app.js          relative to the referencing file
+    ../img/logo.png
+
+The alternatives are merged into a character trie before compiling, so the
+regex engine walks the text once and never tries the keys one by one; the
+cost is linear in the size of the text however many assets there are.
+Replacements are relative paths from the file being rewritten, so the mirror
+works from any directory and with file:// URLs.
+"""
+import os
+import posixpath
+import re
+from urllib.parse import urlparse
+
+# A reference must not be glued to a longer URL or word on either side
+BEFORE = r'(?<![\w.\-/:%@])'
+AFTER = r'(?![\w\-/%])'
+
+def trie_pattern(words):
+    """Regex matching any of words, longest first, built from a character trie"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = None
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not end:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        return pattern + '?' if end else pattern
+
+    return build(trie)
+
+def _dir_of(url_path):
+    return url_path if url_path.endswith('/') else posixpath.dirname(url_path) + '/'
+
+class Rewriter:
+    """Rewrite references to mirrored files as relative local paths
+
+    urls maps absolute URLs (as downloaded) to the local Paths they were saved to.
+    """
+
+    def __init__(self, urls):
+        self.urls = {}
+        for url, path in urls.items():
+            parsed = urlparse(url)
+            if parsed.scheme in ('http', 'https') and path is not None:
+                self.urls[url] = (parsed, path)
+        self._compiled = {}
+
+    def _forms(self, base):
+        """{text as written in a file at base URL: target URL}"""
+        base_dir = _dir_of(base.path)
+        forms = {}
+        for url, (parsed, _) in self.urls.items():
+            tail = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+            forms[url] = url
+            forms[f"//{parsed.netloc}{tail}"] = url
+            if parsed.netloc == base.netloc:
+                forms.setdefault(tail, url)
+                relative = posixpath.relpath(parsed.path, base_dir)
+                if parsed.path.endswith('/') and relative != '.':
+                    relative += '/'
+                if relative != '.':
+                    relative += f"?{parsed.query}" if parsed.query else ''
+                    forms.setdefault(relative, url)
+                    if not relative.startswith('../'):
+                        forms.setdefault('./' + relative, url)
+        return forms
+
+    def _automaton(self, base_url):
+        base = urlparse(base_url)
+        key = (base.netloc, _dir_of(base.path))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            forms = self._forms(base)
+            regex = re.compile(BEFORE + '(' + trie_pattern(forms) + ')' + AFTER) if forms else None
+            compiled = self._compiled[key] = (regex, forms)
+        return compiled
+
+    def rewrite(self, text, base_url, path):
+        """Rewrite text of the file at base_url, saved as path; returns (text, replacements)
+
+        Scripts and JSON resolve paths against the page that loads them, not
+        their own location: for those pass the page's URL and local path.
+        """
+        regex, forms = self._automaton(base_url)
+        if regex is None:
+            return text, 0
+        from_dir = os.path.dirname(os.path.abspath(path))
+        count = 0
+
+        def replace(m):
+            nonlocal count
+            target = self.urls[forms[m.group(1)]][1]
+            count += 1
+            return os.path.relpath(os.path.abspath(target), from_dir).replace(os.sep, '/')
+
+        return regex.sub(replace, text), count
+
+    def rewrite_file(self, path, base_url, page_path=None):
+        """Rewrite a saved text file; returns the number of references replaced
+
+        page_path is the local page a script or JSON file is loaded from (see rewrite).
+        The new text is written to a temp file and renamed over path, so a
+        file hardlinked from the blob store (and every other game sharing
+        that blob) is left alone.
+        """
+        text = path.read_text(encoding='utf-8', errors='surrogateescape')
+        new_text, count = self.rewrite(text, base_url, page_path or path)
+        if count:
+            tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+            try:
+                tmp_path.write_text(new_text, encoding='utf-8', errors='surrogateescape')
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        return count
@@ -0,0 +1,93 @@
+"""
+Grid thumbnails for game covers
+
+The games grid shows every cover as a square (object-fit: cover), but the
+covers themselves are whatever the upstream site had: 512px PNGs, 1200px
+og:images, .ico favicons. make_thumbnail() crops and resizes a cover to a
+fixed square and writes it as WebP (and optionally AVIF) under img/thumbs/,
+named after the cover's content hash so unchanged covers are never
+re-encoded, and returns a tiny blurred WebP as a data: URI placeholder the
+grid can show while the real image loads.
+
+Needs Pillow (with AVIF support for AVIF output).
+"""
+import base64
+import hashlib
+import io
+import os
+from pathlib import Path
+
+from PIL import Image, ImageFilter, ImageOps
+
+from gamelib import REPO_ROOT
+
+THUMBS_DIR = REPO_ROOT / 'img' / 'thumbs'
+DEFAULT_SIZE = 256
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 30
+
+def source_hash(path):
+    """Short sha256 of a cover file, used to name its thumbnails"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+def site_path(path, site_root=REPO_ROOT):
+    """Root-relative URL a file in the repo is served at"""
+    return '/' + Path(path).resolve().relative_to(site_root).as_posix()
+
+def _open_rgba(path):
+    with Image.open(path) as image:
+        if image.format == 'ICO':
+            # .ico files hold several sizes: use the largest
+            image.size = max(image.info.get('sizes', [image.size]))
+        image.load()
+        return ImageOps.exif_transpose(image).convert('RGBA')
+
+def _save_atomic(image, path, fmt, **params):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        image.save(tmp, fmt, **params)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+def placeholder(image):
+    """Blurred PLACEHOLDER_SIZE px WebP of image as a data: URI (a couple hundred bytes)"""
+    small = image.resize((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BILINEAR)
+    small = small.filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    small.save(buf, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+def make_thumbnail(source, size=DEFAULT_SIZE, avif=False, out_dir=THUMBS_DIR, force=False):
+    """Thumbnails of one cover file; returns the catalog's "thumb" entry
+
+    {"webp": url, "avif": url (with avif=True), "width", "height",
+     "bytes": {"source", "webp", "avif"}, "placeholder": data URI}
+    """
+    source = Path(source)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{source_hash(source)}-{size}"
+    image = ImageOps.fit(_open_rgba(source), (size, size), Image.Resampling.LANCZOS)
+
+    thumb = {}
+    sizes = {'source': source.stat().st_size}
+    outputs = [('webp', 'WEBP', {'quality': WEBP_QUALITY, 'method': 6})]
+    if avif:
+        outputs.append(('avif', 'AVIF', {'quality': AVIF_QUALITY}))
+    for ext, fmt, params in outputs:
+        path = out_dir / f"{stem}.{ext}"
+        if force or not path.exists():
+            _save_atomic(image, path, fmt, **params)
+        thumb[ext] = site_path(path)
+        sizes[ext] = path.stat().st_size
+    thumb.update(width=size, height=size, bytes=sizes, placeholder=placeholder(image))
+    return thumb
@@ -0,0 +1,226 @@
+"""
+Validation of mirrored games in non-semag/
+
+A game is valid when its folder has an index.html that isn't just an iframe
+to another game site, and it either ships its own game files (.js, .swf,
+.wasm or .data, compressed or not) or loads them from a known CDN.
+
+listing() walks a game folder once with os.scandir and scan() classifies
+every file in it; validate_all() runs that over many games on a thread pool
+(the work is almost all filesystem calls, which release the GIL).
+
+ValidationCache keeps reports in .scraper-cache/validation.json, so re-runs
+only inspect game folders that were added or changed.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from gamelib import CACHE_DIR
+from gamelib.catalog import write_atomic
+
+DEFAULT_WORKERS = 16
+
+CACHE_FILE = CACHE_DIR / 'validation.json'
+# Bump when the validation rules change, so cached reports are recomputed
+CACHE_VERSION = 1
+
+# Game portal named on the same line as an <iframe>: the mirror is only a shell
+PORTAL_RE = re.compile(r'lagged\.com|crazygames|kongregate|gamejolt|itch\.io')
+# Game loaded from a CDN instead of local files (also fine)
+EXTERNAL_CDN_RE = re.compile(r'gacembed\.withgoogle\.com|jsdelivr\.net|unpkg\.com|cdnjs\.cloudflare\.com')
+
+GAME_FILE_TYPES = {
+    '.js': 'js',
+    '.mjs': 'js',
+    '.swf': 'swf',
+    '.wasm': 'wasm',
+    '.data': 'data',
+}
+COMPRESSED_SUFFIXES = ('.br', '.gz', '.unityweb')
+
+Scan = namedtuple('Scan', 'files bytes empty counts')
+Report = namedtuple('Report', 'slug valid reason files bytes empty counts')
+
+def file_type(name):
+    """'js', 'swf', 'wasm', 'data' or None, looking through .br/.gz/.unityweb"""
+    name = name.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return GAME_FILE_TYPES.get(os.path.splitext(name)[1])
+
+def _digest(*parts):
+    return hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def iframe_portal(html):
+    """Portal an iframe line points at ("lagged.com", ...) or None
+
+    Scans from each "iframe" to the end of its line in the lowercased page,
+    rather than running an `iframe.*portal` regex from every position.
+    """
+    pos = html.find('iframe')
+    while pos != -1:
+        end = html.find('\n', pos)
+        if end == -1:
+            end = len(html)
+        m = PORTAL_RE.search(html, pos, end)
+        if m:
+            return m.group(0)
+        pos = html.find('iframe', end)
+    return None
+
+def listing(game_dir):
+    """Every file under game_dir as (relative path, size, mtime_ns), sorted, from one scandir walk"""
+    root = str(game_dir)
+    entries = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                entries.append((os.path.relpath(entry.path, root), st.st_size, st.st_mtime_ns))
+    entries.sort()
+    return entries
+
+def scan(game_dir, entries=None):
+    """File count, total bytes, zero-byte files and counts per game file type"""
+    if entries is None:
+        entries = listing(game_dir)
+    total = 0
+    empty = []
+    counts = {}
+    for rel, size, _ in entries:
+        total += size
+        if size == 0:
+            empty.append(rel)
+        kind = file_type(rel)
+        if kind:
+            counts[kind] = counts.get(kind, 0) + 1
+    return Scan(len(entries), total, empty, counts)
+
+def _read_index(game_dir):
+    try:
+        return (Path(game_dir) / 'index.html').read_bytes()
+    except OSError:
+        return None
+
+def _report(slug, result, html):
+    report = Report(slug, False, '', result.files, result.bytes, result.empty, result.counts)
+    if html is None:
+        return report._replace(reason='no index.html')
+    html_content = html.decode('utf-8', errors='replace').lower()
+
+    portal = iframe_portal(html_content)
+    if portal:
+        return report._replace(reason=f"iframe to {portal}")
+    if result.counts:
+        return report._replace(valid=True, reason='game files')
+    if EXTERNAL_CDN_RE.search(html_content):
+        return report._replace(valid=True, reason='external cdn')
+    return report._replace(reason='no game files')
+
+def validate(game_dir, entries=None):
+    """Report for one game folder"""
+    game_dir = Path(game_dir)
+    if not game_dir.is_dir():
+        return Report(game_dir.name, False, 'missing', 0, 0, [], {})
+    return _report(game_dir.name, scan(game_dir, entries), _read_index(game_dir))
+
+def validate_all(game_dirs, workers=DEFAULT_WORKERS, cache=None):
+    """Reports for many game folders, validated concurrently, in input order
+
+    With a ValidationCache, folders whose files haven't changed since the
+    last run reuse their stored report.
+    """
+    check = cache.validate if cache is not None else validate
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check, game_dirs))
+
+def to_json(report):
+    """Report as a JSON-friendly dict"""
+    return report._asdict()
+
+class ValidationCache:
+    """Reports from earlier runs, keyed by each game folder's contents
+
+    A folder is looked up by a hash of its file list with sizes and mtimes,
+    which costs one directory walk. When that misses (files touched by a
+    checkout or copy), a second key made of the file list, sizes and the
+    sha1 of index.html - everything a report depends on - is tried before
+    validating from scratch.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = Path(path)
+        self.hits = 0
+        self.rehashed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        data = _read_json(self.path)
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data.get('games', {})
+        else:
+            self.entries = {}
+
+    def validate(self, game_dir):
+        """Report for one game folder, from the cache when its files are unchanged"""
+        game_dir = Path(game_dir)
+        if not game_dir.is_dir():
+            return validate(game_dir)
+        key = str(game_dir.resolve())
+        entries = listing(game_dir)
+        stat_key = _digest(entries)
+        with self._lock:
+            cached = self.entries.get(key)
+        if cached and cached['stat'] == stat_key:
+            with self._lock:
+                self.hits += 1
+            return Report(**cached['report'])
+
+        html = _read_index(game_dir)
+        content_key = _digest([(rel, size) for rel, size, _ in entries],
+                              hashlib.sha1(html).hexdigest() if html is not None else None)
+        if cached and cached['content'] == content_key:
+            report = Report(**cached['report'])
+            counter = 'rehashed'
+        else:
+            report = _report(game_dir.name, scan(game_dir, entries), html)
+            counter = 'misses'
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.entries[key] = {'stat': stat_key, 'content': content_key, 'report': to_json(report)}
+            self._dirty = True
+        return report
+
+    def save(self):
+        """Write the cache, dropping folders that no longer exist"""
+        with self._lock:
+            gone = [key for key in self.entries if not os.path.isdir(key)]
+            for key in gone:
+                del self.entries[key]
+            if not self._dirty and not gone:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, json.dumps({'version': CACHE_VERSION, 'games': self.entries},
+                                               ensure_ascii=False))
+            self._dirty = False
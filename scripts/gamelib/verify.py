@@ -0,0 +1,95 @@
+"""
+Smoke check that a mirrored game's files are all there
+
+verify() parses non-semag/<game>/index.html with gamelib.assets (tags,
+inline scripts, Unity loader configs, Ruffle/Flash SWF paths, PlayCanvas
+settings), resolves every same-site reference to a file in the repo the way
+the deployed site would serve it, and follows the local stylesheets,
+scripts and JSON files it finds for their own references. Anything that
+doesn't exist or is zero bytes is reported, together with the file that
+referenced it.
+
+Nothing is fetched and no browser runs: this is meant to be cheap enough
+for a pre-deploy check over the whole tree (verify_all() spreads the games
+over a process pool, since the work is parsing).
+"""
+import os
+import posixpath
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from gamelib import REPO_ROOT, assets, crawl
+
+# Stand-in origin for the deployed site; only paths under it are checked
+SITE_ORIGIN = 'https://site.invalid'
+
+Problem = namedtuple('Problem', 'path problem referrer')
+Check = namedtuple('Check', 'slug checked problems')
+
+def page_url(game_dir, site_root=REPO_ROOT):
+    """URL index.html of game_dir is served at"""
+    rel = Path(game_dir).resolve().relative_to(site_root).as_posix()
+    return f"{SITE_ORIGIN}/{rel}/index.html"
+
+def local_file(url, site_root=REPO_ROOT):
+    """File in the repo that serves url, or None for other sites"""
+    parsed = urlparse(url)
+    if f"{parsed.scheme}://{parsed.netloc}" != SITE_ORIGIN:
+        return None
+    path = unquote(parsed.path)
+    # Static hosts serve a folder URL from its index.html
+    return Path(site_root) / path.lstrip('/') / ('index.html' if path.endswith('/') else '')
+
+def _referrer(url, site_root):
+    path = local_file(url, site_root)
+    return path.relative_to(site_root).as_posix() if path else url
+
+def verify(game_dir, site_root=REPO_ROOT, follow=True):
+    """Check(slug, number of files checked, [Problem]) for one game folder
+
+    With follow=False only the references in index.html itself are checked.
+    """
+    game_dir = Path(game_dir).resolve()
+    site_root = Path(site_root).resolve()
+    index_html = game_dir / 'index.html'
+    if not index_html.is_file():
+        return Check(game_dir.name, 0, [Problem('index.html', 'missing', None)])
+
+    page = page_url(game_dir, site_root)
+    markup = index_html.read_text(encoding='utf-8', errors='replace')
+    queue = [(asset, page) for asset in assets.extract(markup, page).same_origin(page)]
+    seen = {page}
+    problems = []
+    while queue:
+        asset, referrer = queue.pop()
+        if asset.url in seen:
+            continue
+        seen.add(asset.url)
+        path = local_file(asset.url, site_root)
+        if path.is_dir():
+            continue
+        if not path.is_file():
+            # streamingAssetsUrl is a folder Unity only reads from on demand
+            if asset.source == 'unity' and not posixpath.splitext(path.name)[1]:
+                continue
+            problem = 'missing'
+        elif path.stat().st_size == 0:
+            problem = 'empty'
+        else:
+            if follow:
+                found = crawl.references(asset, path, page).same_origin(page)
+                queue.extend((a, asset.url) for a in found if a.url not in seen)
+            continue
+        rel = os.path.relpath(path, game_dir) if path.is_relative_to(game_dir) \
+            else '/' + path.relative_to(site_root).as_posix()
+        problems.append(Problem(Path(rel).as_posix(), problem, _referrer(referrer, site_root)))
+    return Check(game_dir.name, len(seen) - 1, sorted(problems))
+
+def verify_all(game_dirs, workers=None, follow=True):
+    """Checks for many game folders on a process pool, in input order"""
+    game_dirs = list(game_dirs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify, game_dirs, [REPO_ROOT] * len(game_dirs),
+                             [follow] * len(game_dirs), chunksize=8))
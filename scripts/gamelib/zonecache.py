@@ -0,0 +1,187 @@
+"""
+Cached loader for gn-math's zones.json
+
+Every gn-math script used to download zones.json on each run. load() keeps
+the last copy in .scraper-cache/ together with the assets commit it came
+from and its ETag:
+
+- a copy younger than MAX_AGE is used without touching the network
+- otherwise the current commit of gn-math/assets is looked up (a 40-byte
+  response) and the cached copy is reused if it hasn't moved
+- only then is zones.json itself requested, conditionally, from the
+  commit-pinned jsDelivr URL, falling back to raw.githubusercontent.com
+
+Offline mode (load(offline=True) or GAMELIB_OFFLINE=1 in the environment)
+only ever reads the cache, and network errors fall back to the cached copy.
+
+changes_since() / save_snapshot() compare a listing with the one a script
+last acted on, so runs can limit themselves to added, removed or renamed
+zones.
+"""
+import json
+import os
+import time
+from collections import namedtuple
+
+from gamelib import CACHE_DIR, fetch
+from gamelib.catalog import write_atomic
+
+ASSETS_REPO = 'gn-math/assets'
+BRANCH = 'main'
+COMMIT_URL = f'https://api.github.com/repos/{ASSETS_REPO}/commits/{BRANCH}'
+MIRRORS = (
+    'https://cdn.jsdelivr.net/gh/' + ASSETS_REPO + '@{ref}/zones.json',
+    'https://raw.githubusercontent.com/' + ASSETS_REPO + '/{ref}/zones.json',
+)
+
+CACHE_FILE = CACHE_DIR / 'zones.json'
+META_FILE = CACHE_DIR / 'zones-meta.json'
+SNAPSHOT_DIR = CACHE_DIR / 'zones-snapshots'
+
+# Reuse the cached copy without any request while it is this fresh (seconds)
+MAX_AGE = 15 * 60
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': '*/*',
+}
+
+ZoneDiff = namedtuple('ZoneDiff', 'added removed renamed changed')
+
+class ZonesUnavailable(Exception):
+    """zones.json could not be fetched and there is no cached copy"""
+
+def is_offline():
+    return os.environ.get('GAMELIB_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+def _read_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(data, ensure_ascii=False))
+
+def cached():
+    """(zones, meta) from the local cache, or (None, {})"""
+    zones = _read_json(CACHE_FILE)
+    meta = _read_json(META_FILE, {}) if zones is not None else {}
+    return zones, meta
+
+def latest_commit(timeout=10):
+    """SHA of the newest gn-math/assets commit, or None if it can't be looked up"""
+    try:
+        r = fetch.get(COMMIT_URL, headers={**HEADERS, 'Accept': 'application/vnd.github.sha'},
+                      timeout=timeout)
+        if r.status_code == 200 and len(r.text.strip()) == 40:
+            return r.text.strip()
+    except fetch.TRANSIENT_ERRORS:
+        pass
+    return None
+
+def _download(ref, meta, timeout):
+    """Fetch zones.json at ref; returns (zones or None if unchanged, response headers)"""
+    headers = dict(HEADERS)
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    last_error = None
+    for template in MIRRORS:
+        url = template.format(ref=ref)
+        try:
+            r = fetch.get(url, headers=headers, timeout=timeout)
+            if r.status_code == 304:
+                return None, r.headers
+            r.raise_for_status()
+            return r.json(), r.headers
+        except Exception as e:
+            last_error = e
+    raise ZonesUnavailable(f"could not fetch zones.json: {last_error}")
+
+def load(offline=None, max_age=MAX_AGE, refresh=False, timeout=30):
+    """Return the parsed zones.json, from the cache whenever it is still current
+
+    refresh=True skips the freshness window (but still revalidates instead of
+    downloading when nothing changed).
+    """
+    zones, meta = cached()
+    if offline is None:
+        offline = is_offline()
+    if offline:
+        if zones is None:
+            raise ZonesUnavailable("offline mode and no cached zones.json")
+        return zones
+
+    now = time.time()
+    if zones is not None and not refresh and now - meta.get('checked_at', 0) < max_age:
+        return zones
+
+    try:
+        commit = latest_commit()
+        if zones is not None and commit and commit == meta.get('commit'):
+            meta['checked_at'] = now
+            _write_json(META_FILE, meta)
+            return zones
+
+        new_zones, headers = _download(commit or BRANCH, meta if zones is not None else {}, timeout)
+    except ZonesUnavailable:
+        if zones is None:
+            raise
+        print("  ⚠ Could not refresh zones.json, using cached copy", flush=True)
+        return zones
+
+    if new_zones is not None:
+        zones = new_zones
+        _write_json(CACHE_FILE, zones)
+    _write_json(META_FILE, {
+        'commit': commit,
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'checked_at': now,
+    })
+    return zones
+
+def by_id(zones):
+    """{zone id: zone} for the real zones in a listing (dict or list form)"""
+    items = zones.values() if isinstance(zones, dict) else zones
+    return {zone['id']: zone for zone in items
+            if isinstance(zone, dict) and 'id' in zone and zone['id'] != -1}
+
+def diff(old, new):
+    """Compare two listings by zone id
+
+    Returns ZoneDiff(added, removed, renamed, changed): lists of new zones,
+    dropped zones, (old, new) pairs whose name changed and (old, new) pairs
+    that changed otherwise.
+    """
+    old_by_id = by_id(old or [])
+    new_by_id = by_id(new or [])
+    added = [new_by_id[i] for i in new_by_id if i not in old_by_id]
+    removed = [old_by_id[i] for i in old_by_id if i not in new_by_id]
+    renamed = []
+    changed = []
+    for zone_id, zone in new_by_id.items():
+        before = old_by_id.get(zone_id)
+        if before is None or before == zone:
+            continue
+        if before.get('name') != zone.get('name'):
+            renamed.append((before, zone))
+        else:
+            changed.append((before, zone))
+    return ZoneDiff(added, removed, renamed, changed)
+
+def _snapshot_file(name):
+    return SNAPSHOT_DIR / f'{name}.json'
+
+def changes_since(zones, name='default'):
+    """Diff zones against the snapshot saved under name (everything is new if none)"""
+    return diff(_read_json(_snapshot_file(name), []), zones)
+
+def save_snapshot(zones, name='default'):
+    """Remember zones as the listing a script has now acted on"""
+    _write_json(_snapshot_file(name), zones)
@@ -0,0 +1,177 @@
+"""
+Fuzzy matching of catalog entries to gn-math zones
+
+ZoneIndex precomputes, for every zone name, a normalized key, its word tokens
+and its character trigrams, plus inverted indexes over tokens and trigrams.
+Matching a name only scores the zones that share at least one trigram with
+it, so the whole catalog can be matched against thousands of zones in a
+fraction of a second.
+
+Every match carries a score between 0 and 1 and a status:
+
+- 'id'         the zone id from the entry's imagePath, and the name agrees
+- 'exact'      normalized names are equal
+- 'fuzzy'      best candidate scored above the threshold, clearly ahead of
+               the runner-up, with the same numbers in its name ("Retro Bowl 2"
+               is never a fuzzy match for "Retro Bowl")
+- 'ambiguous'  candidates exist but none is confident enough, two are too
+               close to call, or the name doesn't back up the imagePath id;
+               these are for a human to review
+- 'none'       nothing similar
+
+Only 'id' and 'exact' matches (AUTO_APPLY) are safe to write back without a
+look; scripts report 'fuzzy' ones along with the ambiguous ones.
+"""
+import re
+from collections import Counter, namedtuple
+from itertools import chain
+
+from gamelib.catalog import cover_source, zone_id_from_image_path
+
+THRESHOLD = 0.75
+# Best candidate must beat the runner-up by this much to be accepted
+MARGIN = 0.08
+# Candidates below this aren't worth reporting
+MIN_SCORE = 0.4
+# Zones sharing only a few common trigrams (" s", "er ") with the name are
+# skipped before the token overlap is even looked at
+DICE_FLOOR = 0.25
+
+AUTO_APPLY = ('id', 'exact')
+
+Candidate = namedtuple('Candidate', 'zone score')
+Match = namedtuple('Match', 'zone score status candidates')
+
+BRACKETS_RE = re.compile(r'\s*[\(\[].*?[\)\]]')
+# Version numbers stay one token ("1.12.2"), so versions of a game don't collapse together
+TOKEN_RE = re.compile(r'\bv?(\d+(?:\.\d+)+)|([a-z0-9]+)')
+
+def tokens(name):
+    """Lowercase word tokens with (...) / [...] dropped; version numbers are kept"""
+    name = BRACKETS_RE.sub('', name or '').lower()
+    return [version or word for version, word in TOKEN_RE.findall(name)]
+
+def name_key(name):
+    """Normalized name used for exact comparisons ("Ragdoll Hit (v2)" -> "ragdoll-hit",
+    "Minecraft 1.12.2" -> "minecraft-1.12.2")"""
+    return '-'.join(tokens(name))
+
+def numbers(key):
+    """Numeric and version tokens of a name key (sequel numbers, years, versions)"""
+    return {t for t in key.split('-') if any(ch.isdigit() for ch in t)}
+
+def same_numbers(a, b):
+    return numbers(name_key(a)) == numbers(name_key(b))
+
+def trigrams(key):
+    padded = f' {key.replace("-", " ")} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(a, b):
+    """Score two names between 0 and 1 (trigram Dice blended with token overlap)"""
+    ka, kb = name_key(a), name_key(b)
+    if not ka or not kb:
+        return 0.0
+    if ka == kb:
+        return 1.0
+    ta, tb = trigrams(ka), trigrams(kb)
+    dice = 2 * len(ta & tb) / (len(ta) + len(tb))
+    wa, wb = set(ka.split('-')), set(kb.split('-'))
+    return _blend(dice, len(wa & wb) / len(wa | wb))
+
+def _blend(dice, jaccard):
+    return 0.6 * dice + 0.4 * jaccard
+
+class ZoneIndex:
+    """Search structure over a zones.json listing"""
+
+    def __init__(self, zones, threshold=THRESHOLD, margin=MARGIN):
+        self.threshold = threshold
+        self.margin = margin
+        items = zones.values() if isinstance(zones, dict) else zones
+        self.zones = [z for z in items
+                      if isinstance(z, dict) and z.get('name') and z.get('id', -1) != -1]
+        self.by_id = {z['id']: z for z in self.zones}
+        self.by_key = {}
+        self._keys = []
+        self._trigram_counts = []
+        self._token_counts = []
+        self._trigram_index = {}
+        self._token_index = {}
+        for i, zone in enumerate(self.zones):
+            key = name_key(zone['name'])
+            grams = trigrams(key)
+            words = set(key.split('-'))
+            self._keys.append(key)
+            self._trigram_counts.append(len(grams))
+            self._token_counts.append(len(words))
+            self.by_key.setdefault(key, []).append(zone)
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(i)
+            for word in words:
+                self._token_index.setdefault(word, []).append(i)
+
+    def candidates(self, name, limit=5):
+        """Best-scoring zones for name, highest first"""
+        key = name_key(name)
+        if not key:
+            return []
+        grams = trigrams(key)
+        words = set(key.split('-'))
+        gram_count = len(grams)
+
+        # Shared trigram / token counts per zone straight from the postings
+        shared = Counter(chain.from_iterable(self._trigram_index.get(g, ()) for g in grams))
+        shared_words = Counter(chain.from_iterable(self._token_index.get(w, ()) for w in words))
+
+        scored = []
+        for i, count in shared.items():
+            if self._keys[i] == key:
+                score = 1.0
+            else:
+                dice = 2 * count / (gram_count + self._trigram_counts[i])
+                if dice < DICE_FLOOR:
+                    continue
+                common = shared_words[i]
+                jaccard = common / (len(words) + self._token_counts[i] - common)
+                score = _blend(dice, jaccard)
+            if score >= MIN_SCORE:
+                scored.append(Candidate(self.zones[i], round(score, 3)))
+        scored.sort(key=lambda c: (-c.score, c.zone['id']))
+        return scored[:limit]
+
+    def match(self, name):
+        """Match a name to a zone; see the module docstring for the statuses"""
+        found = self.candidates(name)
+        if not found:
+            return Match(None, 0.0, 'none', [])
+        best = found[0]
+        runner_up = found[1].score if len(found) > 1 else 0.0
+        if best.score == 1.0 and runner_up < 1.0:
+            return Match(best.zone, 1.0, 'exact', found)
+        if (best.score >= self.threshold and best.score - runner_up >= self.margin
+                and same_numbers(name, best.zone['name'])):
+            return Match(best.zone, best.score, 'fuzzy', found)
+        return Match(None, best.score, 'ambiguous', found)
+
+    def match_game(self, game):
+        """Match a catalog entry, trusting its imagePath zone id when the name agrees"""
+        name = game.get('name', '')
+        by_name = self.match(name)
+        zone = self.by_id.get(zone_id_from_image_path(cover_source(game)))
+        if zone is None:
+            return by_name
+
+        score = similarity(name, zone['name'])
+        if (score >= self.threshold and same_numbers(name, zone['name'])) or by_name.zone is zone:
+            return Match(zone, score, 'id', by_name.candidates)
+        # A stale or wrong cover id: the name doesn't back it up (or points
+        # at a different zone), so leave it for review
+        others = [c for c in by_name.candidates if c.zone is not zone]
+        return Match(None, score, 'ambiguous', [Candidate(zone, round(score, 3))] + others)
+
+def describe(game, match):
+    """One-line report of an ambiguous or failed match"""
+    options = ', '.join(f"{c.zone['name']} (#{c.zone['id']}, {c.score:.2f})"
+                        for c in match.candidates[:3])
+    return f"{game.get('name')} ({game.get('directory')}): {options or 'no candidates'}"
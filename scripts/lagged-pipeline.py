@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Discover, download, validate and add Lagged games in one streaming run
+Usage: python scripts/lagged-pipeline.py <category_url> [category_url ...] [--max-games N]
+           [--per-host N] [--resolvers N] [--downloaders N] [--validators N] [--queue N]
+           [--flat] [--no-insert]
+
+Replaces running scrape-lagged-category.py, download-lagged-game-full.py and
+add-valid-lagged-games.py one after the other. Every stage has its own
+workers and hands games on through a bounded queue as soon as it is done
+with them:
+
+    discover -> resolve play_url -> download assets -> validate -> catalog insert
+
+so the first game can be in the catalog while later category pages are still
+being read. --max-games 0 takes every new game in the categories (default
+20); --no-insert stops after validation. lagged-games-list.json is written
+at the end as before: a game is 'success' only once it has been through
+every stage, and failures record the stage and error.
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from gamelib import discover, engine, htmlparse, lagged, pipeline, validate
+from gamelib.catalog import Catalog
+
+SITE_ROOT = Path(__file__).parent.parent
+GAMES_DIR = SITE_ROOT / "non-semag"
+GAMES_JSON = SITE_ROOT / "data" / "games.json"
+GAMES_LIST = Path('lagged-games-list.json')
+
+INT_FLAGS = {
+    '--max-games': 20,
+    '--per-host': engine.DEFAULT_PER_HOST,
+    '--resolvers': 8,
+    '--downloaders': 4,
+    '--validators': 4,
+    '--queue': pipeline.DEFAULT_QUEUE_SIZE,
+}
+
+def parse_args(args):
+    options = dict(INT_FLAGS)
+    for flag in INT_FLAGS:
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args):
+                options[flag] = int(args[idx + 1])
+                del args[idx:idx + 2]
+    options['--flat'] = '--flat' in args
+    options['--no-insert'] = '--no-insert' in args
+    return [a for a in args if not a.startswith('--')], options
+
+def catalog_entry(record):
+    """games.json entry for a validated game (same shape as add-valid-lagged-games.py)"""
+    name = record.get('name') or record['slug'].replace('-', ' ').title()
+    # Remove " Game" suffix if present
+    if name.endswith(' Game'):
+        name = name[:-5]
+    return {
+        "name": name,
+        "directory": record['slug'],
+        "image": "cover.png",
+        "source": "non-semag"
+    }
+
+def failed(record, error):
+    """Mark a record as failed at the stage it was in (the stage then re-raises)"""
+    record.update(status='error', error=str(error))
+    print(f"  ✗ {record['slug']} ({record['stage']}): {error}", flush=True)
+
+async def run(category_urls, options):
+    catalog = Catalog.load(GAMES_JSON)
+    records = []
+
+    # One engine for discovery and every stage, so --per-host holds for the whole run
+    with engine.DownloadEngine(per_host=options['--per-host'], headers=lagged.HEADERS) as downloader:
+
+        async def resolve(found):
+            # Records stay 'error' until they come out of the last stage
+            record = {'url': found.url, 'slug': found.slug, 'status': 'error', 'stage': 'resolve'}
+            records.append(record)
+            try:
+                response = await downloader.get(found.url, headers=lagged.HEADERS)
+                response.raise_for_status()
+                soup = await asyncio.to_thread(htmlparse.parse, response.text)
+            except Exception as e:
+                failed(record, e)
+                raise
+            record['name'] = lagged.game_name(soup)
+            if record['name'] and catalog.exists(name=record['name']):
+                record.update(status='skipped', reason='already exists')
+                return None
+            record.update(play_url=lagged.find_play_url(soup, found.url) or found.url,
+                          cover_url=lagged.cover_url(soup, found.url))
+            # The play page is the game page: don't fetch it twice
+            markup = response.text if record['play_url'] == found.url else None
+            print(f"  🔗 {found.slug}", flush=True)
+            return record, markup
+
+        async def download(item):
+            record, markup = item
+            record['stage'] = 'download'
+            game_dir = GAMES_DIR / record['slug']
+            try:
+                downloaded, missing = await lagged.mirror(downloader, record['play_url'], game_dir, markup,
+                                                          options['--flat'], log=None)
+                if record.get('cover_url'):
+                    await downloader.download(record['cover_url'], game_dir / 'cover.png')
+            except Exception as e:
+                failed(record, e)
+                raise
+            record['assets'] = downloaded
+            print(f"  📥 {record['slug']}: {downloaded} assets ({missing} failed)", flush=True)
+            return record
+
+        async def check(record):
+            record['stage'] = 'validate'
+            try:
+                report = await asyncio.to_thread(validate.validate, GAMES_DIR / record['slug'])
+            except Exception as e:
+                failed(record, e)
+                raise
+            if not report.valid:
+                failed(record, f"invalid: {report.reason}")
+                return None
+            return record
+
+        def add_to_catalog(record):
+            with Catalog.edit(GAMES_JSON) as current:
+                entry = catalog_entry(record)
+                if current.exists(directory=entry['directory'], name=entry['name']):
+                    return False
+                current.insert(entry)
+                return True
+
+        async def insert(record):
+            record['stage'] = 'insert'
+            try:
+                added = await asyncio.to_thread(add_to_catalog, record)
+            except Exception as e:
+                failed(record, e)
+                raise
+            record['outcome'] = 'added' if added else 'already in games.json'
+            if added:
+                print(f"  ✓ {record['slug']} added to games.json", flush=True)
+            return record
+
+        stages = [
+            pipeline.Stage('resolve', resolve, options['--resolvers']),
+            pipeline.Stage('download', download, options['--downloaders']),
+            pipeline.Stage('validate', check, options['--validators']),
+        ]
+        if not options['--no-insert']:
+            stages.append(pipeline.Stage('insert', insert, 1))
+
+        discovery = discover.Discovery(category_urls, catalog=catalog,
+                                       max_games=options['--max-games'] or None,
+                                       engine=downloader)
+        for record in await pipeline.run(discovery.run(), stages, maxsize=options['--queue'], log=None):
+            record['status'] = 'success'
+
+    return records, discovery, stages
+
+def main():
+    category_urls, options = parse_args(sys.argv[1:])
+    if not category_urls:
+        print(__doc__.strip().split('\n\n')[0])
+        sys.exit(1)
+
+    print("🎮 Lagged Game Pipeline\n" + "=" * 50 + "\n", flush=True)
+    start = time.perf_counter()
+    records, discovery, stages = asyncio.run(run(category_urls, options))
+    elapsed = time.perf_counter() - start
+
+    GAMES_LIST.write_text(json.dumps(records, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    print(f"\n📊 Stages ({elapsed:.1f}s total):")
+    for stage in stages:
+        print(f"    {stage.summary()}")
+    added = sum(1 for r in records if r.get('outcome') == 'added')
+    print(f"\n✅ {added} games added, {discovery.skipped} already in the catalog")
+    print(f"📁 Saved to: {GAMES_LIST.resolve()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Generate grid thumbnails for every locally stored game cover
+Usage: python scripts/make-cover-thumbnails.py [--avif] [--size N] [--workers N] [--force] [--dry-run]
+
+Each cover the grid shows from this repo (non-semag/<game>/<image>, or a
+local imagePath) is cropped to a square, resized and saved as WebP (and
+AVIF with --avif) under img/thumbs/ on a process pool. The catalog entry
+gets a "thumb" object with the thumbnail URLs, dimensions, byte counts and
+a blurred placeholder, which js/games.js uses instead of the full cover.
+Thumbnails no game refers to any more are deleted afterwards.
+
+Covers that are only hosted remotely are skipped; run mirror-covers.py first.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import PIL  # noqa: F401
+except ImportError:
+    print("Installing Pillow...")
+    os.system(f"{sys.executable} -m pip install Pillow")
+
+from gamelib import REPO_ROOT, thumbs
+from gamelib.catalog import Catalog
+
+def cover_file(game):
+    """Local file the grid shows as game's cover, or None if it is remote"""
+    image_path = game.get('imagePath')
+    if image_path:
+        if image_path.startswith('/') and not image_path.startswith('//'):
+            return REPO_ROOT / image_path.lstrip('/')
+        return None
+    if game.get('source') == 'non-semag' and game.get('directory') and game.get('image'):
+        return REPO_ROOT / 'non-semag' / game['directory'] / game['image']
+    return None
+
+def prune(catalog):
+    """Delete thumbnails that no catalog entry uses; returns how many"""
+    used = set()
+    for game in catalog:
+        thumb = game.get('thumb') or {}
+        used.update(thumb.get(ext) for ext in ('webp', 'avif'))
+    removed = 0
+    if thumbs.THUMBS_DIR.is_dir():
+        for path in thumbs.THUMBS_DIR.iterdir():
+            if path.is_file() and thumbs.site_path(path) not in used:
+                path.unlink()
+                removed += 1
+    return removed
+
+def main():
+    args = sys.argv[1:]
+    size = thumbs.DEFAULT_SIZE
+    workers = os.cpu_count() or 1
+    for flag in ('--size', '--workers'):
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args):
+                value = int(args[idx + 1])
+                del args[idx:idx + 2]
+                if flag == '--size':
+                    size = value
+                else:
+                    workers = value
+    avif = '--avif' in args
+    force = '--force' in args
+    dry_run = '--dry-run' in args
+
+    print("🖼️  Generating cover thumbnails")
+    print("=" * 60)
+
+    catalog = Catalog.load()
+    sources = set()
+    remote = missing = 0
+    for game in catalog:
+        path = cover_file(game)
+        if path is None:
+            remote += 1
+        elif not path.is_file():
+            missing += 1
+        else:
+            sources.add(path.resolve())
+    print(f"📦 {len(sources)} local covers, {remote} remote, {missing} missing\n", flush=True)
+    if dry_run:
+        return
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(thumbs.make_thumbnail, path, size, avif, thumbs.THUMBS_DIR, force): path
+                   for path in sources}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                print(f"  ✗ {path.relative_to(REPO_ROOT)}: {e}", flush=True)
+
+    before = sum(thumb['bytes']['source'] for thumb in results.values())
+    after = sum(thumb['bytes']['webp'] for thumb in results.values())
+
+    updated = 0
+    with Catalog.edit() as catalog:
+        for game in catalog:
+            path = cover_file(game)
+            thumb = results.get(path.resolve()) if path else None
+            if thumb and game.get('thumb') != thumb:
+                catalog.update(game, thumb=thumb)
+                updated += 1
+        removed = prune(catalog)
+
+    print(f"✅ {len(results)} thumbnails, {updated} catalog entries updated, {removed} stale files removed")
+    if before:
+        print(f"📉 {before / 1024:,.0f} KB of covers -> {after / 1024:,.0f} KB of WebP thumbnails")
+
+if __name__ == "__main__":
+    main()
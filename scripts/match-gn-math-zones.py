@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """
 Match all gn-math games with zones.json to update names and cover images
+Usage: python scripts/match-gn-math-zones.py [--changed]
+  --changed  only re-match zones added, renamed or edited since the last run
 """
-import json
-import requests
+from gamelib import zonecache
+from gamelib.zonematch import AUTO_APPLY, ZoneIndex, describe
+from gamelib.catalog import Catalog, GAMES_JSON, cover_source, set_cover_source
 import re
-from pathlib import Path
+import sys
 
 def slugify(text):
     """Convert text to URL-friendly slug"""
@@ -13,84 +16,56 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-')
 
-ZONES_URL = "https://raw.githubusercontent.com/gn-math/assets/main/zones.json"
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
-
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    'Accept': '*/*',
-}
+SNAPSHOT = 'match-gn-math-zones'
 
 def load_zones():
     """Load zones.json"""
-    print("Fetching zones.json from GitHub...")
+    print("Loading zones.json...")
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones = r.json()
+        zones = zonecache.load()
         print(f"Loaded {len(zones)} zones")
         return zones
     except Exception as e:
         print(f"Error fetching zones.json: {e}")
         return None
 
-def load_games():
-    """Load current games.json"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    if not games_file.exists():
-        print("games.json not found")
-        return None
-    with open(games_file, 'r', encoding='utf-8') as f:
-        games = json.load(f)
-    return games
-
-def extract_zone_id_from_imagepath(imagepath):
-    """Extract zone ID from imagePath like https://cdn.jsdelivr.net/gh/gn-math/covers@main/42.png"""
-    if not imagepath:
-        return None
-    match = re.search(r'/(\d+)\.png$', imagepath)
-    if match:
-        return int(match.group(1))
-    return None
+def match_games(games, zones, zone_ids=None):
+    """Match games with zones and update names/imagePath
 
-def match_games(games, zones):
-    """Match games with zones and update names/imagePath"""
-    # Create lookup dictionaries
-    zones_by_id = {}
-    zones_by_name_lower = {}
-    
-    for zone in zones:
-        if isinstance(zone, dict) and 'id' in zone and zone['id'] != -1:
-            zone_id = zone['id']
-            zones_by_id[zone_id] = zone
-            if 'name' in zone:
-                zones_by_name_lower[zone['name'].lower()] = zone
+    Games are always matched against every zone; with zone_ids only matches
+    to those zones are applied (and reported).
+    """
+    index = ZoneIndex(zones)
     
     print(f"\nMatching games...")
     print("=" * 60)
     
     updated_count = 0
     matched_count = 0
+    ambiguous = []
+    fuzzy = []
     non_semag_games = [g for g in games if g.get('source') == 'non-semag']
     print(f"Found {len(non_semag_games)} non-semag games to check\n")
     
     for game in non_semag_games:
         game_name = game.get('name', '')
         game_dir = game.get('directory', '')
-        imagepath = game.get('imagePath', '')
-        
-        # Try to extract zone ID from imagePath
-        zone_id = extract_zone_id_from_imagepath(imagepath)
-        matched_zone = None
+        imagepath = cover_source(game) or ''
         
-        if zone_id is not None and zone_id in zones_by_id:
-            # Match by zone ID from imagePath
-            matched_zone = zones_by_id[zone_id]
-        elif game_name.lower() in zones_by_name_lower:
-            # Match by name
-            matched_zone = zones_by_name_lower[game_name.lower()]
+        # Zone ID from imagePath when the name agrees, otherwise best name match
+        match = index.match_game(game)
+        matched_zone = match.zone
+        if zone_ids is not None:
+            # Only act on games whose match involves a changed zone
+            involved = [matched_zone] if matched_zone else [c.zone for c in match.candidates]
+            if not any(zone.get('id') in zone_ids for zone in involved):
+                continue
         
-        if matched_zone:
+        if matched_zone and match.status not in AUTO_APPLY:
+            # Probably right, but not certain enough to rename an entry unseen
+            fuzzy.append(describe(game, match))
+        elif matched_zone:
             matched_count += 1
             correct_name = matched_zone.get('name', game_name)
             correct_id = matched_zone.get('id')
@@ -106,8 +81,7 @@ def match_games(games, zones):
                 updates.append(f"name: '{game.get('name')}' -> '{correct_name}'")
                 needs_update = True
             
-            if game.get('imagePath') != correct_imagepath:
-                game['imagePath'] = correct_imagepath
+            if set_cover_source(game, correct_imagepath):
                 updates.append(f"imagePath: updated to zone {correct_id}")
                 needs_update = True
             
@@ -122,15 +96,24 @@ def match_games(games, zones):
                 print(f"  [{matched_count}] Updated: {game_name}")
                 for update in updates:
                     print(f"      - {update}")
-        else:
-            # Try to find by directory name or partial name match
-            if imagepath and '/gn-math/covers@main/' in imagepath:
-                print(f"  [?] Could not match: {game_name} (dir: {game_dir})")
+        elif match.status == 'ambiguous':
+            ambiguous.append(describe(game, match))
+        elif zone_ids is None and imagepath and '/gn-math/covers@main/' in imagepath:
+            print(f"  [?] Could not match: {game_name} (dir: {game_dir})")
     
     print("\n" + "=" * 60)
     print(f"Matched: {matched_count}/{len(non_semag_games)} games")
     print(f"Updated: {updated_count} games")
     
+    if fuzzy:
+        print(f"\nFuzzy matches, not applied ({len(fuzzy)}):")
+        for line in fuzzy:
+            print(f"  [~] {line}")
+    if ambiguous:
+        print(f"\nAmbiguous, left unchanged ({len(ambiguous)}):")
+        for line in ambiguous:
+            print(f"  [?] {line}")
+    
     return games
 
 def main():
@@ -142,23 +125,31 @@ def main():
     if not zones:
         return
     
-    # Load games
-    games = load_games()
-    if not games:
+    if not GAMES_JSON.exists():
+        print("games.json not found")
         return
     
-    print(f"Current games in database: {len(games)}")
+    changes = zonecache.changes_since(zones, SNAPSHOT)
+    print(f"Since last run: {len(changes.added)} added, {len(changes.removed)} removed, "
+          f"{len(changes.renamed)} renamed, {len(changes.changed)} changed zones")
     
-    # Match and update
-    updated_games = match_games(games, zones)
+    changed_only = '--changed' in sys.argv
+    if changed_only:
+        changed_ids = {z.get('id') for z in changes.added + [new for old, new in changes.renamed + changes.changed]}
+        if not changed_ids:
+            print("\n✓ Nothing changed since the last run")
+            return
+    else:
+        changed_ids = None
     
-    # Save updated games.json
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    with open(games_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_games, f, indent='\t', ensure_ascii=False)
+    # Match and update under the games.json lock
+    with Catalog.edit() as catalog:
+        print(f"Current games in database: {len(catalog)}")
+        catalog.replace(match_games(catalog.games, zones, changed_ids))
+    zonecache.save_snapshot(zones, SNAPSHOT)
     
     print(f"\n✓ Saved updated games.json")
-    print(f"✓ Total games: {len(updated_games)}")
+    print(f"✓ Total games: {len(catalog)}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Mirror remotely hosted game covers into img/covers/ and point the catalog at them
+Usage: python scripts/mirror-covers.py [--dry-run] [--per-host N]
+
+Every imagePath on another site (mostly cdn.jsdelivr.net/gh/gn-math/covers)
+is downloaded concurrently and stored by content hash, so identical covers
+are kept once. The entries then use the local copy as imagePath and keep
+the original URL as imageSource.
+
+--dry-run only sends HEAD requests and reports how many third-party
+requests and bytes a full load of the games grid would stop making.
+"""
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from gamelib import coverstore
+from gamelib.catalog import Catalog
+
+def main():
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    per_host = coverstore.DEFAULT_PER_HOST
+    if '--per-host' in args:
+        idx = args.index('--per-host')
+        if idx + 1 < len(args):
+            per_host = int(args[idx + 1])
+
+    print("🖼️  Mirroring remote covers")
+    print("=" * 60)
+
+    catalog = Catalog.load()
+    entries = [g for g in catalog if coverstore.is_remote(g.get('imagePath'))]
+    urls = list(dict.fromkeys(g['imagePath'] for g in entries))
+    hosts = Counter(urlparse(url).netloc for url in urls)
+    print(f"📦 {len(entries)} entries use {len(urls)} remote covers "
+          f"({', '.join(f'{h}: {n}' for h, n in hosts.most_common())})\n", flush=True)
+    if not urls:
+        return
+
+    start = time.perf_counter()
+    if dry_run:
+        sizes = coverstore.remote_sizes(urls, per_host=per_host)
+        known = [s for s in sizes.values() if s is not None]
+        print(f"📊 A full grid load makes {len(urls)} requests to {len(hosts)} other host(s) for covers")
+        print(f"   {sum(known) / 1024 / 1024:,.1f} MB across {len(known)} covers that answered HEAD"
+              f" ({len(urls) - len(known)} unreachable) ({time.perf_counter() - start:.1f}s)")
+        print("   Run without --dry-run to serve them from img/covers/ instead")
+        return
+
+    stored, failed = coverstore.mirror(urls, per_host=per_host)
+    elapsed = time.perf_counter() - start
+    for url, error in failed:
+        print(f"  ✗ {url}: {error}")
+
+    local = {s.url: s.path for s in stored}
+    files = {s.path: s.size for s in stored}
+    new = sum(1 for s in stored if s.new)
+    print(f"✓ {len(stored)} covers downloaded in {elapsed:.1f}s -> {len(files)} unique files "
+          f"({new} new, {sum(files.values()) / 1024 / 1024:,.1f} MB)")
+
+    updated = 0
+    with Catalog.edit() as catalog:
+        for game in catalog:
+            url = game.get('imagePath')
+            if url in local:
+                catalog.update(game, imagePath=local[url], imageSource=url)
+                updated += 1
+
+    print(f"\n✅ {updated} catalog entries now use local covers; "
+          f"{len(local)} third-party requests fewer per grid load")
+    if failed:
+        print(f"⚠️  {len(failed)} covers could not be downloaded and still point upstream")
+
+if __name__ == "__main__":
+    main()
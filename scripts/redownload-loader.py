@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Re-download the Unity loader.js file"""
-import requests
+from gamelib import fetch
 from pathlib import Path
 
 url = "https://files.crazygames.com/stickman-destruction-3-heroes/6/Build/bl3.loader.js"
@@ -13,17 +13,14 @@ headers = {
 }
 
 print(f"Downloading {url}...")
-response = requests.get(url, headers=headers, timeout=30)
-response.raise_for_status()
+# Written to a .part file and renamed over the old copy, which may be a
+# hardlink shared with other games through the blob store
+size = fetch.fetch_to_file(url, output_path, headers=headers, conditional=False)
 
-output_path.parent.mkdir(parents=True, exist_ok=True)
-with open(output_path, 'wb') as f:
-    f.write(response.content)
-
-print(f"✓ Downloaded {len(response.content)} bytes to {output_path}")
+print(f"✓ Downloaded {size} bytes to {output_path}")
 print(f"First 200 characters (as text):")
 try:
-    text = response.content[:200].decode('utf-8', errors='ignore')
+    text = output_path.read_bytes()[:200].decode('utf-8', errors='ignore')
     print(text)
 except:
     print("(binary content)")
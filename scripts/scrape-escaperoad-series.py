@@ -2,13 +2,11 @@
 """
 Scrape all Escape Road series games from escaperoad.io and replace existing ones
 """
-import requests
-from bs4 import BeautifulSoup
-import json
+from gamelib import fetch, htmlparse
+from gamelib.catalog import Catalog
 import re
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
-import time
 import os
 import sys
 
@@ -33,19 +31,7 @@ ESCAPE_ROAD_SERIES = [
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=15)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            print(f"    Error downloading {url}: {e}", flush=True)
-        return False
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=15, silent=silent)
 
 def find_game_urls(soup, base_url):
     """Find all Escape Road series game URLs from the page"""
@@ -75,11 +61,10 @@ def download_game_html(game_url, game_dir):
         # Create directory first
         game_dir.mkdir(parents=True, exist_ok=True)
         
-        # Download the game page
-        r = requests.get(game_url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        
-        soup = BeautifulSoup(r.content, 'html.parser')
+        # Download the game page (download_cover_image reuses the parsed page)
+        page = htmlparse.get_page(game_url, headers=HEADERS, timeout=15)
+        r = page.response
+        soup = page.soup
         
         # Look for iframe with the actual game
         iframe = soup.find('iframe')
@@ -91,7 +76,7 @@ def download_game_html(game_url, game_dir):
                 print(f"    Found iframe: {iframe_src}", flush=True)
                 
                 # Download the iframe content
-                iframe_r = requests.get(iframe_src, headers=HEADERS, timeout=15)
+                iframe_r = fetch.get(iframe_src, headers=HEADERS, timeout=15)
                 iframe_r.raise_for_status()
                 
                 # Save as index.html
@@ -125,8 +110,7 @@ def download_cover_image(game_name, game_dir, game_url):
     
     # Also try to find it on the page
     try:
-        r = requests.get(game_url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.content, 'html.parser')
+        soup = htmlparse.get_page(game_url, headers=HEADERS, timeout=15).soup
         
         # Look for og:image or cover image
         og_image = soup.find('meta', property='og:image')
@@ -167,9 +151,9 @@ def main():
     # Fetch the main page
     print(f"Fetching {BASE_URL}...", flush=True)
     try:
-        r = requests.get(BASE_URL, headers=HEADERS, timeout=30)
+        r = fetch.get(BASE_URL, headers=HEADERS, timeout=30)
         r.raise_for_status()
-        soup = BeautifulSoup(r.content, 'html.parser')
+        soup = htmlparse.parse(r.content)
     except Exception as e:
         print(f"Error fetching page: {e}", flush=True)
         return
@@ -184,14 +168,9 @@ def main():
     
     print(f"\nFound {len(game_urls)} Escape Road series games", flush=True)
     
-    # Load existing games to find and remove old Escape Road games
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    with open(games_file, 'r', encoding='utf-8') as f:
-        existing_games = json.load(f)
-    
     # Find games to remove (any Escape Road game)
     games_to_remove = []
-    for game in existing_games:
+    for game in Catalog.load():
         name = game.get('name', '').lower()
         if 'escape road' in name:
             games_to_remove.append(game)
@@ -199,7 +178,6 @@ def main():
     
     # Remove old games
     for game in games_to_remove:
-        existing_games.remove(game)
         # Also remove the directory if it exists
         old_dir = GAMES_DIR / game.get('directory', '')
         if old_dir.exists():
@@ -247,15 +225,15 @@ def main():
         except Exception as e:
             print(f"  ✗ Error: {e}", flush=True)
             continue
-        
-        time.sleep(0.5)  # Be polite
     
     # Add new games to games.json
     if downloaded_games:
-        existing_games.extend(downloaded_games)
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        # Swap the entries in one locked batch so concurrent edits are kept
+        with Catalog.edit() as catalog:
+            for game in [g for g in catalog if 'escape road' in g.get('name', '').lower()]:
+                catalog.delete(game)
+            for game_info in downloaded_games:
+                catalog.insert(game_info)
         
         print(f"\n" + "=" * 60, flush=True)
         print(f"DOWNLOAD SUMMARY", flush=True)
@@ -263,7 +241,7 @@ def main():
         print(f"Removed old games: {len(games_to_remove)}", flush=True)
         print(f"Downloaded new games: {len(downloaded_games)}/{len(game_urls)}", flush=True)
         print(f"✓ Updated games.json", flush=True)
-        print(f"✓ Total games in database: {len(existing_games)}", flush=True)
+        print(f"✓ Total games in database: {len(catalog)}", flush=True)
     else:
         print("\n⚠ No games were successfully downloaded", flush=True)
 
@@ -2,7 +2,7 @@
 """
 Scrape games from gn-math.dev
 """
-import requests
+from gamelib import covers, zonecache
 from bs4 import BeautifulSoup
 import json
 import re
@@ -10,6 +10,8 @@ from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import time
 
+from gamelib.catalog import Catalog
+
 BASE_URL = "https://gn-math.dev/"
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -17,34 +19,17 @@ HEADERS = {
     'Accept-Language': 'en-US,en;q=0.5',
 }
 
-def load_existing_games():
-    """Load existing games from games.json to avoid duplicates"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    if games_file.exists():
-        with open(games_file, 'r', encoding='utf-8') as f:
-            games = json.load(f)
-            # Create sets of existing names, directories, and URL slugs
-            existing_names = {g.get('name', '').lower() for g in games}
-            existing_dirs = {g.get('directory', '') for g in games}
-            return existing_names, existing_dirs
-    return set(), set()
-
 def scrape_games():
     """Scrape games from gn-math.dev"""
     print(f"Fetching games from gn-math.dev API...")
     
-    # The site loads games from a JSON API
-    zones_url = "https://cdn.jsdelivr.net/gh/gn-math/assets@main/zones.json"
-    
     try:
-        r = requests.get(zones_url, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones.json: {e}")
         return []
     
-    existing_names, existing_dirs = load_existing_games()
+    catalog = Catalog.load()
     games = []
     
     # zones.json is a dictionary where keys are zone IDs and values are zone data
@@ -59,6 +44,7 @@ def scrape_games():
     print(f"Found {len(zones)} zones/games in API")
     
     # Process each zone
+    zone_ids = []
     for zone_id, zone_data in zones.items():
         # Extract zone information
         if isinstance(zone_data, dict):
@@ -78,16 +64,13 @@ def scrape_games():
             dir_name = f"zone-{zone_id}"
         
         # Check if already exists
-        if name.lower() in existing_names or dir_name in existing_dirs:
+        if catalog.exists(name=name, directory=dir_name):
             print(f"  ⏭ Skipping {name} (already exists)")
             continue
         
         # Construct game URL
         game_url = f"{BASE_URL}#{zone_id}" if zone_id else BASE_URL
         
-        # Try to get cover image from covers repository
-        cover_url = f"https://cdn.jsdelivr.net/gh/gn-math/covers@main/{zone_id}.png"
-        
         game_info = {
             'name': name,
             'directory': dir_name,
@@ -96,17 +79,18 @@ def scrape_games():
             'gameUrl': game_url
         }
         
-        # Check if cover image exists
-        try:
-            cover_check = requests.head(cover_url, headers=HEADERS, timeout=5)
-            if cover_check.status_code == 200:
-                game_info['imagePath'] = cover_url
-        except:
-            pass
-        
         games.append(game_info)
+        zone_ids.append(str(zone_id))
         print(f"  ✓ Added: {name} (by {author})")
     
+    # Look up every cover at once (one listing of the covers repository)
+    if games:
+        with_cover = covers.available(zone_ids)
+        for game_info, zone_id in zip(games, zone_ids):
+            if zone_id in with_cover:
+                game_info['imagePath'] = covers.cover_url(zone_id)
+        print(f"Found covers for {len(with_cover)}/{len(games)} new games")
+    
     return games
 
 def main():
@@ -2,15 +2,14 @@
 """
 Scrape 50 games from gn-math.dev (no duplicates, with progress)
 """
-import requests
-import json
+from gamelib import fetch, zonecache
 import re
 from urllib.parse import urljoin
 from pathlib import Path
-import time
 import sys
 
-ZONES_URL = "https://cdn.jsdelivr.net/gh/gn-math/assets@main/zones.json"
+from gamelib.catalog import Catalog
+
 COVERS_BASE = "https://cdn.jsdelivr.net/gh/gn-math/covers@main/"
 HTML_BASE = "https://cdn.jsdelivr.net/gh/gn-math/html@main/"
 
@@ -24,30 +23,7 @@ MAX_GAMES = 100
 
 def download_file(url, filepath, silent=False):
     """Download a file from URL"""
-    try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=10)
-        r.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        if not silent:
-            pass  # Errors are handled in calling function
-        return False
-
-def load_existing_games():
-    """Load existing games to avoid duplicates"""
-    games_file = Path(__file__).parent.parent / "data" / "games.json"
-    if games_file.exists():
-        with open(games_file, 'r', encoding='utf-8') as f:
-            games = json.load(f)
-            existing_dirs = {g.get('directory', '') for g in games}
-            existing_names = {g.get('name', '').lower() for g in games}
-            return existing_dirs, existing_names, games
-    return set(), set(), []
+    return fetch.download_file(url, filepath, headers=HEADERS, timeout=10, silent=True)
 
 def normalize_directory_name(name):
     """Convert game name to directory name"""
@@ -101,15 +77,13 @@ def main():
     
     # Load existing games
     print("Loading existing games...", flush=True)
-    existing_dirs, existing_names, existing_games = load_existing_games()
-    print(f"Found {len(existing_games)} existing games in database", flush=True)
+    catalog = Catalog.load()
+    print(f"Found {len(catalog)} existing games in database", flush=True)
     
     # Fetch zones
-    print(f"\nFetching zones from {ZONES_URL}...", flush=True)
+    print(f"\nLoading zones.json...", flush=True)
     try:
-        r = requests.get(ZONES_URL, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        zones_data = r.json()
+        zones_data = zonecache.load()
     except Exception as e:
         print(f"Error fetching zones: {e}", flush=True)
         return
@@ -133,7 +107,7 @@ def main():
         if not dir_name:
             continue
         
-        if name.lower() not in existing_names and dir_name not in existing_dirs:
+        if not catalog.exists(name=name, directory=dir_name):
             available_zones.append((zone_id, zone_data, name, dir_name))
     
     print(f"\nFound {len(available_zones)} available games (not in database)", flush=True)
@@ -179,8 +153,6 @@ def main():
             failed_games.append(name)
             print(f"      ✗ Error: {str(e)[:50]}", flush=True)
             continue
-        
-        time.sleep(0.3)  # Be polite
     
     # Add to games.json
     print("\n" + "=" * 60, flush=True)
@@ -190,14 +162,13 @@ def main():
     print(f"Failed: {len(failed_games)}/{games_to_download}", flush=True)
     
     if downloaded_games:
-        existing_games.extend(downloaded_games)
-        games_file = Path(__file__).parent.parent / "data" / "games.json"
-        
-        with open(games_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit() as catalog:
+            for game_info in downloaded_games:
+                if not catalog.exists(name=game_info['name'], directory=game_info['directory']):
+                    catalog.insert(game_info)
         
         print(f"\n✓ Added {len(downloaded_games)} games to games.json", flush=True)
-        print(f"✓ Total games in database: {len(existing_games)}", flush=True)
+        print(f"✓ Total games in database: {len(catalog)}", flush=True)
     else:
         print("\n⚠ No games were successfully downloaded", flush=True)
     
@@ -2,7 +2,7 @@
 """
 Scraper for Stickman Destruction 3 Heroes - Only game files, no website assets
 """
-import requests
+from gamelib import fetch
 import os
 import re
 from urllib.parse import urljoin, urlparse
@@ -26,16 +26,7 @@ def download_file(url, filepath):
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': 'https://www.crazygames.com/'
         }
-        response = requests.get(url, stream=True, timeout=60, headers=headers)
-        response.raise_for_status()
-        
-        total_size = 0
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    total_size += len(chunk)
-        
+        total_size = fetch.fetch_to_file(url, filepath, headers=headers, timeout=60)
         print(f"✓ Downloaded: {filepath.name} ({total_size:,} bytes)")
         return True
     except Exception as e:
@@ -50,7 +41,7 @@ def scrape_game_html(html_url):
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Referer': 'https://www.crazygames.com/'
         }
-        response = requests.get(html_url, timeout=30, headers=headers)
+        response = fetch.get(html_url, timeout=30, headers=headers)
         response.raise_for_status()
         html_content = response.text
         
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 Scraper for Undertale game assets from CloudFront
+Usage: python scrape-utale-assets.py [--flat]
+
+Files keep their upstream paths under scraped-utale-assets/; --flat sorts
+them into images/, scripts/, data/ and other/ by extension instead.
 """
-import requests
+from gamelib import assets, fetch, layout
 import os
-import re
-from urllib.parse import urljoin, urlparse
+import sys
+from urllib.parse import urlparse
 from pathlib import Path
 
 BASE_URL = "https://d3rtzzzsiu7gdr.cloudfront.net/files/utale/"
@@ -28,63 +32,13 @@ def download_file(url, filepath):
             'Accept-Language': 'en-US,en;q=0.5',
             'Referer': 'https://d3rtzzzsiu7gdr.cloudfront.net/'
         }
-        response = requests.get(url, stream=True, timeout=30, headers=headers)
-        response.raise_for_status()
-        
-        total_size = 0
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    total_size += len(chunk)
-        
+        total_size = fetch.fetch_to_file(url, filepath, headers=headers)
         print(f"✓ Downloaded: {filepath.name} ({total_size} bytes)")
         return True
     except Exception as e:
         print(f"✗ Failed to download {url}: {e}")
         return False
 
-def scrape_html_assets(html_content):
-    """Extract asset URLs from HTML"""
-    assets = {
-        'images': [],
-        'scripts': [],
-        'stylesheets': [],
-        'favicons': [],
-        'other': []
-    }
-    
-    # Find all image sources
-    img_patterns = [
-        r'<img[^>]+src=["\']([^"\']+)["\']',
-        r'background-image:\s*url\(["\']?([^"\')\s]+)["\']?\)',
-        r'url\(["\']?([^"\')\s]+\.(png|jpg|jpeg|gif|webp|svg|ico))["\']?\)'
-    ]
-    
-    for pattern in img_patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
-        for match in matches:
-            url = match[0] if isinstance(match, tuple) else match
-            if url not in assets['images']:
-                assets['images'].append(url)
-    
-    # Find script sources
-    script_pattern = r'<script[^>]+src=["\']([^"\']+)["\']'
-    matches = re.findall(script_pattern, html_content, re.IGNORECASE)
-    assets['scripts'].extend(matches)
-    
-    # Find stylesheet links
-    css_pattern = r'<link[^>]+href=["\']([^"\']+\.css)["\']'
-    matches = re.findall(css_pattern, html_content, re.IGNORECASE)
-    assets['stylesheets'].extend(matches)
-    
-    # Find favicons
-    favicon_pattern = r'<link[^>]+rel=["\'](?:icon|shortcut icon)["\'][^>]+href=["\']([^"\']+)["\']'
-    matches = re.findall(favicon_pattern, html_content, re.IGNORECASE)
-    assets['favicons'].extend(matches)
-    
-    return assets
-
 def get_file_category(filename):
     """Determine file category based on extension"""
     ext = Path(filename).suffix.lower()
@@ -103,7 +57,11 @@ def main():
     print("🎮 Undertale Asset Scraper")
     print("=" * 50)
     
-    create_output_dirs()
+    flat = '--flat' in sys.argv
+    if flat:
+        create_output_dirs()
+    else:
+        OUTPUT_DIR.mkdir(exist_ok=True)
     
     # Known game files from network requests
     known_assets = [
@@ -121,7 +79,7 @@ def main():
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5'
         }
-        response = requests.get(BASE_URL + "index.html", timeout=30, headers=headers)
+        response = fetch.get(BASE_URL + "index.html", timeout=30, headers=headers)
         response.raise_for_status()
         html_content = response.text
         
@@ -130,36 +88,18 @@ def main():
             f.write(html_content)
         print(f"✓ Saved index.html")
         
-        # Extract assets from HTML
+        # Extract assets from HTML (and the stylesheets it links)
         print("\n🔍 Extracting assets from HTML...")
-        html_assets = scrape_html_assets(html_content)
-        
-        print(f"  Found {len(html_assets['images'])} images")
-        print(f"  Found {len(html_assets['scripts'])} scripts")
-        print(f"  Found {len(html_assets['stylesheets'])} stylesheets")
-        print(f"  Found {len(html_assets['favicons'])} favicons")
+        html_assets = assets.extract_page(html_content, BASE_URL + "index.html", headers=headers)
         
-        # Combine all assets
-        all_assets = []
-        all_assets.extend(html_assets['images'])
-        all_assets.extend(html_assets['scripts'])
-        all_assets.extend(html_assets['stylesheets'])
-        all_assets.extend(html_assets['favicons'])
-        all_assets.extend(known_assets)
+        for kind, urls in html_assets.by_kind().items():
+            if urls:
+                print(f"  Found {len(urls)} {kind} assets")
         
-        # Remove duplicates and normalize URLs
-        unique_assets = []
-        for asset in all_assets:
-            # Make absolute URL if relative
-            if asset.startswith('http'):
-                url = asset
-            elif asset.startswith('/'):
-                url = urljoin(BASE_URL, asset)
-            else:
-                url = urljoin(BASE_URL, asset)
-            
-            if url not in unique_assets:
-                unique_assets.append(url)
+        # Add the game files the page only loads at runtime
+        for name in known_assets:
+            html_assets.add(name, base_url=BASE_URL)
+        unique_assets = html_assets.urls()
         
         # Download all assets
         print(f"\n📥 Downloading {len(unique_assets)} assets...")
@@ -168,7 +108,9 @@ def main():
             filename = os.path.basename(urlparse(url).path) or "index.html"
             category = get_file_category(filename)
             
-            if category == 'images':
+            if not flat:
+                filepath = layout.mirror_path(url, BASE_URL + "index.html", OUTPUT_DIR)
+            elif category == 'images':
                 filepath = OUTPUT_DIR / "images" / filename
             elif category == 'scripts':
                 filepath = OUTPUT_DIR / "scripts" / filename
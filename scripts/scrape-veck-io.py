@@ -2,12 +2,9 @@
 """
 Scraper for Veck.io - Only game files, no website assets
 """
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from gamelib import assets, fetch
+from urllib.parse import urlparse
 from pathlib import Path
-import re
-import time
 
 GAME_URL = "https://games.crazygames.com/en_US/veck-io/index.html"
 OUTPUT_DIR = Path("scraped-veck-io")
@@ -19,6 +16,9 @@ HEADERS = {
     'Referer': 'https://www.crazygames.com/'
 }
 
+# Website/ad assets that are not part of the game
+AD_PATTERNS = ['googlesyndication', 'doubleclick', 'crazygames.com/portal', 'crazygames.com/images']
+
 def setup_directories():
     OUTPUT_DIR.mkdir(exist_ok=True)
     (OUTPUT_DIR / "scripts").mkdir(exist_ok=True)
@@ -28,16 +28,7 @@ def setup_directories():
 
 def download_file(url, filepath):
     try:
-        response = requests.get(url, stream=True, timeout=30, headers=HEADERS)
-        response.raise_for_status()
-        
-        total_size = 0
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    total_size += len(chunk)
-        
+        total_size = fetch.fetch_to_file(url, filepath, headers=HEADERS)
         print(f"✓ Downloaded: {filepath.name} ({total_size:,} bytes)")
         return True
     except Exception as e:
@@ -51,13 +42,9 @@ def scrape_game():
     print("⚠️  Only downloading game files, NOT website assets")
     print()
     
-    # Get base URL
-    parsed = urlparse(GAME_URL)
-    base_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rsplit('/', 1)[0]}/"
-    
     print(f"📄 Fetching {GAME_URL}...")
     try:
-        response = requests.get(GAME_URL, headers=HEADERS, timeout=30)
+        response = fetch.get(GAME_URL, headers=HEADERS, timeout=30)
         response.raise_for_status()
         html_content = response.text
         (OUTPUT_DIR / "index.html").write_text(html_content, encoding='utf-8')
@@ -66,66 +53,32 @@ def scrape_game():
         print(f"❌ Error: {e}")
         return
     
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Extract asset URLs
+    # Extract asset URLs (game files only: same origin, no ad/portal assets)
     print("\n🔍 Extracting assets from HTML...")
-    assets_to_download = []
-    
-    # Scripts
-    for script in soup.find_all('script', src=True):
-        src = urljoin(base_url, script['src'])
-        if urlparse(src).netloc == urlparse(base_url).netloc:
-            assets_to_download.append({'url': src, 'type': 'script'})
-    
-    # Stylesheets
-    for link in soup.find_all('link', rel="stylesheet", href=True):
-        href = urljoin(base_url, link['href'])
-        if urlparse(href).netloc == urlparse(base_url).netloc:
-            assets_to_download.append({'url': href, 'type': 'stylesheet'})
-    
-    # Images
-    for img in soup.find_all('img', src=True):
-        src = urljoin(base_url, img['src'])
-        if urlparse(src).netloc == urlparse(base_url).netloc:
-            assets_to_download.append({'url': src, 'type': 'image'})
-    
-    # Favicon
-    for link in soup.find_all('link', rel=re.compile("icon", re.I), href=True):
-        href = urljoin(base_url, link['href'])
-        if urlparse(href).netloc == urlparse(base_url).netloc:
-            assets_to_download.append({'url': href, 'type': 'favicon'})
-    
-    # Filter out duplicates and external scripts
-    unique_assets = []
-    seen_urls = set()
-    for asset in assets_to_download:
-        if asset['url'] not in seen_urls and not any(x in asset['url'] for x in ['googlesyndication', 'doubleclick', 'crazygames.com/portal', 'crazygames.com/images']):
-            unique_assets.append(asset)
-            seen_urls.add(asset['url'])
+    found = assets.extract_page(html_content, GAME_URL, headers=HEADERS).same_origin(GAME_URL)
+    unique_assets = [a for a in found if not any(x in a.url for x in AD_PATTERNS)]
     
-    print(f"  Found {len([a for a in unique_assets if a['type'] == 'script'])} scripts")
-    print(f"  Found {len([a for a in unique_assets if a['type'] == 'stylesheet'])} stylesheets")
-    print(f"  Found {len([a for a in unique_assets if a['type'] == 'image'])} images")
+    print(f"  Found {len([a for a in unique_assets if a.kind == 'script'])} scripts")
+    print(f"  Found {len([a for a in unique_assets if a.kind == 'stylesheet'])} stylesheets")
+    print(f"  Found {len([a for a in unique_assets if a.kind == 'image'])} images")
     
     # Download assets
     print(f"\n📥 Downloading {len(unique_assets)} assets...")
     downloaded_count = 0
     for asset in unique_assets:
-        parsed_url = urlparse(asset['url'])
+        parsed_url = urlparse(asset.url)
         filename = Path(parsed_url.path).name
         
         target_dir = OUTPUT_DIR / "other"
-        if asset['type'] == 'script':
+        if asset.kind == 'script':
             target_dir = OUTPUT_DIR / "scripts"
-        elif asset['type'] == 'stylesheet':
+        elif asset.kind == 'stylesheet':
             target_dir = OUTPUT_DIR / "stylesheets"
-        elif asset['type'] == 'image' or asset['type'] == 'favicon':
+        elif asset.kind == 'image':
             target_dir = OUTPUT_DIR / "images"
         
-        if download_file(asset['url'], target_dir / filename):
+        if download_file(asset.url, target_dir / filename):
             downloaded_count += 1
-        time.sleep(0.1)  # Be polite
     
     print(f"\n✅ Complete! Downloaded {downloaded_count}/{len(unique_assets)} assets")
     print(f"📁 Assets saved to: {OUTPUT_DIR.resolve()}")
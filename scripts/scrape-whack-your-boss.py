@@ -1,9 +1,8 @@
 import requests
-from bs4 import BeautifulSoup
+from gamelib import fetch, htmlparse
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import re
-import time
 import json
 
 BASE_URL = 'https://www.kongregate.com/en/games/WhackYourBosscom/whack-your-boss'
@@ -26,13 +25,8 @@ def setup_directories():
 
 def download_file(url, filepath):
     try:
-        response = requests.get(url, stream=True, timeout=30, headers=HEADERS)
-        response.raise_for_status()
-
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        print(f"✓ Downloaded: {filepath.name} ({filepath.stat().st_size} bytes)")
+        size = fetch.fetch_to_file(url, filepath, headers=HEADERS)
+        print(f"✓ Downloaded: {filepath.name} ({size} bytes)")
         return True
     except requests.exceptions.RequestException as e:
         print(f"✗ Failed to download {url}: {e}")
@@ -45,7 +39,7 @@ def scrape_assets():
     # 1. Fetch the main HTML page
     print(f"📄 Fetching {BASE_URL}...")
     try:
-        response = requests.get(BASE_URL, headers=HEADERS, timeout=30)
+        response = fetch.get(BASE_URL, headers=HEADERS, timeout=30)
         response.raise_for_status()
         html_content = response.text
         (OUTPUT_DIR / "index.html").write_text(html_content, encoding='utf-8')
@@ -54,7 +48,7 @@ def scrape_assets():
         print(f"❌ Error: {e}")
         return
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = htmlparse.parse(html_content)
     
     # 2. Extract game embed information
     print("\n🔍 Extracting game embed information...")
@@ -137,10 +131,10 @@ def scrape_assets():
     # Try to fetch the embed page to find the actual game iframe
     if embed_urls:
         try:
-            embed_response = requests.get(embed_urls[0], headers=HEADERS, timeout=30)
+            embed_response = fetch.get(embed_urls[0], headers=HEADERS, timeout=30)
             embed_response.raise_for_status()
             embed_html = embed_response.text
-            embed_soup = BeautifulSoup(embed_html, 'html.parser')
+            embed_soup = htmlparse.parse(embed_html)
             
             # Look for iframe URLs in the embed page
             for iframe in embed_soup.find_all('iframe', src=True):
@@ -206,7 +200,6 @@ def scrape_assets():
         
         if download_file(asset['url'], target_dir / filename):
             downloaded_count += 1
-        time.sleep(0.1)  # Be polite
 
     print(f"\n✅ Complete! Downloaded {downloaded_count}/{len(unique_assets)} assets")
     print(f"📁 Assets saved to: {OUTPUT_DIR.resolve()}")
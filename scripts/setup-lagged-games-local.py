@@ -2,8 +2,7 @@
 Download and set up Lagged games locally
 Reads from lagged-games-list.json and sets up games in non-semag directory
 """
-import requests
-from bs4 import BeautifulSoup
+from gamelib import fetch, htmlparse
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import re
@@ -11,6 +10,8 @@ import json
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from gamelib.catalog import Catalog
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -19,12 +20,7 @@ HEADERS = {
 def download_file(url, filepath):
     """Download a file from URL"""
     try:
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=30)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        fetch.fetch_to_file(url, filepath, headers=HEADERS)
         return True
     except Exception as e:
         print(f"    ✗ Failed to download {url}: {e}")
@@ -49,8 +45,7 @@ def setup_lagged_game(game_data, non_semag_dir):
     # Try to get the play URL if we have it
     if not play_url and game_url:
         try:
-            response = requests.get(game_url, headers=HEADERS, timeout=30)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = htmlparse.get_page(game_url, headers=HEADERS, timeout=30).soup
             
             # Look for game iframe or play button
             for link in soup.find_all('a', href=True):
@@ -73,10 +68,10 @@ def setup_lagged_game(game_data, non_semag_dir):
     # If we have a play URL, fetch the game page
     if play_url:
         try:
-            response = requests.get(play_url, headers=HEADERS, timeout=30)
+            response = fetch.get(play_url, headers=HEADERS, timeout=30)
             response.raise_for_status()
             game_html = response.text
-            soup = BeautifulSoup(game_html, 'html.parser')
+            soup = htmlparse.parse(game_html)
             
             # Look for SWF files
             swf_files = []
@@ -108,8 +103,8 @@ def setup_lagged_game(game_data, non_semag_dir):
     
     # Try to get a cover image
     try:
-        response = requests.get(game_url, headers=HEADERS, timeout=30)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Same page as the play URL lookup above; parsed only once
+        soup = htmlparse.get_page(game_url, headers=HEADERS, timeout=30).soup
         
         # Look for og:image or game thumbnail
         og_image = soup.find('meta', property='og:image')
@@ -246,35 +241,28 @@ def create_external_html(game_dir, game_url, game_name):
 def add_to_games_json(games_data, games_json_path):
     """Add games to games.json"""
     try:
-        with open(games_json_path, 'r', encoding='utf-8') as f:
-            existing_games = json.load(f)
-        
         added_count = 0
-        for game_data in games_data:
-            if game_data['status'] != 'success':
-                continue
-            
-            slug = game_data['directory']
-            name = game_data['name']
-            
-            # Check if already exists
-            exists = any(g.get('directory') == slug for g in existing_games)
-            if exists:
-                continue
-            
-            # Add new game
-            new_game = {
-                "name": name,
-                "directory": slug,
-                "image": "cover.png",
-                "source": "non-semag"
-            }
-            existing_games.append(new_game)
-            added_count += 1
-        
-        # Save updated games.json
-        with open(games_json_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        with Catalog.edit(games_json_path) as catalog:
+            for game_data in games_data:
+                if game_data['status'] != 'success':
+                    continue
+                
+                slug = game_data['directory']
+                name = game_data['name']
+                
+                # Check if already exists
+                if catalog.exists(directory=slug):
+                    continue
+                
+                # Add new game
+                new_game = {
+                    "name": name,
+                    "directory": slug,
+                    "image": "cover.png",
+                    "source": "non-semag"
+                }
+                catalog.insert(new_game)
+                added_count += 1
         
         print(f"\n✅ Added {added_count} games to games.json")
         return added_count
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Validate every mirrored game in non-semag/
+Usage: python scripts/validate-games.py [slug ...] [--json FILE] [--workers N] [--invalid] [--no-cache]
+
+Each game folder is walked once and checked for an index.html that is not
+just an iframe to another game site, plus local game files (or a CDN). The
+full report is written as JSON with --json (- for stdout).
+
+Reports are cached by each folder's file list, sizes and mtimes, so a
+re-run only inspects games that were added or changed; --no-cache skips it.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+from gamelib import validate
+
+GAMES_DIR = Path(__file__).parent.parent / "non-semag"
+
+def main():
+    args = sys.argv[1:]
+    json_path = None
+    workers = validate.DEFAULT_WORKERS
+    for flag in ('--json', '--workers'):
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args):
+                value = args[idx + 1]
+                del args[idx:idx + 2]
+                if flag == '--json':
+                    json_path = value
+                else:
+                    workers = int(value)
+    only_invalid = '--invalid' in args
+    use_cache = '--no-cache' not in args
+    slugs = [a for a in args if not a.startswith('--')]
+
+    if slugs:
+        game_dirs = [GAMES_DIR / slug for slug in slugs]
+    else:
+        game_dirs = sorted(p for p in GAMES_DIR.iterdir() if p.is_dir())
+
+    quiet = json_path == '-'
+    if not quiet:
+        print("🔍 Validating games")
+        print("=" * 60, flush=True)
+
+    start = time.perf_counter()
+    cache = validate.ValidationCache() if use_cache else None
+    reports = validate.validate_all(game_dirs, workers=workers, cache=cache)
+    elapsed = time.perf_counter() - start
+    if cache:
+        cache.save()
+
+    if json_path:
+        data = {
+            'games': [validate.to_json(r) for r in reports],
+            'valid': sum(1 for r in reports if r.valid),
+            'invalid': sum(1 for r in reports if not r.valid),
+        }
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        if quiet:
+            print(text)
+            return
+        Path(json_path).write_text(text + '\n', encoding='utf-8')
+        print(f"📝 Report written to {json_path}")
+
+    for report in reports:
+        if report.valid and (only_invalid or not report.empty):
+            continue
+        if report.valid:
+            print(f"  ⚠️  {report.slug}: {len(report.empty)} empty file(s)")
+        else:
+            print(f"  ✗ {report.slug}: {report.reason}")
+
+    valid = sum(1 for r in reports if r.valid)
+    print(f"\n✅ {valid}/{len(reports)} games valid ({elapsed:.2f}s)")
+    if cache:
+        print(f"💾 {cache.hits} cached, {cache.rehashed} rehashed, {cache.misses} checked")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Check that every file the mirrored games reference exists locally
+Usage: python scripts/verify-games.py [slug ...] [--shallow] [--json FILE] [--workers N]
+
+Parses each non-semag/<game>/index.html (Unity loader configs and Ruffle SWF
+paths included), follows the local scripts, stylesheets and JSON it loads,
+and lists every referenced file that is missing or empty. --shallow only
+checks the references in index.html itself.
+
+Exits with status 1 if any game has a problem, so it can gate a deploy.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+from gamelib import verify
+
+GAMES_DIR = Path(__file__).parent.parent / "non-semag"
+# Problems listed per game before summarising the rest
+SHOW_PROBLEMS = 5
+
+def main():
+    args = sys.argv[1:]
+    json_path = None
+    workers = None
+    for flag in ('--json', '--workers'):
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args):
+                value = args[idx + 1]
+                del args[idx:idx + 2]
+                if flag == '--json':
+                    json_path = value
+                else:
+                    workers = int(value)
+    follow = '--shallow' not in args
+    slugs = [a for a in args if not a.startswith('--')]
+
+    if slugs:
+        game_dirs = [GAMES_DIR / slug for slug in slugs]
+    else:
+        game_dirs = sorted(p for p in GAMES_DIR.iterdir() if p.is_dir())
+
+    quiet = json_path == '-'
+    if not quiet:
+        print("🔍 Verifying referenced files")
+        print("=" * 60, flush=True)
+
+    start = time.perf_counter()
+    checks = verify.verify_all(game_dirs, workers=workers, follow=follow)
+    elapsed = time.perf_counter() - start
+    broken = [c for c in checks if c.problems]
+
+    if json_path:
+        data = {
+            'games': [{'slug': c.slug, 'checked': c.checked,
+                       'problems': [p._asdict() for p in c.problems]} for c in checks],
+            'broken': len(broken),
+        }
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        if quiet:
+            print(text)
+            sys.exit(1 if broken else 0)
+        Path(json_path).write_text(text + '\n', encoding='utf-8')
+        print(f"📝 Report written to {json_path}")
+
+    for check in broken:
+        print(f"\n✗ {check.slug}: {len(check.problems)} problem(s)")
+        for problem in check.problems[:SHOW_PROBLEMS]:
+            print(f"    {problem.problem}: {problem.path}  (from {problem.referrer})")
+        if len(check.problems) > SHOW_PROBLEMS:
+            print(f"    ... and {len(check.problems) - SHOW_PROBLEMS} more")
+
+    files = sum(c.checked for c in checks)
+    print(f"\n{'❌' if broken else '✅'} {len(checks) - len(broken)}/{len(checks)} games complete, "
+          f"{files:,} files checked ({elapsed:.2f}s)")
+    sys.exit(1 if broken else 0)
+
+if __name__ == "__main__":
+    main()